@@ -0,0 +1,54 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Times logging an A2UI payload to a category logger whose level is disabled.
+
+Logging the payload with `Truncated` is compared with formatting it eagerly
+in an f-string, which is how the sample agents logged payloads before.
+
+Run from the a2ui_extension directory:
+
+    uv run python -m benchmarks.log_utils_benchmark
+"""
+
+import json
+import logging
+import timeit
+
+from a2ui import log_utils
+
+NUMBER = 20000
+
+
+def report(name: str, log):
+    seconds = timeit.timeit(log, number=NUMBER)
+    print(f"{name:<40} {seconds / NUMBER * 1e6:8.2f} us/record")
+
+
+def main():
+    payload = {
+        "dataModelUpdate": {
+            "surfaceId": "sales",
+            "contents": [{"key": f"chart.items[{index}].value", "valueNumber": index} for index in range(50)],
+        }
+    }
+    log_utils.configure_log_categories(f"{log_utils.PAYLOAD_LOG_CATEGORY}=INFO")
+    payload_logger = log_utils.get_category_logger(log_utils.PAYLOAD_LOG_CATEGORY)
+
+    report("disabled, eager f-string", lambda: payload_logger.debug(f"Payload {json.dumps(payload)}"))
+    report("disabled, Truncated", lambda: payload_logger.debug("Payload %s", log_utils.Truncated(payload)))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,7 @@ import logging
 from typing import Any, Optional
 
 from a2a.server.agent_execution import RequestContext
-from a2a.types import AgentExtension, Part, DataPart
+from a2a.types import AgentCard, AgentExtension, Part, DataPart
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +28,7 @@ A2UI_MIME_TYPE = "application/json+a2ui"
 A2UI_CLIENT_CAPABILITIES_KEY = "a2uiClientCapabilities"
 SUPPORTED_CATALOG_IDS_KEY = "supportedCatalogIds"
 INLINE_CATALOGS_KEY = "inlineCatalogs"
+ACCEPTS_INLINE_CUSTOM_CATALOG_KEY = "acceptsInlineCustomCatalog"
 
 STANDARD_CATALOG_ID = "https://raw.githubusercontent.com/google/A2UI/refs/heads/main/specification/0.8/json/standard_catalog_definition.json"
 
@@ -82,18 +83,23 @@ def get_a2ui_datapart(part: Part) -> Optional[DataPart]:
 
 def get_a2ui_agent_extension(
     accepts_inline_custom_catalog: bool = False,
+    supported_catalog_ids: Optional[list[str]] = None,
 ) -> AgentExtension:
     """Creates the A2UI AgentExtension configuration.
 
     Args:
         accepts_inline_custom_catalog: Whether the agent accepts inline custom catalogs.
+        supported_catalog_ids: The IDs of the catalogs the agent can emit
+            components from. If not set, only the standard catalog is assumed.
 
     Returns:
         The configured A2UI AgentExtension.
     """
     params = {}
     if accepts_inline_custom_catalog:
-        params["acceptsInlineCustomCatalog"] = True  # Only set if not default of False
+        params[ACCEPTS_INLINE_CUSTOM_CATALOG_KEY] = True  # Only set if not default of False
+    if supported_catalog_ids:
+        params[SUPPORTED_CATALOG_IDS_KEY] = supported_catalog_ids
 
     return AgentExtension(
         uri=A2UI_EXTENSION_URI,
@@ -102,6 +108,50 @@ def get_a2ui_agent_extension(
     )
 
 
+def get_agent_a2ui_extension_params(agent_card: AgentCard) -> Optional[dict[str, Any]]:
+    """Gets the A2UI extension params advertised in an agent card.
+
+    Args:
+        agent_card: The agent card to check.
+
+    Returns:
+        The extension params, which are empty if the agent supports A2UI without
+        params, or None if the agent does not support A2UI.
+    """
+    for extension in (agent_card.capabilities.extensions if agent_card.capabilities else None) or []:
+        if extension.uri == A2UI_EXTENSION_URI:
+            return extension.params or {}
+    return None
+
+
+def is_agent_compatible_with_client(
+    agent_extension_params: Optional[dict[str, Any]],
+    client_capabilities: Optional[dict[str, Any]],
+) -> bool:
+    """Checks whether a client can render the A2UI components an agent emits.
+
+    Args:
+        agent_extension_params: The agent's A2UI extension params, or None if the
+            agent does not support A2UI.
+        client_capabilities: The client's A2UI capabilities. If not set, the
+            client is assumed to support only the standard catalog.
+
+    Returns:
+        True if the agent does not emit A2UI, or if it shares a catalog with the
+        client, or accepts the client's inline catalogs.
+    """
+    if agent_extension_params is None:
+        return True
+
+    client_capabilities = client_capabilities or {}
+    if client_capabilities.get(INLINE_CATALOGS_KEY) and agent_extension_params.get(ACCEPTS_INLINE_CUSTOM_CATALOG_KEY):
+        return True
+
+    agent_catalog_ids = agent_extension_params.get(SUPPORTED_CATALOG_IDS_KEY) or [STANDARD_CATALOG_ID]
+    client_catalog_ids = client_capabilities.get(SUPPORTED_CATALOG_IDS_KEY) or [STANDARD_CATALOG_ID]
+    return not set(agent_catalog_ids).isdisjoint(client_catalog_ids)
+
+
 def try_activate_a2ui_extension(context: RequestContext) -> bool:
     """Activates the A2UI extension if requested.
 
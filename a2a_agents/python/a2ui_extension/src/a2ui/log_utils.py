@@ -0,0 +1,108 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import json
+import logging
+import os
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+LOG_CATEGORIES_ENV_VAR = "A2UI_LOG_CATEGORIES"
+
+# Full request, response, event and A2UI payloads. Logged at DEBUG.
+PAYLOAD_LOG_CATEGORY = "payload"
+# Per-event progress of agent runs. Logged at DEBUG.
+EVENT_LOG_CATEGORY = "event"
+
+DEFAULT_MAX_LENGTH = 500
+
+
+class Truncated:
+    """Formats a value for logging only when a handler emits the record.
+
+    Pass instances as `%s` arguments, e.g.
+    `logger.debug("Payload %s", Truncated(payload))`, so that large payloads
+    are neither serialized nor copied when the log level is disabled.
+    """
+
+    __slots__ = ("_value", "_max_length")
+
+    def __init__(self, value: Any, max_length: int = DEFAULT_MAX_LENGTH):
+        self._value = value
+        self._max_length = max_length
+
+    def __str__(self) -> str:
+        value = self._value
+        if hasattr(value, "model_dump_json"):
+            text = value.model_dump_json(exclude_none=True)
+        elif isinstance(value, (dict, list)):
+            text = json.dumps(value, default=str)
+        else:
+            text = str(value)
+
+        if len(text) <= self._max_length:
+            return text
+        return f"{text[:self._max_length]}... ({len(text) - self._max_length} more chars)"
+
+
+class SamplingFilter(logging.Filter):
+    """Lets only every n-th record of a high volume logger through."""
+
+    def __init__(self, every_n: int):
+        super().__init__()
+        self._every_n = max(every_n, 1)
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return next(self._counter) % self._every_n == 0
+
+
+def get_category_logger(category: str) -> logging.Logger:
+    """Gets the logger of a log category, whose level can be set on its own.
+
+    Args:
+        category: The log category, e.g. PAYLOAD_LOG_CATEGORY.
+
+    Returns:
+        The logger for the category.
+    """
+    return logging.getLogger(f"a2ui.{category}")
+
+
+def configure_log_categories(spec: Optional[str] = None):
+    """Sets the level and sampling of log categories.
+
+    Args:
+        spec: Comma separated `category=LEVEL` or `category=LEVEL:N` entries,
+            where N keeps only every N-th record, e.g. "payload=DEBUG:10,event=INFO".
+            Read from the A2UI_LOG_CATEGORIES environment variable if not set.
+            Malformed entries are skipped with a warning.
+    """
+    spec = spec if spec is not None else os.getenv(LOG_CATEGORIES_ENV_VAR, "")
+    for entry in filter(None, (entry.strip() for entry in spec.split(","))):
+        category, _, setting = entry.partition("=")
+        level, _, every_n = setting.partition(":")
+        category_logger = get_category_logger(category.strip())
+        try:
+            sample_every_n = int(every_n) if every_n.strip() else None
+            category_logger.setLevel(level.strip().upper() or logging.NOTSET)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Skipping malformed log category entry '{entry}' in {LOG_CATEGORIES_ENV_VAR}: {e}")
+            continue
+        for existing_filter in [f for f in category_logger.filters if isinstance(f, SamplingFilter)]:
+            category_logger.removeFilter(existing_filter)
+        if sample_every_n is not None:
+            category_logger.addFilter(SamplingFilter(sample_every_n))
@@ -14,7 +14,7 @@
 
 
 from a2a.server.agent_execution import RequestContext
-from a2a.types import DataPart, TextPart, Part
+from a2a.types import AgentCapabilities, AgentCard, DataPart, TextPart, Part
 from a2ui import a2ui_extension
 
 from unittest.mock import MagicMock
@@ -72,6 +72,65 @@ def test_get_a2ui_agent_extension_with_inline_custom_catalog():
     assert agent_extension.params is not None
 
 
+def test_get_a2ui_agent_extension_with_supported_catalog_ids():
+    agent_extension = a2ui_extension.get_a2ui_agent_extension(
+        supported_catalog_ids=["custom-catalog", a2ui_extension.STANDARD_CATALOG_ID]
+    )
+    assert agent_extension.params == {
+        a2ui_extension.SUPPORTED_CATALOG_IDS_KEY: [
+            "custom-catalog",
+            a2ui_extension.STANDARD_CATALOG_ID,
+        ]
+    }
+
+
+def test_get_agent_a2ui_extension_params():
+    def make_card(extensions):
+        return AgentCard(
+            name="test",
+            description="test",
+            url="http://localhost",
+            version="1.0.0",
+            default_input_modes=["text"],
+            default_output_modes=["text"],
+            capabilities=AgentCapabilities(extensions=extensions),
+            skills=[],
+        )
+
+    assert a2ui_extension.get_agent_a2ui_extension_params(make_card([])) is None
+    assert (
+        a2ui_extension.get_agent_a2ui_extension_params(
+            make_card([a2ui_extension.get_a2ui_agent_extension()])
+        )
+        == {}
+    )
+    assert a2ui_extension.get_agent_a2ui_extension_params(
+        make_card(
+            [a2ui_extension.get_a2ui_agent_extension(supported_catalog_ids=["custom-catalog"])]
+        )
+    ) == {a2ui_extension.SUPPORTED_CATALOG_IDS_KEY: ["custom-catalog"]}
+
+
+def test_is_agent_compatible_with_client():
+    custom_only = {a2ui_extension.SUPPORTED_CATALOG_IDS_KEY: ["custom-catalog"]}
+
+    # Agents without A2UI and standard catalog agents work with any client
+    assert a2ui_extension.is_agent_compatible_with_client(None, None)
+    assert a2ui_extension.is_agent_compatible_with_client({}, None)
+    assert not a2ui_extension.is_agent_compatible_with_client(custom_only, None)
+    assert a2ui_extension.is_agent_compatible_with_client(
+        custom_only,
+        {a2ui_extension.SUPPORTED_CATALOG_IDS_KEY: ["custom-catalog"]},
+    )
+    assert not a2ui_extension.is_agent_compatible_with_client(
+        {}, {a2ui_extension.SUPPORTED_CATALOG_IDS_KEY: ["custom-catalog"]}
+    )
+    assert a2ui_extension.is_agent_compatible_with_client(
+        {**custom_only, a2ui_extension.ACCEPTS_INLINE_CUSTOM_CATALOG_KEY: True},
+        {a2ui_extension.INLINE_CATALOGS_KEY: ["{}"]},
+    )
+
+
 def test_try_activate_a2ui_extension():
     context = MagicMock(spec=RequestContext)
     context.requested_extensions = [a2ui_extension.A2UI_EXTENSION_URI]
@@ -0,0 +1,83 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from a2ui import log_utils
+
+
+class CountingValue:
+    def __init__(self):
+        self.str_calls = 0
+
+    def __str__(self):
+        self.str_calls += 1
+        return "value"
+
+
+def test_truncated_formats_lazily_and_truncates():
+    assert str(log_utils.Truncated({"a": 1})) == '{"a": 1}'
+    assert str(log_utils.Truncated("x" * 20, max_length=5)) == "xxxxx... (15 more chars)"
+
+
+def test_disabled_category_does_not_format_payload(caplog):
+    log_utils.configure_log_categories("test_disabled=INFO")
+    value = CountingValue()
+
+    with caplog.at_level(logging.DEBUG):
+        log_utils.get_category_logger("test_disabled").debug(
+            "Payload %s", log_utils.Truncated(value)
+        )
+
+    assert value.str_calls == 0
+    assert not caplog.records
+
+
+def test_sampled_category_keeps_every_nth_record(caplog):
+    log_utils.configure_log_categories("test_sampled=DEBUG:3")
+    category_logger = log_utils.get_category_logger("test_sampled")
+
+    with caplog.at_level(logging.DEBUG):
+        for index in range(7):
+            category_logger.debug("Record %d", index)
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Record 0",
+        "Record 3",
+        "Record 6",
+    ]
+
+
+def test_malformed_entries_are_skipped_with_a_warning(caplog):
+    with caplog.at_level(logging.WARNING, logger="a2ui.log_utils"):
+        log_utils.configure_log_categories(
+            "test_bad_sampling=DEBUG:x,test_bad_level=LOUD,test_good=DEBUG:2"
+        )
+
+    assert log_utils.get_category_logger("test_bad_sampling").level == logging.NOTSET
+    assert log_utils.get_category_logger("test_bad_level").level == logging.NOTSET
+    assert log_utils.get_category_logger("test_good").level == logging.DEBUG
+    warnings = [record.getMessage() for record in caplog.records]
+    assert len(warnings) == 2
+    assert "test_bad_sampling=DEBUG:x" in warnings[0]
+    assert "test_bad_level=LOUD" in warnings[1]
+
+
+def test_malformed_entry_keeps_previous_setting():
+    log_utils.configure_log_categories("test_kept=INFO:4")
+    log_utils.configure_log_categories("test_kept=DEBUG:four")
+    category_logger = log_utils.get_category_logger("test_kept")
+
+    assert category_logger.level == logging.INFO
+    assert any(isinstance(f, log_utils.SamplingFilter) for f in category_logger.filters)
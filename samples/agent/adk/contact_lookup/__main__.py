@@ -26,10 +26,12 @@ from agent_executor import ContactAgentExecutor
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
+from a2ui.log_utils import configure_log_categories
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
+configure_log_categories()
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +23,7 @@ from a2ui_examples import CONTACT_UI_EXAMPLES
 
 # Corrected imports from our new/refactored files
 from a2ui_schema import A2UI_SCHEMA
+from a2ui.log_utils import EVENT_LOG_CATEGORY, PAYLOAD_LOG_CATEGORY, Truncated, get_category_logger
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
@@ -38,6 +39,8 @@ from prompt_builder import (
 from tools import get_contact_info
 
 logger = logging.getLogger(__name__)
+event_logger = get_category_logger(EVENT_LOG_CATEGORY)
+payload_logger = get_category_logger(PAYLOAD_LOG_CATEGORY)
 
 
 class ContactAgent:
@@ -151,7 +154,7 @@ class ContactAgent:
                 session_id=session.id,
                 new_message=current_message,
             ):
-                logger.info(f"Event from runner: {event}")
+                event_logger.debug("Event from runner: %s", Truncated(event))
                 if event.is_final_response():
                     if (
                         event.content
@@ -163,7 +166,7 @@ class ContactAgent:
                         )
                     break  # Got the final response, stop consuming events
                 else:
-                    logger.info(f"Intermediate event: {event}")
+                    event_logger.debug("Intermediate event: %s", Truncated(event))
                     # Yield intermediate updates on every attempt
                     yield {
                         "is_task_complete": False,
@@ -255,7 +258,7 @@ class ContactAgent:
                 logger.info(
                     f"--- ContactAgent.stream: Response is valid. Sending final response (Attempt {attempt}). ---"
                 )
-                logger.info(f"Final response: {final_response_content}")
+                payload_logger.debug("Final response: %s", Truncated(final_response_content))
                 yield {
                     "is_task_complete": True,
                     "content": final_response_content,
@@ -34,8 +34,10 @@ from a2a.utils import (
 from a2a.utils.errors import ServerError
 from agent import ContactAgent
 from a2ui.a2ui_extension import create_a2ui_part, try_activate_a2ui_extension
+from a2ui.log_utils import PAYLOAD_LOG_CATEGORY, Truncated, get_category_logger
 
 logger = logging.getLogger(__name__)
+payload_logger = get_category_logger(PAYLOAD_LOG_CATEGORY)
 
 
 class ContactAgentExecutor(AgentExecutor):
@@ -83,14 +85,14 @@ class ContactAgentExecutor(AgentExecutor):
                         logger.info(f"  Part {i}: Found a2ui UI ClientEvent payload.")
                         ui_event_part = part.root.data["userAction"]
                     else:
-                        logger.info(f"  Part {i}: DataPart (data: {part.root.data})")
+                        payload_logger.debug("  Part %d: DataPart (data: %s)", i, Truncated(part.root.data))
                 elif isinstance(part.root, TextPart):
-                    logger.info(f"  Part {i}: TextPart (text: {part.root.text})")
+                    payload_logger.debug("  Part %d: TextPart (text: %s)", i, Truncated(part.root.text))
                 else:
                     logger.info(f"  Part {i}: Unknown part type ({type(part.root)})")
 
         if ui_event_part:
-            logger.info(f"Received a2ui ClientEvent: {ui_event_part}")
+            logger.info("Received a2ui ClientEvent: %s", Truncated(ui_event_part))
             # Fix: Check both 'actionName' and 'name'
             action = ui_event_part.get("name")
             ctx = ui_event_part.get("context", {})
@@ -189,14 +191,15 @@ class ContactAgentExecutor(AgentExecutor):
                  final_parts = [Part(root=TextPart(text="OK."))]
 
 
-            logger.info("--- FINAL PARTS TO BE SENT ---")
-            for i, part in enumerate(final_parts):
-                logger.info(f"  - Part {i}: Type = {type(part.root)}")
-                if isinstance(part.root, TextPart):
-                    logger.info(f"    - Text: {part.root.text[:200]}...")
-                elif isinstance(part.root, DataPart):
-                    logger.info(f"    - Data: {str(part.root.data)[:200]}...")
-            logger.info("-----------------------------")
+            if payload_logger.isEnabledFor(logging.DEBUG):
+                payload_logger.debug("--- FINAL PARTS TO BE SENT ---")
+                for i, part in enumerate(final_parts):
+                    payload_logger.debug("  - Part %d: Type = %s", i, type(part.root))
+                    if isinstance(part.root, TextPart):
+                        payload_logger.debug("    - Text: %s", Truncated(part.root.text, max_length=200))
+                    elif isinstance(part.root, DataPart):
+                        payload_logger.debug("    - Data: %s", Truncated(part.root.data, max_length=200))
+                payload_logger.debug("-----------------------------")
 
             await updater.update_status(
                 final_state,
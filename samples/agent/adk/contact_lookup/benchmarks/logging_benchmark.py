@@ -0,0 +1,134 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Times ContactAgentExecutor.execute, and so ContactAgent.stream, with each logging setup.
+
+The runner is replaced by one that replays a tool call, its response with
+every contact, and a final response with A2UI JSON, so no model is called.
+Every setup logs INFO through a handler that formats each record and drops
+it, like the basicConfig handler in __main__:
+
+- default: the payload and event categories are at their default levels, so
+  their payloads are never formatted.
+- payload and event at DEBUG: every event and payload is formatted, which the
+  agents did on every request when they logged them at INFO in f-strings.
+
+Run from the contact_lookup directory:
+
+    uv run python -m benchmarks.logging_benchmark
+"""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import AsyncIterator
+
+from a2a.server.agent_execution import RequestContext
+from a2a.server.events import EventQueue
+from a2a.types import Message, MessageSendParams, Part, Role, TextPart
+from google.adk.events.event import Event
+from google.genai import types
+from a2ui.log_utils import configure_log_categories
+
+from agent_executor import ContactAgentExecutor
+
+NUMBER = 200
+
+
+class FormattingHandler(logging.Handler):
+    """Formats every record like a stream handler, without writing it anywhere."""
+
+    def emit(self, record: logging.LogRecord):
+        self.format(record)
+
+
+class ReplayRunner:
+    """Stands in for the ADK runner of an agent and replays the same events on every run."""
+
+    def __init__(self, runner, events: list[Event]):
+        self.session_service = runner.session_service
+        self._events = events
+
+    async def run_async(self, **kwargs) -> AsyncIterator[Event]:
+        for event in self._events:
+            yield event
+
+
+def make_events() -> list[Event]:
+    contacts = json.loads((Path(__file__).parent.parent / "contact_data.json").read_text())
+    a2ui_messages = [
+        {"dataModelUpdate": {"surfaceId": "contacts", "contents": [{"key": "contacts", "valueString": json.dumps(contacts)}]}}
+    ]
+    return [
+        Event(
+            author="contact_agent",
+            content=types.Content(
+                role="model",
+                parts=[types.Part.from_function_call(name="get_contact_info", args={"name": "Alex", "department": ""})],
+            ),
+        ),
+        Event(
+            author="contact_agent",
+            content=types.Content(
+                role="user",
+                parts=[types.Part.from_function_response(name="get_contact_info", response={"result": contacts})],
+            ),
+        ),
+        Event(
+            author="contact_agent",
+            content=types.Content(
+                role="model",
+                parts=[types.Part.from_text(text=f"Here are the contacts.\n---a2ui_JSON---\n{json.dumps(a2ui_messages)}")],
+            ),
+        ),
+    ]
+
+
+def make_request_context() -> RequestContext:
+    message = Message(
+        message_id="message",
+        context_id="context",
+        role=Role.user,
+        parts=[Part(root=TextPart(text="Who is Alex Jordan?"))],
+    )
+    return RequestContext(request=MessageSendParams(message=message), task_id="task", context_id="context")
+
+
+async def time_execute(executor: ContactAgentExecutor) -> float:
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        await executor.execute(make_request_context(), EventQueue())
+    return time.perf_counter() - start
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, handlers=[FormattingHandler()])
+    executor = ContactAgentExecutor(base_url="http://localhost:10003")
+    events = make_events()
+    for agent in (executor.ui_agent, executor.text_agent):
+        agent._runner = ReplayRunner(agent._runner, events)
+
+    for name, spec in [
+        ("default", "payload=NOTSET,event=NOTSET"),
+        ("payload and event at DEBUG", "payload=DEBUG,event=DEBUG"),
+    ]:
+        configure_log_categories(spec)
+        seconds = asyncio.run(time_execute(executor))
+        print(f"{name:<40} {seconds / NUMBER * 1e6:8.2f} us/execute")
+
+
+if __name__ == "__main__":
+    main()
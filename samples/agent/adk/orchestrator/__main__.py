@@ -12,22 +12,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import logging
 import os
 import traceback
 import asyncio
+import contextlib
 import click
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
 from agent import OrchestratorAgent
 from agent_executor import OrchestratorAgentExecutor
+from surface_id_signer import SurfaceIdSigner
+from subagent_registry import SubagentRegistry
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from a2ui.log_utils import configure_log_categories
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
+configure_log_categories()
 logger = logging.getLogger(__name__)
 
 
@@ -39,7 +45,42 @@ class MissingAPIKeyError(Exception):
 @click.option("--host", default="localhost", type=str)
 @click.option("--port", default=10002, type=int)
 @click.option("--subagent_urls", multiple=True, type=str, required=True)
-def main(host, port, subagent_urls):
+@click.option(
+    "--surface_id_signing_key",
+    envvar="SURFACE_ID_SIGNING_KEY",
+    default=None,
+    type=str,
+    help="Shared secret used to sign subagent routes into surfaceIds, so any replica can route userActions without session state.",
+)
+@click.option(
+    "--subagent_urls_file",
+    default=None,
+    type=str,
+    help="File with one subagent URL per line, re-read on every poll so subagents can be added or removed at runtime.",
+)
+@click.option(
+    "--subagent_health_path",
+    default=None,
+    type=str,
+    help="Path on each subagent, e.g. /healthz, that must return 2xx for the subagent to receive requests.",
+)
+@click.option("--subagent_poll_interval", default=30.0, type=float, help="Seconds between subagent health polls.")
+@click.option(
+    "--request_budget_seconds",
+    default=600.0,
+    type=float,
+    help="Time budget of a request, shortened by the remainingDeadlineSeconds message metadata sent by the client.",
+)
+def main(
+    host,
+    port,
+    subagent_urls,
+    surface_id_signing_key,
+    subagent_urls_file,
+    subagent_health_path,
+    subagent_poll_interval,
+    request_budget_seconds,
+):
     try:
         # Check for API key only if Vertex AI is not configured
         if not os.getenv("GOOGLE_GENAI_USE_VERTEXAI") == "TRUE":
@@ -50,8 +91,22 @@ def main(host, port, subagent_urls):
 
         base_url = f"http://{host}:{port}"
         
-        orchestrator_agent = asyncio.run(OrchestratorAgent.build_agent(subagent_urls=subagent_urls))
-        agent_executor = OrchestratorAgentExecutor(base_url=base_url, agent=orchestrator_agent)
+        surface_id_signer = SurfaceIdSigner(surface_id_signing_key) if surface_id_signing_key else None
+        subagent_registry = SubagentRegistry(
+            subagent_urls=subagent_urls,
+            create_remote_agent=functools.partial(OrchestratorAgent.create_remote_agent, surface_id_signer=surface_id_signer),
+            subagent_urls_file=subagent_urls_file,
+            health_path=subagent_health_path,
+            poll_interval_seconds=subagent_poll_interval,
+        )
+        orchestrator_agent = asyncio.run(OrchestratorAgent.build_agent(subagent_registry=subagent_registry, surface_id_signer=surface_id_signer))
+        agent_executor = OrchestratorAgentExecutor(
+            base_url=base_url,
+            agent=orchestrator_agent,
+            subagent_registry=subagent_registry,
+            surface_id_signer=surface_id_signer,
+            request_budget_seconds=request_budget_seconds,
+        )
 
         request_handler = DefaultRequestHandler(
             agent_executor=agent_executor,
@@ -62,7 +117,16 @@ def main(host, port, subagent_urls):
         )
         import uvicorn
 
-        app = server.build()
+        @contextlib.asynccontextmanager
+        async def lifespan(app):
+            # Poll the subagents on the server's event loop while it runs
+            await subagent_registry.start()
+            try:
+                yield
+            finally:
+                await subagent_registry.stop()
+
+        app = server.build(lifespan=lifespan)
 
         app.add_middleware(
             CORSMiddleware,
@@ -12,11 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import json
 import logging
 import os
-from typing import List
-from a2a.client import A2ACardResolver
+from typing import Any, List, Optional
 from a2a.extensions.common import HTTP_EXTENSION_HEADER
 from google.adk.models.lite_llm import LiteLlm
 from google.adk.agents.llm_agent import LlmAgent
@@ -24,19 +24,28 @@ from google.adk.agents.remote_a2a_agent import RemoteA2aAgent, DEFAULT_TIMEOUT
 from google.adk.planners.built_in_planner import BuiltInPlanner
 from google.genai import types as genai_types
 import httpx
-import re
 import part_converters
 from google.adk.agents.callback_context import  CallbackContext
 from google.adk.models.llm_request import LlmRequest
 from google.adk.models.llm_response import LlmResponse
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
 from subagent_route_manager import SubagentRouteManager
+from subagent_intent_router import SubagentIntentRouter
+from subagent_registry import SubagentRegistry, get_agent_name
+from subagent_circuit_breaker import SubagentCircuitBreaker
+import request_deadline
+from surface_id_signer import SurfaceIdSigner
+from subagent_fan_out import FAN_OUT_AGENT_NAME, FAN_OUT_TOOL_NAME, SubagentFanOutAgent, fan_out_to_subagents
 from a2ui.a2ui_extension import is_a2ui_part, A2UI_EXTENSION_URI
+from a2ui.log_utils import PAYLOAD_LOG_CATEGORY, Truncated, get_category_logger
 from typing import override
-from a2a.types import TransportProtocol as A2ATransport
+from a2a.types import AgentCard, TransportProtocol as A2ATransport
 
 logger = logging.getLogger(__name__)
-from a2a.client.middleware import ClientCallInterceptor
-from a2a.client.client import ClientConfig as A2AClientConfig
+payload_logger = get_category_logger(PAYLOAD_LOG_CATEGORY)
+from a2a.client.middleware import ClientCallContext, ClientCallInterceptor
+from a2a.client.client import Client, ClientConfig as A2AClientConfig, Consumer
 from a2a.client.client_factory import ClientFactory as A2AClientFactory
 from a2ui.a2ui_extension import A2UI_CLIENT_CAPABILITIES_KEY
 
@@ -50,21 +59,33 @@ class A2UIMetadataInterceptor(ClientCallInterceptor):
         agent_card: AgentCard | None,
         context: ClientCallContext | None,
     ) -> tuple[dict[str, Any], dict[str, Any]]:
-        """Enables the A2UI extension header and adds A2UI client capabilities to remote agent message metadata."""
-        logger.info("Intercepting client call to method: " + method_name + " and payload " + json.dumps(request_payload))
-                
+        """Enables the A2UI extension header and adds A2UI client capabilities and the remaining deadline to remote agent message metadata."""
+        payload_logger.debug("Intercepting client call to method: %s and payload %s", method_name, Truncated(request_payload))
+
+        message = (request_payload.get("params") or {}).get("message")
         if context and context.state and context.state.get("use_ui"):
             # Add A2UI extension header
             http_kwargs["headers"] = {HTTP_EXTENSION_HEADER: A2UI_EXTENSION_URI}
             
             # Add A2UI client capabilities (supported catalogs, etc) to message metadata
-            if (params := request_payload.get("params")) and (message := params.get("message")):            
+            if message:
                 client_capabilities = context.state.get("client_capabilities")                
                 if "metadata" not in message:
                     message["metadata"] = {}
                 message["metadata"][A2UI_CLIENT_CAPABILITIES_KEY] = client_capabilities
-                logger.info(f"Added client capabilities to remote agent message metadata: {client_capabilities}")
-                        
+                payload_logger.debug(
+                    "Added client capabilities to remote agent message metadata: %s", Truncated(client_capabilities)
+                )
+
+        # Bound the call by what is left of the incoming request's budget
+        if (remaining_seconds := request_deadline.get_remaining_seconds()) is not None:
+            remaining_seconds = max(remaining_seconds, 0.0)
+            http_kwargs["timeout"] = remaining_seconds
+            if message:
+                if message.get("metadata") is None:
+                    message["metadata"] = {}
+                message["metadata"][request_deadline.REMAINING_DEADLINE_METADATA_KEY] = remaining_seconds
+
         return request_payload, http_kwargs
 
 class A2AClientFactoryWithA2UIMetadata(A2AClientFactory):
@@ -83,9 +104,53 @@ class OrchestratorAgent:
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
     
+    @classmethod
+    def _transfer_to_agent_response(cls, agent_name: str) -> LlmResponse:
+        return LlmResponse(
+            content=genai_types.Content(
+                parts=[
+                    genai_types.Part(
+                        function_call=genai_types.FunctionCall(
+                            name="transfer_to_agent",
+                            args={"agent_name": agent_name},
+                        )
+                    )
+                ]
+            )
+        )
+
+    @classmethod
+    def _fan_out_to_subagents_response(cls, agent_names: List[str]) -> LlmResponse:
+        return LlmResponse(
+            content=genai_types.Content(
+                parts=[
+                    genai_types.Part(
+                        function_call=genai_types.FunctionCall(
+                            name=FAN_OUT_TOOL_NAME,
+                            args={"agent_names": agent_names},
+                        )
+                    )
+                ]
+            )
+        )
+
+    @classmethod
+    async def _get_user_action_route(
+        cls,
+        surface_id: str,
+        surface_id_signer: Optional[SurfaceIdSigner],
+        callback_context: CallbackContext,
+    ) -> Optional[str]:
+        # Signed surfaceIds carry their route, so no state lookup is needed
+        if surface_id_signer and (verified := surface_id_signer.verify(surface_id)):
+            return verified[0]
+        return await SubagentRouteManager.get_route_to_subagent_name(surface_id, callback_context.state)
+
     @classmethod
     async def programmtically_route_user_action_to_subagent(
         cls,
+        subagent_registry: SubagentRegistry,
+        surface_id_signer: Optional[SurfaceIdSigner],
         callback_context: CallbackContext,
         llm_request: LlmRequest,
     ) -> LlmResponse:
@@ -96,93 +161,318 @@ class OrchestratorAgent:
             and is_a2ui_part(a2a_part)
             and (user_action := a2a_part.root.data.get("userAction"))
             and (surface_id := user_action.get("surfaceId"))
-            and (target_agent := await SubagentRouteManager.get_route_to_subagent_name(surface_id, callback_context.state))
+            and (target_agent := await cls._get_user_action_route(surface_id, surface_id_signer, callback_context))
         ):
+            if not subagent_registry.is_available(target_agent):
+                logger.warning(f"Not routing userAction for surfaceId '{surface_id}' to unavailable subagent '{target_agent}'")
+                return None
             logger.info(f"Programmatically routing userAction for surfaceId '{surface_id}' to subagent '{target_agent}'")
-            return LlmResponse(
-                content=genai_types.Content(
-                    parts=[
-                        genai_types.Part(
-                            function_call=genai_types.FunctionCall(
-                                name="transfer_to_agent",
-                                args={"agent_name": target_agent},
-                            )
-                        )
-                    ]
-                )
-            )
+            return cls._transfer_to_agent_response(target_agent)
                      
         return None
 
     @classmethod
-    async def build_agent(cls, subagent_urls: List[str]) -> LlmAgent:
-        """Builds the LLM agent for the orchestrator_agent agent."""
-
-        subagents = []
-        for subagent_url in subagent_urls:
-            async with httpx.AsyncClient() as httpx_client:
-                resolver = A2ACardResolver(
-                    httpx_client=httpx_client,
-                    base_url=subagent_url,
-                )
-                
-                subagent_card =  await resolver.get_agent_card()
-                logger.info('Successfully fetched public agent card:' + subagent_card.model_dump_json(indent=2, exclude_none=True))
-                
-                # clean name for adk
-                clean_name = re.sub(r'[^0-9a-zA-Z_]+', '_', subagent_card.name)                
-                if clean_name == "":
-                    clean_name = "_"
-                if clean_name[0].isdigit():
-                    clean_name = f"_{clean_name}"
-                
-                # make remote agent
-                description = json.dumps({
-                    "id": clean_name,
-                    "name": subagent_card.name,
-                    "description": subagent_card.description,
-                    "skills": [
-                        {
-                            "name": skill.name, 
-                            "description": skill.description, 
-                            "examples": skill.examples, 
-                            "tags": skill.tags
-                        } for skill in subagent_card.skills
+    def _get_user_query_text(cls, llm_request: LlmRequest) -> Optional[str]:
+        """Returns the text of the latest user message, ignoring A2UI parts."""
+        if not (
+            llm_request.contents
+            and (last_content := llm_request.contents[-1]).role == "user"
+            and last_content.parts
+        ):
+            return None
+
+        texts = []
+        for part in last_content.parts:
+            if not part.text or part.thought:
+                continue
+            a2a_part = part_converters.convert_genai_part_to_a2a_part(part)
+            if a2a_part and is_a2ui_part(a2a_part):
+                continue
+            texts.append(part.text)
+        return " ".join(texts) if texts else None
+
+    @classmethod
+    def _get_incompatible_subagent_names(cls, subagent_registry: SubagentRegistry, callback_context: CallbackContext) -> set[str]:
+        """Returns the subagents whose A2UI catalogs the client does not support."""
+        if not callback_context.state.get("use_ui"):
+            return set()
+        return subagent_registry.get_incompatible_agent_names(callback_context.state.get("client_capabilities"))
+
+    @classmethod
+    async def exclude_incompatible_subagents_from_model(
+        cls,
+        subagent_registry: SubagentRegistry,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+    ) -> Optional[LlmResponse]:
+        """Removes subagents whose UI the client cannot render from the transfer_to_agent choices of the orchestrator LLM."""
+        if not (incompatible_agents := cls._get_incompatible_subagent_names(subagent_registry, callback_context)):
+            return None
+
+        for tool in llm_request.config.tools or []:
+            for declaration in getattr(tool, "function_declarations", None) or []:
+                if declaration.name != "transfer_to_agent":
+                    continue
+                if (
+                    declaration.parameters
+                    and declaration.parameters.properties
+                    and (agent_name_schema := declaration.parameters.properties.get("agent_name"))
+                    and agent_name_schema.enum
+                ):
+                    agent_name_schema.enum = [name for name in agent_name_schema.enum if name not in incompatible_agents]
+                if (
+                    declaration.parameters_json_schema
+                    and (agent_name_json_schema := declaration.parameters_json_schema.get("properties", {}).get("agent_name"))
+                    and agent_name_json_schema.get("enum")
+                ):
+                    agent_name_json_schema["enum"] = [
+                        name for name in agent_name_json_schema["enum"] if name not in incompatible_agents
                     ]
-                }, indent=2)
-                remote_a2a_agent = RemoteA2aAgent(
-                    clean_name, 
-                    subagent_card, 
-                    description=description, # This will be appended to system instructions
-                    a2a_part_converter=part_converters.convert_a2a_part_to_genai_part,
-                    genai_part_converter=part_converters.convert_genai_part_to_a2a_part,                      
-                    a2a_client_factory=A2AClientFactoryWithA2UIMetadata(
-                        config=A2AClientConfig(
-                            httpx_client=httpx.AsyncClient(
-                                timeout=httpx.Timeout(timeout=DEFAULT_TIMEOUT),
-                            ),
-                            streaming=False,
-                            polling=False,
-                            supported_transports=[A2ATransport.jsonrpc],
-                        )
-                    )
+
+        # The subagents are still described in the instructions and the fan-out tool takes any names
+        llm_request.append_instructions([
+            "The client cannot render the UI of these subagents, so never transfer to them or "
+            f"include them in {FAN_OUT_TOOL_NAME}: {', '.join(sorted(incompatible_agents))}"
+        ])
+        return None
+
+    @classmethod
+    async def reject_transfers_to_incompatible_subagents(
+        cls,
+        subagent_registry: SubagentRegistry,
+        tool: BaseTool,
+        args: dict[str, Any],
+        tool_context: ToolContext,
+    ) -> Optional[dict]:
+        """Stops transfers to subagents whose UI the client cannot render.
+
+        Incompatible subagents are dropped from fan-outs, and the tool call is
+        answered with an error when none of its subagents are left.
+        """
+        if not (incompatible_agents := cls._get_incompatible_subagent_names(subagent_registry, tool_context)):
+            return None
+
+        if tool.name == "transfer_to_agent" and (agent_name := args.get("agent_name")) in incompatible_agents:
+            logger.warning(f"Rejecting transfer to subagent '{agent_name}' whose UI the client cannot render")
+            return {"error": f"The client cannot render the UI of the {agent_name} agent."}
+
+        if tool.name == FAN_OUT_TOOL_NAME and (agent_names := args.get("agent_names")):
+            if rejected_agents := [name for name in agent_names if name in incompatible_agents]:
+                logger.warning(f"Dropping subagents {rejected_agents} whose UI the client cannot render from fan-out")
+                args["agent_names"] = [name for name in agent_names if name not in incompatible_agents]
+                if not args["agent_names"]:
+                    return {"error": f"The client cannot render the UI of the {', '.join(rejected_agents)} agents."}
+
+        return None
+
+    @classmethod
+    async def programmatically_route_text_query_to_subagent(
+        cls,
+        subagent_registry: SubagentRegistry,
+        intent_router: SubagentIntentRouter,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+    ) -> Optional[LlmResponse]:
+        """Routes text queries without an orchestrator LLM call when the target is clear.
+
+        Queries whose parts clearly match several subagents are fanned out to all
+        of them. Follow-ups that still match the subagent that served the previous
+        turn stick to it unless they clearly belong to another subagent. Other
+        queries are routed when one subagent is a confident match, and the rest,
+        such as small talk, are left to the LLM. Subagents whose UI the client
+        cannot render are never picked.
+        """
+        if not (query := cls._get_user_query_text(llm_request)):
+            return None
+
+        incompatible_agents = cls._get_incompatible_subagent_names(subagent_registry, callback_context)
+        if len(target_agents := intent_router.route_clauses(query, incompatible_agents)) > 1:
+            logger.info(f"Programmatically fanning out text query to subagents {target_agents}")
+            return cls._fan_out_to_subagents_response(target_agents)
+
+        scores = intent_router.score(query, incompatible_agents)
+        if (
+            (sticky_agent := SubagentRouteManager.get_last_subagent_name(callback_context.state))
+            and intent_router.is_follow_up(scores, sticky_agent)
+        ):
+            logger.info(f"Programmatically routing follow-up text query to previous subagent '{sticky_agent}'")
+            return cls._transfer_to_agent_response(sticky_agent)
+
+        if target_agent := intent_router.pick(scores):
+            logger.info(f"Programmatically routing text query to subagent '{target_agent}'")
+            return cls._transfer_to_agent_response(target_agent)
+
+        return None
+
+    @classmethod
+    async def compact_a2ui_parts_in_model_context(
+        cls,
+        surface_id_signer: Optional[SurfaceIdSigner],
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+    ) -> Optional[LlmResponse]:
+        """Replaces A2UI parts in earlier turns with short summaries before they reach the orchestrator LLM.
+
+        The orchestrator only routes, so full UI payloads would only grow its prompt.
+        The session events keep the full parts for forwarding to subagents.
+        """
+        surface_routes = callback_context.state.get(SubagentRouteManager.SURFACE_ROUTES_KEY) or {}
+
+        def get_subagent_name(surface_id: str) -> Optional[str]:
+            # Signed surfaceIds carry their subagent, and no routes are stored for them
+            if surface_id_signer and (verified := surface_id_signer.verify(surface_id)):
+                return verified[0]
+            return surface_routes.get(surface_id)
+
+        for index, content in enumerate(llm_request.contents[:-1]):
+            if not content.parts or not any(part.text and part_converters.A2UI_PART_TEXT_PREFIX in part.text for part in content.parts):
+                continue
+            llm_request.contents[index] = content.model_copy(
+                update={
+                    "parts": [
+                        part.model_copy(update={"text": part_converters.compact_a2ui_part_text(part.text, get_subagent_name)})
+                        if part.text
+                        else part
+                        for part in content.parts
+                    ]
+                }
+            )
+
+        return None
+
+    @classmethod
+    async def fail_fast_unavailable_subagent(
+        cls,
+        circuit_breaker: SubagentCircuitBreaker,
+        callback_context: CallbackContext,
+    ) -> Optional[genai_types.Content]:
+        """Answers for a subagent without calling it when the request is out of time or the subagent keeps failing."""
+        remaining_seconds = request_deadline.get_remaining_seconds()
+        if remaining_seconds is not None and remaining_seconds <= 0:
+            reason = "could not respond in time"
+        elif not circuit_breaker.allow_request():
+            reason = "temporarily unavailable"
+        else:
+            return None
+
+        logger.warning(f"Not calling subagent '{callback_context.agent_name}': {reason}")
+        return genai_types.Content(
+            role="model",
+            parts=[genai_types.Part(text=f"The {callback_context.agent_name} agent {reason}. Please try again later.")],
+        )
+
+    @classmethod
+    def create_remote_agent(
+        cls,
+        subagent_card: AgentCard,
+        httpx_transport: Optional[httpx.AsyncBaseTransport] = None,
+        circuit_breaker: Optional[SubagentCircuitBreaker] = None,
+        surface_id_signer: Optional[SurfaceIdSigner] = None,
+    ) -> RemoteA2aAgent:
+        """Creates the ADK remote agent for a subagent's agent card.
+
+        Args:
+            subagent_card: The agent card of the subagent.
+            httpx_transport: If set, sends the subagent's requests, e.g. to balance them across replicas.
+            circuit_breaker: If set, the subagent is not called while the breaker is open.
+            surface_id_signer: If set, signed surfaceIds are restored before messages are sent to the subagent.
+        """
+        payload_logger.debug("Successfully fetched public agent card: %s", Truncated(subagent_card))
+
+        # clean name for adk
+        clean_name = get_agent_name(subagent_card.name)
+
+        # make remote agent
+        description = json.dumps({
+            "id": clean_name,
+            "name": subagent_card.name,
+            "description": subagent_card.description,
+            "skills": [
+                {
+                    "name": skill.name,
+                    "description": skill.description,
+                    "examples": skill.examples,
+                    "tags": skill.tags
+                } for skill in subagent_card.skills
+            ]
+        }, indent=2)
+        remote_a2a_agent = RemoteA2aAgent(
+            clean_name,
+            subagent_card,
+            description=description, # This will be appended to system instructions
+            before_agent_callback=(
+                functools.partial(cls.fail_fast_unavailable_subagent, circuit_breaker) if circuit_breaker else None
+            ),
+            a2a_part_converter=part_converters.convert_a2a_part_to_genai_part,
+            genai_part_converter=(
+                surface_id_signer.wrap_genai_part_converter(part_converters.convert_genai_part_to_a2a_part)
+                if surface_id_signer
+                else part_converters.convert_genai_part_to_a2a_part
+            ),
+            a2a_client_factory=A2AClientFactoryWithA2UIMetadata(
+                config=A2AClientConfig(
+                    httpx_client=httpx.AsyncClient(
+                        timeout=httpx.Timeout(timeout=DEFAULT_TIMEOUT),
+                        transport=httpx_transport,
+                    ),
+                    streaming=False,
+                    polling=False,
+                    supported_transports=[A2ATransport.jsonrpc],
                 )
-                subagents.append(remote_a2a_agent)
-                
-                logger.info(f'Created remote agent with description: {description}')
+            )
+        )
+        logger.info("Created remote agent %s", clean_name)
+        payload_logger.debug("Remote agent %s description: %s", clean_name, Truncated(description))
+        return remote_a2a_agent
+
+    @classmethod
+    async def build_agent(cls, subagent_registry: SubagentRegistry, surface_id_signer: Optional[SurfaceIdSigner] = None) -> LlmAgent:
+        """Builds the LLM agent for the orchestrator_agent agent.
+
+        Args:
+            subagent_registry: The registry of A2A subagents to route to. The
+                orchestrator's subagents and intent router follow its changes.
+            surface_id_signer: If set, userActions are routed using the signed
+                surfaceIds created by the executor instead of session state.
+        """
+
+        await subagent_registry.refresh()
+
+        intent_router = SubagentIntentRouter(subagent_registry.available_cards)
+        fan_out_agent = SubagentFanOutAgent(
+            name=FAN_OUT_AGENT_NAME,
+            description=f"Runs several subagents concurrently. Do not transfer to this agent directly, call {FAN_OUT_TOOL_NAME} instead.",
+        )
 
         LITELLM_MODEL = os.getenv("LITELLM_MODEL", "gemini/gemini-2.5-flash")
-        return LlmAgent(
+        orchestrator_agent = LlmAgent(
             model=LiteLlm(model=LITELLM_MODEL),
             name="orchestrator_agent",
             description="An agent that orchestrates requests to multiple other agents",
-            instruction="You are an orchestrator agent. Your sole responsibility is to analyze the incoming user request, determine the user's intent, and route the task to exactly one of your expert subagents",
-            tools=[],
+            instruction=f"You are an orchestrator agent. Your sole responsibility is to analyze the incoming user request, determine the user's intent, and route the task to exactly one of your expert subagents. If the request has parts that need different subagents, call {FAN_OUT_TOOL_NAME} with all of their names instead",
+            tools=[fan_out_to_subagents],
             planner=BuiltInPlanner(
                 thinking_config=genai_types.ThinkingConfig(
                     include_thoughts=True,
                 )
             ),
-            sub_agents=subagents,
-            before_model_callback=cls.programmtically_route_user_action_to_subagent,
+            sub_agents=subagent_registry.available_agents + [fan_out_agent],
+            before_model_callback=[
+                functools.partial(cls.programmtically_route_user_action_to_subagent, subagent_registry, surface_id_signer),
+                functools.partial(cls.programmatically_route_text_query_to_subagent, subagent_registry, intent_router),
+                functools.partial(cls.exclude_incompatible_subagents_from_model, subagent_registry),
+                functools.partial(cls.compact_a2ui_parts_in_model_context, surface_id_signer),
+            ],
+            before_tool_callback=functools.partial(cls.reject_transfers_to_incompatible_subagents, subagent_registry),
         )
+
+        def on_subagents_changed():
+            # Agents that are no longer available keep running their in-flight requests
+            subagents = subagent_registry.available_agents
+            for subagent in subagents:
+                subagent.parent_agent = orchestrator_agent
+            orchestrator_agent.sub_agents = subagents + [fan_out_agent]
+            intent_router.set_subagent_cards(subagent_registry.available_cards)
+
+        subagent_registry.add_listener(on_subagents_changed)
+        return orchestrator_agent
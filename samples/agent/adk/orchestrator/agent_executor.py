@@ -12,12 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import asyncio
+import functools
 import logging
 import json
-from typing import List, Optional, override
-from google.adk.agents.invocation_context import new_invocation_context_id
-from google.adk.events.event_actions import EventActions
+from typing import Any, Awaitable, Callable, List, Optional, override
 
 from a2a.server.agent_execution import RequestContext
 from google.adk.agents.llm_agent import LlmAgent
@@ -30,14 +28,20 @@ from google.adk.a2a.executor.a2a_agent_executor import (
     A2aAgentExecutorConfig,
     A2aAgentExecutor,
 )
-from a2a.types import AgentCapabilities, AgentCard, AgentExtension
+from a2a.types import AgentCapabilities, AgentCard, AgentExtension, TaskStatusUpdateEvent
 from a2ui.a2ui_extension import is_a2ui_part, try_activate_a2ui_extension, A2UI_EXTENSION_URI, STANDARD_CATALOG_ID, SUPPORTED_CATALOG_IDS_KEY, get_a2ui_agent_extension, A2UI_CLIENT_CAPABILITIES_KEY
 from google.adk.a2a.converters import event_converter
+from google.adk.a2a.converters.request_converter import AgentRunRequest
 from a2a.server.events import Event as A2AEvent
 from google.adk.events.event import Event
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.a2a.converters import part_converter
 from subagent_route_manager import SubagentRouteManager
+from session_state_accumulator import SessionStateAccumulator, SessionStateBatch
+from surface_id_signer import SurfaceIdSigner
+from subagent_registry import SubagentRegistry
+from google.adk.agents.remote_a2a_agent import DEFAULT_TIMEOUT
+import request_deadline
 
 from agent import OrchestratorAgent
 import part_converters
@@ -48,8 +52,19 @@ logger = logging.getLogger(__name__)
 class OrchestratorAgentExecutor(A2aAgentExecutor):
     """Contact AgentExecutor Example."""
 
-    def __init__(self, base_url: str, agent: LlmAgent):
+    def __init__(
+        self,
+        base_url: str,
+        agent: LlmAgent,
+        subagent_registry: SubagentRegistry,
+        surface_id_signer: Optional[SurfaceIdSigner] = None,
+        request_budget_seconds: float = DEFAULT_TIMEOUT,
+    ):
         self._base_url = base_url
+        self._request_budget_seconds = request_budget_seconds
+        self._subagent_registry = subagent_registry
+        self._surface_id_signer = surface_id_signer
+        self._state_accumulator = SessionStateAccumulator()
 
         config = A2aAgentExecutorConfig(
             gen_ai_part_converter=part_converters.convert_genai_part_to_a2a_part,
@@ -67,9 +82,8 @@ class OrchestratorAgentExecutor(A2aAgentExecutor):
 
         super().__init__(runner=runner, config=config)
 
-    @classmethod
     def convert_event_to_a2a_events_and_save_surface_id_to_subagent_name(
-        cls,
+        self,
         event: Event,
         invocation_context: InvocationContext,
         task_id: Optional[str] = None,
@@ -84,39 +98,53 @@ class OrchestratorAgentExecutor(A2aAgentExecutor):
             part_converter,
         )
 
+        # Populate subagent agent card if available.
+        subagent_card = self._subagent_registry.get_subagent_metadata(event.author)
         for a2a_event in a2a_events:
-            # Try to populate subagent agent card if available.
-            subagent_card = None
-            if (active_subagent_name := event.author):
-                # We need to find the subagent by name
-                if (subagent := next((sub for sub in invocation_context.agent.sub_agents if sub.name == active_subagent_name), None)):
-                    try:
-                        subagent_card = json.loads(subagent.description)
-                    except Exception:
-                        logger.warning(f"Failed to parse agent description for {active_subagent_name}")
             if subagent_card:
                 if a2a_event.metadata is None:
                     a2a_event.metadata = {}
                 a2a_event.metadata["a2a_subagent"] = subagent_card
                         
-            for a2a_part in a2a_event.status.message.parts:
-                if (
-                    is_a2ui_part(a2a_part)
-                    and (begin_rendering := a2a_part.root.data.get("beginRendering"))
-                    and (surface_id := begin_rendering.get("surfaceId"))
-                ):                    
-                    asyncio.run_coroutine_threadsafe(
+            parts = a2a_event.status.message.parts
+            for index, a2a_part in enumerate(parts):
+                if not (subagent_card and is_a2ui_part(a2a_part)):
+                    continue
+
+                if self._surface_id_signer:
+                    # Signed surfaceIds carry their route, so no route state is written
+                    parts[index] = self._surface_id_signer.sign_a2ui_part(a2a_part, event.author)
+                    continue
+
+                a2ui_message = a2a_part.root.data
+                if (delete_surface := a2ui_message.get("deleteSurface")) and (surface_id := delete_surface.get("surfaceId")):
+                    SubagentRouteManager.delete_route(
+                        surface_id,
+                        self._get_state_batch(task_id, invocation_context),
+                    )
+                    continue
+
+                for message_type in ("beginRendering", "surfaceUpdate", "dataModelUpdate"):
+                    if (message := a2ui_message.get(message_type)) and (surface_id := message.get("surfaceId")):
                         SubagentRouteManager.set_route_to_subagent_name(
                             surface_id,
                             event.author,
-                            invocation_context.session_service,
-                            invocation_context.session,
-                        ),
-                        asyncio.get_event_loop(),
-                    )
+                            self._get_state_batch(task_id, invocation_context),
+                        )
+
+        if subagent_card:
+            # Remember who served this turn so follow-ups can skip the orchestrator LLM
+            SubagentRouteManager.set_last_subagent(event.author, self._get_state_batch(task_id, invocation_context))
 
         return a2a_events
 
+    def _get_state_batch(self, task_id: str, invocation_context: InvocationContext) -> SessionStateBatch:
+        return self._state_accumulator.get_batch(
+            task_id,
+            invocation_context.session_service,
+            invocation_context.session,
+        )
+
     def get_agent_card(self) -> AgentCard:
         return AgentCard(
             name="Orchestrator Agent",
@@ -132,6 +160,31 @@ class OrchestratorAgentExecutor(A2aAgentExecutor):
             skills=[],
         )
 
+    @override
+    async def execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ):
+        # Write the state staged during the run before the client sees the final event,
+        # so that a follow-up request can rely on the routes of this turn.
+        flush_state = functools.partial(self._state_accumulator.flush, context.task_id)
+        # The deadline is read by subagent calls made during this run
+        deadline_token = request_deadline.set_deadline(
+            request_deadline.get_deadline(
+                context.message.metadata if context.message else None,
+                self._request_budget_seconds,
+            )
+        )
+        # ADK uses the A2A context id as the session id
+        registry_token = part_converters.set_registry_session(context.context_id)
+        try:
+            await super().execute(context, _FlushBeforeFinalEventQueue(event_queue, flush_state))
+        finally:
+            part_converters.reset_registry_session(registry_token)
+            request_deadline.reset_deadline(deadline_token)
+            await flush_state()
+
     @override
     async def _prepare_session(
         self,
@@ -140,23 +193,55 @@ class OrchestratorAgentExecutor(A2aAgentExecutor):
         runner: Runner,
     ):
         session = await super()._prepare_session(context, run_request, runner)
-        
+
+        if not self._surface_id_signer:
+            state_batch = self._state_accumulator.get_batch(context.task_id, runner.session_service, session)
+            SubagentRouteManager.migrate_legacy_routes(session.state, state_batch)
+            if surface_id := self._get_user_action_surface_id(context):
+                # Surfaces the user keeps using are evicted last
+                SubagentRouteManager.mark_route_used(surface_id, state_batch)
+
         if try_activate_a2ui_extension(context):
             client_capabilities = context.message.metadata.get(A2UI_CLIENT_CAPABILITIES_KEY) if context.message and context.message.metadata else None
             
-            await runner.session_service.append_event(
-                    session,
-                    Event(
-                        invocation_id=new_invocation_context_id(),
-                        author="system",
-                        actions=EventActions(
-                            state_delta={ 
-                                # These values are used to configure A2UI messages to remote agent calls         
-                                "use_ui": True,
-                                "client_capabilities": client_capabilities 
-                            }
-                        ),
-                    ),
-                )
+            # These values are used to configure A2UI messages to remote agent calls.
+            # Only changed values are written, and they ride on the user message event
+            # of this run instead of a separate system event.
+            state_delta = {
+                key: value
+                for key, value in {"use_ui": True, "client_capabilities": client_capabilities}.items()
+                if session.state.get(key) != value
+            }
+            if state_delta:
+                run_request.state_delta = {**(run_request.state_delta or {}), **state_delta}
             
-        return session
\ No newline at end of file
+        return session
+
+
+    @classmethod
+    def _get_user_action_surface_id(cls, context: RequestContext) -> Optional[str]:
+        """Returns the surfaceId of the userAction in the request, if it has one."""
+        for a2a_part in (context.message.parts if context.message else None) or []:
+            if (
+                is_a2ui_part(a2a_part)
+                and (user_action := a2a_part.root.data.get("userAction"))
+                and (surface_id := user_action.get("surfaceId"))
+            ):
+                return surface_id
+        return None
+
+
+class _FlushBeforeFinalEventQueue:
+    """Wraps an EventQueue to run a flush before the final task status event is enqueued."""
+
+    def __init__(self, event_queue: EventQueue, flush: Callable[[], Awaitable[None]]):
+        self._event_queue = event_queue
+        self._flush = flush
+
+    async def enqueue_event(self, event: A2AEvent):
+        if isinstance(event, TaskStatusUpdateEvent) and event.final:
+            await self._flush()
+        await self._event_queue.enqueue_event(event)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._event_queue, name)
\ No newline at end of file
@@ -0,0 +1,74 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Times convert_genai_part_to_a2a_part on plain text and on A2UI parts.
+
+Each path is compared with parsing the text as an A2A part with pydantic,
+which is what the converter did for every text part before the prefix check.
+
+Run from the orchestrator directory:
+
+    uv run python -m benchmarks.part_converters_benchmark
+"""
+
+import timeit
+
+import pydantic
+from a2a import types as a2a_types
+from google.adk.a2a.converters import part_converter
+from google.genai import types as genai_types
+from a2ui.a2ui_extension import create_a2ui_part, is_a2ui_part
+
+import part_converters
+
+NUMBER = 20000
+
+
+def parse_with_pydantic(part: genai_types.Part):
+    try:
+        a2a_part = a2a_types.Part.model_validate_json(part.text)
+        if is_a2ui_part(a2a_part):
+            return a2a_part
+    except pydantic.ValidationError:
+        pass
+    return part_converter.convert_genai_part_to_a2a_part(part)
+
+
+def report(name: str, convert, part: genai_types.Part):
+    seconds = timeit.timeit(lambda: convert(part), number=NUMBER)
+    print(f"{name:<40} {seconds / NUMBER * 1e6:8.2f} us/part")
+
+
+def main():
+    text_part = genai_types.Part(text="Show me the Q3 sales by product category for the northeast region")
+    a2ui_part = create_a2ui_part(
+        {
+            "dataModelUpdate": {
+                "surfaceId": "sales",
+                "contents": [{"key": f"chart.items[{index}].value", "valueNumber": index} for index in range(50)],
+            }
+        }
+    )
+    a2ui_text_part = part_converters.convert_a2a_part_to_genai_part(a2ui_part)
+    # What the pydantic path parsed: the A2A part JSON without the handle prefix
+    a2ui_json_part = genai_types.Part(text=a2ui_part.model_dump_json())
+
+    report("plain text, prefix check", part_converters.convert_genai_part_to_a2a_part, text_part)
+    report("plain text, pydantic parse", parse_with_pydantic, text_part)
+    report("A2UI part, handle lookup", part_converters.convert_genai_part_to_a2a_part, a2ui_text_part)
+    report("A2UI part, pydantic parse", parse_with_pydantic, a2ui_json_part)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,40 +12,201 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from typing import Callable, NamedTuple, Optional
 import logging
+import marshal
+import uuid
+import weakref
 
 from a2a import types as a2a_types
 from google.genai import types as genai_types
 
 from google.adk.a2a.converters import part_converter
 from a2ui.a2ui_extension import is_a2ui_part
+from a2ui.log_utils import PAYLOAD_LOG_CATEGORY, Truncated, get_category_logger
 
 import pydantic
 
 logger = logging.getLogger(__name__)
+payload_logger = get_category_logger(PAYLOAD_LOG_CATEGORY)
+
+# A2UI parts are carried through ADK as text of the form
+# "a2ui-part:<handle>:<A2A part JSON>". The JSON keeps the part readable by the
+# LLM and by other processes, while the handle lets this process get back a
+# copy of the original A2A part from the registry below without parsing the
+# JSON again. Handles are registered per session and only resolve in the
+# session that registered them.
+A2UI_PART_TEXT_PREFIX = "a2ui-part:"
+_A2UI_PART_REGISTRY_MAX_SIZE = 128
+_A2UI_PART_REGISTRY_MAX_SESSIONS = 32
+
+# The session whose registry converters use, set by the executor for each request
+_registry_session_id: ContextVar[str] = ContextVar("a2ui_part_registry_session_id", default="")
+
+
+class _RegisteredA2uiPart(NamedTuple):
+    data_part: a2a_types.DataPart
+    # The marshalled data and metadata of the part, so every lookup returns
+    # its own copy without a JSON round trip or copy.deepcopy
+    snapshot: bytes
+    # The part object that was converted, so converting it again skips serialization
+    source: weakref.ref
+    source_id: int
+    text: str
+
+
+class _SessionA2uiParts:
+    """The registered A2UI parts of one session, in least to most recently used order."""
+
+    __slots__ = ("parts", "handles_by_id")
+
+    def __init__(self):
+        self.parts: OrderedDict[str, _RegisteredA2uiPart] = OrderedDict()
+        # Handle of each registered part keyed by the id of the part object it was converted from
+        self.handles_by_id: dict[int, str] = {}
+
+
+_a2ui_part_registries: OrderedDict[str, _SessionA2uiParts] = OrderedDict()
+
+
+def set_registry_session(session_id: str) -> Token:
+    """Makes the converters of the current context use the A2UI part registry of a session."""
+    return _registry_session_id.set(session_id)
+
+
+def reset_registry_session(token: Token):
+    """Restores the registry session that was used before set_registry_session returned the token."""
+    _registry_session_id.reset(token)
+
+
+def _get_session_a2ui_parts(create: bool) -> Optional[_SessionA2uiParts]:
+    session_id = _registry_session_id.get()
+    if (session_parts := _a2ui_part_registries.get(session_id)) is not None:
+        _a2ui_part_registries.move_to_end(session_id)
+    elif create:
+        session_parts = _a2ui_part_registries[session_id] = _SessionA2uiParts()
+        if len(_a2ui_part_registries) > _A2UI_PART_REGISTRY_MAX_SESSIONS:
+            _a2ui_part_registries.popitem(last=False)
+    return session_parts
+
+
+def _get_a2ui_part_text(a2a_part: a2a_types.Part) -> str:
+    """Registers an A2UI part and returns the text that carries its handle."""
+    session_parts = _get_session_a2ui_parts(create=True)
+    if (
+        (handle := session_parts.handles_by_id.get(id(a2a_part))) is not None
+        and (registered := session_parts.parts.get(handle)) is not None
+        and registered.source() is a2a_part
+    ):
+        session_parts.parts.move_to_end(handle)
+        return registered.text
+
+    handle = uuid.uuid4().hex[:16]
+    text = f"{A2UI_PART_TEXT_PREFIX}{handle}:{a2a_part.model_dump_json()}"
+    data_part = a2a_part.root
+    try:
+        snapshot = marshal.dumps((data_part.data, data_part.metadata))
+    except ValueError:
+        # Data that is not plain JSON is left to the JSON fallback of the lookup
+        return text
+
+    session_parts.parts[handle] = _RegisteredA2uiPart(data_part, snapshot, weakref.ref(a2a_part), id(a2a_part), text)
+    session_parts.handles_by_id[id(a2a_part)] = handle
+    if len(session_parts.parts) > _A2UI_PART_REGISTRY_MAX_SIZE:
+        evicted_handle, evicted = session_parts.parts.popitem(last=False)
+        if session_parts.handles_by_id.get(evicted.source_id) == evicted_handle:
+            del session_parts.handles_by_id[evicted.source_id]
+    return text
+
+def _lookup_a2ui_part(handle: str) -> Optional[a2a_types.Part]:
+    if (
+        (session_parts := _get_session_a2ui_parts(create=False)) is None
+        or (registered := session_parts.parts.get(handle)) is None
+    ):
+        return None
+    session_parts.parts.move_to_end(handle)
+    data, metadata = marshal.loads(registered.snapshot)
+    # The registered part was already validated, so its copy is not validated again
+    return a2a_types.Part.model_construct(
+        root=registered.data_part.model_copy(update={"data": data, "metadata": metadata})
+    )
 
 def convert_a2a_part_to_genai_part(
     a2a_part: a2a_types.Part,
 ) -> Optional[genai_types.Part]:           
     if is_a2ui_part(a2a_part):                
-        genai_part = genai_types.Part(text=a2a_part.model_dump_json())
-        logger.info(f'Converted A2UI part from A2A: {a2a_part.model_dump_json(exclude_none=True)} to GenAI: {genai_part.model_dump_json(exclude_none=True)}'[:200] + "...")    
+        genai_part = genai_types.Part(text=_get_a2ui_part_text(a2a_part))
+        payload_logger.debug("Converted A2UI part from A2A to GenAI: %s", Truncated(genai_part.text, max_length=200))
         return genai_part
         
     return part_converter.convert_a2a_part_to_genai_part(a2a_part)
 
+def _may_be_a2ui_part_text(text: Optional[str]) -> bool:
+    """Cheaply checks whether text could be an A2UI part serialized by convert_a2a_part_to_genai_part.
+
+    Ordinary chat text fails this check and skips the pydantic parse entirely.
+    """
+    return bool(text) and text.startswith(A2UI_PART_TEXT_PREFIX)
+
 def convert_genai_part_to_a2a_part(    
     part: genai_types.Part,
 ) -> Optional[a2a_types.Part]:
-    if part.text:
+    if _may_be_a2ui_part_text(part.text):
+        handle, _, a2a_part_json = part.text[len(A2UI_PART_TEXT_PREFIX):].partition(":")
+        if (a2a_part := _lookup_a2ui_part(handle)) is not None:
+            return a2a_part
+
+        # Parts from before a restart or from another replica are not registered
         try:
-            a2a_part = a2a_types.Part.model_validate_json(part.text)
+            a2a_part = a2a_types.Part.model_validate_json(a2a_part_json)
             if is_a2ui_part(a2a_part):           
-                logger.info(f'Converted A2UI part from GenAI: {part.model_dump_json(exclude_none=True)} to A2A: {a2a_part.model_dump_json(exclude_none=True)}'[:200] + "...")    
+                payload_logger.debug("Converted A2UI part from GenAI to A2A: %s", Truncated(a2a_part_json, max_length=200))
                 return a2a_part        
         except pydantic.ValidationError:
-            # Expected for normal text input
-            pass
+            logger.warning("Failed to parse A2UI part text: %s", Truncated(part.text, max_length=200))
         
-    return part_converter.convert_genai_part_to_a2a_part(part)
\ No newline at end of file
+    return part_converter.convert_genai_part_to_a2a_part(part)
+
+def summarize_a2ui_part(a2a_part: a2a_types.Part, subagent_name: Optional[str] = None) -> str:
+    """Returns a short, model-readable summary of an A2UI part, such as
+    "[A2UI surfaceUpdate surfaceId='sales' from rizzcharts, 3 components]".
+    """
+    for message_type, message in a2a_part.root.data.items():
+        if not isinstance(message, dict):
+            continue
+        details = [f"surfaceId={message.get('surfaceId')!r}"]
+        if subagent_name:
+            details.append(f"from {subagent_name}")
+        if message_type == "surfaceUpdate":
+            details.append(f"{len(message.get('components') or [])} components")
+        elif message_type == "dataModelUpdate":
+            details.append(f"{len(message.get('contents') or [])} data entries")
+        elif message_type == "userAction":
+            details.append(f"action={message.get('name')!r}")
+        return f"[A2UI {message_type} {', '.join(details)}]"
+    return "[A2UI message]"
+
+def compact_a2ui_part_text(text: str, get_subagent_name: Callable[[str], Optional[str]]) -> str:
+    """Replaces an A2UI part serialized in text with its summary.
+
+    The serialized part may follow a prefix, e.g. when ADK presents another
+    agent's output as "[agent] said: ...". Text without an A2UI part is
+    returned unchanged.
+
+    Args:
+        text: The text of a genai part.
+        get_subagent_name: Returns the subagent that created a surface, given its surfaceId.
+    """
+    if (index := text.find(A2UI_PART_TEXT_PREFIX)) == -1:
+        return text
+    a2a_part = convert_genai_part_to_a2a_part(genai_types.Part(text=text[index:]))
+    if not (a2a_part and is_a2ui_part(a2a_part)):
+        return text
+
+    surface_id = next(
+        (message.get("surfaceId") for message in a2a_part.root.data.values() if isinstance(message, dict)),
+        None,
+    )
+    return text[:index] + summarize_a2ui_part(a2a_part, get_subagent_name(surface_id) if surface_id else None)
@@ -0,0 +1,51 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextvars import ContextVar, Token
+import time
+from typing import Any, Mapping, Optional
+
+# Message metadata with the seconds left to answer a request, read from incoming
+# requests and sent on to subagents.
+REMAINING_DEADLINE_METADATA_KEY = "remainingDeadlineSeconds"
+
+# The wall clock time, in seconds, by which the request being handled must be answered.
+# It is kept per request instead of in session state, so that concurrent requests
+# on the same session each keep their own budget.
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def get_deadline(message_metadata: Optional[Mapping[str, Any]], default_budget_seconds: float) -> float:
+    """Returns the deadline of an incoming request, capped at the default budget."""
+    budget_seconds = default_budget_seconds
+    if message_metadata and isinstance(remaining := message_metadata.get(REMAINING_DEADLINE_METADATA_KEY), (int, float)):
+        budget_seconds = min(float(remaining), default_budget_seconds)
+    return time.time() + budget_seconds
+
+
+def set_deadline(deadline: float) -> Token:
+    """Sets the deadline of the request being handled by the current context."""
+    return _request_deadline.set(deadline)
+
+
+def reset_deadline(token: Token):
+    """Restores the deadline that was set before set_deadline returned the token."""
+    _request_deadline.reset(token)
+
+
+def get_remaining_seconds() -> Optional[float]:
+    """Returns the seconds left before the current request's deadline, if it has one."""
+    if (deadline := _request_deadline.get()) is None:
+        return None
+    return deadline - time.time()
@@ -0,0 +1,114 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from typing import Any
+import weakref
+
+from google.adk.agents.invocation_context import new_invocation_context_id
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.adk.sessions.base_session_service import BaseSessionService
+from google.adk.sessions.session import Session
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStateBatch:
+    """State writes staged for one session while handling one request."""
+
+    def __init__(self, session_service: BaseSessionService, session: Session):
+        self._session_service = session_service
+        self._session = session
+        self._state_delta: dict[str, Any] = {}
+
+    @property
+    def session_id(self) -> str:
+        return self._session.id
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Gets a state value, preferring staged values over the session state."""
+        if key in self._state_delta:
+            return self._state_delta[key]
+        return self._session.state.get(key, default)
+
+    def is_staged(self, key: str) -> bool:
+        """Checks whether a value for the key has been staged."""
+        return key in self._state_delta
+
+    def stage(self, state_delta: dict[str, Any]):
+        """Stages a state delta, with later writes to the same key winning."""
+        self._state_delta.update(state_delta)
+
+    async def write(self):
+        """Writes the staged state delta as a single system event."""
+        if not self._state_delta:
+            return
+
+        # Re-read the session since the one seen during the run is a snapshot
+        session = await self._session_service.get_session(
+            app_name=self._session.app_name,
+            user_id=self._session.user_id,
+            session_id=self._session.id,
+        )
+        if session is None:
+            logger.warning(f"Dropping staged state for missing session {self._session.id}")
+            return
+
+        await self._session_service.append_event(
+            session,
+            Event(
+                invocation_id=new_invocation_context_id(),
+                author="system",
+                actions=EventActions(state_delta=self._state_delta),
+            ),
+        )
+        logger.info(f"Wrote {len(self._state_delta)} staged state keys for session {session.id}")
+
+
+class SessionStateAccumulator:
+    """Batches session state writes made while handling one request.
+
+    Writes are staged in a SessionStateBatch per task and applied in the
+    order they were staged. The whole batch is written as a single awaited
+    system event when the task is flushed, instead of one session service
+    write per change. Flushes of the same session are serialized, while
+    flushes of different sessions run concurrently.
+    """
+
+    def __init__(self):
+        self._batches: dict[str, SessionStateBatch] = {}
+        # Locks are dropped once no flush of their session holds or awaits them
+        self._flush_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    def get_batch(
+        self,
+        task_id: str,
+        session_service: BaseSessionService,
+        session: Session,
+    ) -> SessionStateBatch:
+        """Gets the batch of state writes for the task, creating it if needed."""
+        if (batch := self._batches.get(task_id)) is None:
+            batch = self._batches[task_id] = SessionStateBatch(session_service, session)
+        return batch
+
+    async def flush(self, task_id: str):
+        """Writes everything staged by the task as a single session event."""
+        if batch := self._batches.pop(task_id, None):
+            # Keep batches for the same session in the order their tasks finished
+            if (flush_lock := self._flush_locks.get(batch.session_id)) is None:
+                flush_lock = self._flush_locks[batch.session_id] = asyncio.Lock()
+            async with flush_lock:
+                await batch.write()
@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import logging
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class SubagentCircuitBreaker:
+    """Stops sending requests to a subagent that keeps failing or is too slow.
+
+    The outcomes of the last `window_size` requests are kept. Once at least
+    `min_requests` are recorded and the share of failed requests or of requests
+    slower than `slow_request_seconds` reaches its threshold, the breaker opens
+    and requests are rejected for `open_seconds`. After that, one probe request
+    per `open_seconds` is let through until one succeeds and closes the breaker.
+    Outcomes of requests that were sent before the breaker opened are ignored,
+    so only the probe decides whether it closes.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_request_seconds: float = 30.0,
+        slow_request_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        min_requests: int = 5,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name: The subagent name, used in logs.
+            failure_rate_threshold: The share of failed requests that opens the breaker.
+            slow_request_seconds: The latency above which a request counts as slow.
+            slow_request_rate_threshold: The share of slow requests that opens the breaker.
+            window_size: How many recent requests to consider.
+            min_requests: The number of requests needed before the breaker can open.
+            open_seconds: How long to reject requests before probing the subagent again.
+            clock: Returns the current time in seconds.
+        """
+        self._name = name
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_request_seconds = slow_request_seconds
+        self._slow_request_rate_threshold = slow_request_rate_threshold
+        self._min_requests = min_requests
+        self._open_seconds = open_seconds
+        self._clock = clock
+        self._outcomes: collections.deque[tuple[bool, bool]] = collections.deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Checks whether a request may be sent to the subagent now."""
+        if self._state == self.CLOSED:
+            return True
+        if self._clock() - self._opened_at < self._open_seconds:
+            return False
+
+        # Let one probe through, and wait another period before the next one
+        self._state = self.HALF_OPEN
+        self._opened_at = self._clock()
+        logger.info(f"Circuit breaker for subagent '{self._name}' is probing")
+        return True
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        logger.warning(f"Circuit breaker for subagent '{self._name}' opened")
+
+    def record(self, success: bool, latency_seconds: float):
+        """Records the outcome of a request to the subagent."""
+        if self._state == self.OPEN:
+            return
+        if self._state == self.HALF_OPEN:
+            if success:
+                self._state = self.CLOSED
+                logger.info(f"Circuit breaker for subagent '{self._name}' closed")
+            else:
+                self._open()
+            return
+
+        self._outcomes.append((success, latency_seconds >= self._slow_request_seconds))
+        if len(self._outcomes) < self._min_requests:
+            return
+        failures = sum(1 for success, _ in self._outcomes if not success)
+        slow_requests = sum(1 for _, slow in self._outcomes if slow)
+        if (
+            failures >= self._failure_rate_threshold * len(self._outcomes)
+            or slow_requests >= self._slow_request_rate_threshold * len(self._outcomes)
+        ):
+            self._open()
@@ -0,0 +1,108 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from typing import AsyncGenerator, override
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events.event import Event
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types as genai_types
+
+logger = logging.getLogger(__name__)
+
+FAN_OUT_AGENT_NAME = "subagent_fan_out"
+FAN_OUT_TOOL_NAME = "fan_out_to_subagents"
+# Only needed by the fan-out agent of the same invocation, so it is not persisted with the session
+FAN_OUT_SUBAGENT_NAMES_STATE_KEY = "temp:fan_out_subagent_names"
+
+
+def fan_out_to_subagents(agent_names: list[str], tool_context: ToolContext) -> dict:
+    """Sends the user request to several subagents at once and streams all of their responses.
+
+    Use this instead of transfer_to_agent when the request has parts that need different subagents.
+
+    Args:
+        agent_names: The names of the subagents to send the request to.
+    """
+    tool_context.state[FAN_OUT_SUBAGENT_NAMES_STATE_KEY] = list(dict.fromkeys(agent_names))
+    tool_context.actions.transfer_to_agent = FAN_OUT_AGENT_NAME
+    return {"status": "ok"}
+
+
+class SubagentFanOutAgent(BaseAgent):
+    """Runs several sibling subagents concurrently and merges their events.
+
+    The subagents to run are read from temporary session state, where they are
+    written by the fan_out_to_subagents tool of the same invocation. A subagent
+    that fails is answered with a fallback text, so the user learns which part
+    of the request is missing. Each subagent runs on its own branch like
+    in ParallelAgent, but the subagents stay children of the orchestrator so
+    that userActions can still be routed to them directly. Events are yielded
+    as soon as any subagent produces them, so the total latency is that of the
+    slowest subagent rather than the sum of all of them.
+    """
+
+    @override
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        agent_names = ctx.session.state.get(FAN_OUT_SUBAGENT_NAMES_STATE_KEY) or []
+        subagents = []
+        for agent_name in agent_names:
+            if (subagent := self.parent_agent.find_sub_agent(agent_name)) and subagent is not self:
+                subagents.append(subagent)
+            else:
+                logger.warning(f"Skipping unknown subagent '{agent_name}' in fan-out")
+
+        logger.info(f"Fanning out request to subagents {[subagent.name for subagent in subagents]}")
+
+        queue: asyncio.Queue[Event | None] = asyncio.Queue()
+
+        async def run_subagent(subagent: BaseAgent):
+            branch_suffix = f"{self.name}.{subagent.name}"
+            branch_ctx = ctx.model_copy(
+                update={"branch": f"{ctx.branch}.{branch_suffix}" if ctx.branch else branch_suffix}
+            )
+            try:
+                async for event in subagent.run_async(branch_ctx):
+                    await queue.put(event)
+            except Exception as e:
+                logger.error(f"Subagent '{subagent.name}' failed during fan-out: {e}")
+                # Tell the user which part of the request is missing, like a subagent that fails fast
+                await queue.put(
+                    Event(
+                        invocation_id=ctx.invocation_id,
+                        author=subagent.name,
+                        branch=branch_ctx.branch,
+                        content=genai_types.Content(
+                            role="model",
+                            parts=[genai_types.Part(text=f"The {subagent.name} agent failed to respond. Please try again later.")],
+                        ),
+                    )
+                )
+            finally:
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(run_subagent(subagent)) for subagent in subagents]
+        try:
+            pending = len(tasks)
+            while pending:
+                if (event := await queue.get()) is None:
+                    pending -= 1
+                else:
+                    yield event
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,187 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import re
+from typing import Collection, Optional
+
+from a2a.types import AgentCard
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_CLAUSE_SEPARATOR_PATTERN = re.compile(r"[,;?.]|\b(?:and|also|plus|then)\b", re.IGNORECASE)
+
+_STOPWORDS = frozenset(
+    [
+        "a", "about", "all", "an", "and", "any", "are", "as", "at", "be", "by",
+        "can", "could", "did", "do", "does", "for", "from", "get", "give", "has",
+        "have", "how", "i", "in", "is", "it", "last", "me", "my", "of", "on",
+        "or", "our", "please", "show", "some", "tell", "that", "the", "their",
+        "there", "this", "to", "up", "us", "was", "were", "what", "whats",
+        "when", "where", "which", "who", "why", "with", "you", "your",
+    ]
+)
+
+# Relative importance of each part of an agent card when matching a query.
+_TAG_WEIGHT = 3.0
+_NAME_WEIGHT = 2.0
+_TEXT_WEIGHT = 1.0
+
+
+def _tokenize(text: Optional[str]) -> set[str]:
+    """Lowercases, splits and lightly stems text into a set of match terms."""
+    if not text:
+        return set()
+
+    terms = set()
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        # Fold simple plurals so "stores" matches the "store" tag.
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.add(token)
+    return terms
+
+
+class SubagentIntentRouter:
+    """Routes text queries to a subagent without an orchestrator LLM call.
+
+    Each subagent's agent card (name, description, and the name, description,
+    tags and examples of its skills) is flattened into a weighted term table
+    once, when the router is built. A query is scored by summing the weights
+    of its terms, scaled by how specific each term is across subagents. A
+    query is only routed when the best subagent clears `min_score` and beats
+    the runner-up by `min_margin`; everything else is left to the LLM.
+    """
+
+    def __init__(
+        self,
+        subagent_cards: dict[str, AgentCard],
+        min_score: float = 3.0,
+        min_margin: float = 2.0,
+    ):
+        """
+        Args:
+            subagent_cards: The agent card of each subagent keyed by the ADK agent name.
+            min_score: The minimum score the best subagent needs to be routed to.
+            min_margin: How many times higher the best score must be than the runner-up.
+        """
+        self._min_score = min_score
+        self._min_margin = min_margin
+        self._term_weights: dict[str, dict[str, float]] = {}
+        self._term_idf: dict[str, float] = {}
+        self.set_subagent_cards(subagent_cards)
+
+    def set_subagent_cards(self, subagent_cards: dict[str, AgentCard]):
+        """Rebuilds the term tables for the given subagents."""
+        term_weights = {
+            agent_name: self._build_term_weights(card)
+            for agent_name, card in subagent_cards.items()
+        }
+
+        document_frequency: dict[str, int] = {}
+        for weights in term_weights.values():
+            for term in weights:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        num_subagents = max(len(term_weights), 1)
+        self._term_idf = {
+            term: math.log(1 + num_subagents / count)
+            for term, count in document_frequency.items()
+        }
+        self._term_weights = term_weights
+
+    @classmethod
+    def _build_term_weights(cls, card: AgentCard) -> dict[str, float]:
+        weighted_texts = [(card.name, _NAME_WEIGHT), (card.description, _TEXT_WEIGHT)]
+        for skill in card.skills or []:
+            weighted_texts.append((skill.name, _NAME_WEIGHT))
+            weighted_texts.append((skill.description, _TEXT_WEIGHT))
+            weighted_texts.extend((tag, _TAG_WEIGHT) for tag in skill.tags or [])
+            weighted_texts.extend((example, _TEXT_WEIGHT) for example in skill.examples or [])
+
+        term_weights: dict[str, float] = {}
+        for text, weight in weighted_texts:
+            for term in _tokenize(text):
+                term_weights[term] = max(term_weights.get(term, 0.0), weight)
+        return term_weights
+
+    def score(self, query: str, excluded_agent_names: Collection[str] = ()) -> dict[str, float]:
+        """Scores the query against every subagent.
+
+        Args:
+            query: The user query.
+            excluded_agent_names: Subagents to leave out, e.g. because the client cannot render their UI.
+
+        Returns:
+            The score of each subagent keyed by agent name.
+        """
+        query_terms = _tokenize(query)
+        return {
+            agent_name: sum(
+                weights[term] * self._term_idf[term]
+                for term in query_terms
+                if term in weights
+            )
+            for agent_name, weights in self._term_weights.items()
+            if agent_name not in excluded_agent_names
+        }
+
+    def pick(self, scores: dict[str, float]) -> Optional[str]:
+        """Returns the subagent that confidently wins the given scores, if any."""
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if not ranked:
+            return None
+
+        best_agent, best_score = ranked[0]
+        runner_up_score = ranked[1][1] if len(ranked) > 1 else 0.0
+        if best_score < self._min_score or best_score < self._min_margin * runner_up_score:
+            return None
+        return best_agent
+
+    def is_topic_shift(self, scores: dict[str, float], current_agent: str) -> bool:
+        """Checks whether a follow-up query clearly belongs to a different subagent.
+
+        Follow-ups such as "were there any outlier stores" rarely name their
+        subagent, so a shift only fires when another subagent clears
+        `min_score` and outscores the current one.
+        """
+        current_score = scores.get(current_agent, 0.0)
+        return any(
+            score >= self._min_score and score > current_score
+            for agent_name, score in scores.items()
+            if agent_name != current_agent
+        )
+
+    def is_follow_up(self, scores: dict[str, float], current_agent: str) -> bool:
+        """Checks whether a query can stay with the subagent that served the previous turn.
+
+        The current subagent must clear `min_score` itself, so that small talk
+        such as "thanks" or "what else can you do?" is left to the LLM instead
+        of being pinned to it, and the query must not be a topic shift.
+        """
+        return scores.get(current_agent, 0.0) >= self._min_score and not self.is_topic_shift(scores, current_agent)
+
+    def route_clauses(self, query: str, excluded_agent_names: Collection[str] = ()) -> list[str]:
+        """Returns every subagent that confidently matches a clause of the query.
+
+        Dashboard-style requests such as "show me Q3 sales and who owns the
+        northeast region" are split on conjunctions and punctuation, and each
+        clause is routed on its own.
+        """
+        agent_names = []
+        for clause in _CLAUSE_SEPARATOR_PATTERN.split(query):
+            if (agent_name := self.pick(self.score(clause, excluded_agent_names))) and agent_name not in agent_names:
+                agent_names.append(agent_name)
+        return agent_names
@@ -0,0 +1,279 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import httpx
+from a2a.client import A2ACardResolver
+from a2a.types import AgentCard
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+from a2ui.a2ui_extension import get_agent_a2ui_extension_params, is_agent_compatible_with_client
+from subagent_circuit_breaker import SubagentCircuitBreaker
+from subagent_replica_transport import ReplicaBalancingTransport
+
+logger = logging.getLogger(__name__)
+
+
+def get_agent_name(card_name: str) -> str:
+    """Gets the ADK agent name, a valid identifier, for a subagent's agent card name."""
+    agent_name = re.sub(r'[^0-9a-zA-Z_]+', '_', card_name)
+    if agent_name == "":
+        agent_name = "_"
+    if agent_name[0].isdigit():
+        agent_name = f"_{agent_name}"
+    return agent_name
+
+
+class _ReplicaEntry:
+    """The latest known state of the subagent replica served at one URL."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.card: Optional[AgentCard] = None
+        self.consecutive_failures = 0
+        self.available = False
+
+
+class _Subagent:
+    """A logical subagent, served by every replica whose agent card has its name."""
+
+    def __init__(self, card: AgentCard, card_key: str, agent: RemoteA2aAgent, transport: ReplicaBalancingTransport):
+        self.card = card
+        self.card_key = card_key
+        self.agent = agent
+        self.transport = transport
+        self.available = True
+        # Precomputed so routing only intersects catalog ids
+        self.a2ui_extension_params = get_agent_a2ui_extension_params(card)
+        try:
+            self.metadata: Optional[dict[str, Any]] = json.loads(agent.description)
+        except Exception:
+            logger.warning(f"Failed to parse agent description for {agent.name}")
+            self.metadata = None
+
+
+class SubagentRegistry:
+    """Keeps the set of remote subagents up to date while the orchestrator runs.
+
+    Every poll fetches the agent card of each subagent URL, and optionally a
+    health endpoint. A URL is marked unavailable after `unhealthy_threshold`
+    consecutive failed polls, and available again on the next successful one.
+    If `subagent_urls_file` is set, it is re-read on every poll, so subagents
+    can be added or removed without a restart.
+
+    URLs whose agent cards have the same name are replicas of one logical
+    subagent with a single RemoteA2aAgent, whose requests are balanced across
+    the available replicas by a ReplicaBalancingTransport. A changed agent
+    card replaces the RemoteA2aAgent. Subagents are keyed by ADK agent name; if
+    the names of two agent cards map to the same agent name, the subagent
+    already registered under it is kept and the other one is ignored.
+
+    Listeners are called whenever the set of available subagents changes.
+    Replaced or removed RemoteA2aAgents are only dropped from the registry, so
+    requests already running on them are not interrupted.
+    """
+
+    def __init__(
+        self,
+        subagent_urls: list[str],
+        create_remote_agent: Callable[[AgentCard, httpx.AsyncBaseTransport, SubagentCircuitBreaker], RemoteA2aAgent],
+        subagent_urls_file: Optional[str] = None,
+        health_path: Optional[str] = None,
+        poll_interval_seconds: float = 30.0,
+        unhealthy_threshold: int = 2,
+        request_timeout_seconds: float = 5.0,
+        httpx_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            subagent_urls: The base URLs of subagents that are always registered.
+            create_remote_agent: Creates the RemoteA2aAgent for a subagent's agent
+                card, sending its requests through the given httpx transport and
+                failing fast while the given circuit breaker is open.
+            subagent_urls_file: A file with one additional subagent base URL per line.
+            health_path: A path on each subagent, e.g. "/healthz", that must return a
+                2xx response for the subagent to be healthy.
+            poll_interval_seconds: How often to poll the subagents.
+            unhealthy_threshold: The consecutive failed polls before a subagent is unavailable.
+            request_timeout_seconds: The timeout of each card and health request.
+            httpx_transport: If set, sends the card and health requests of each poll.
+        """
+        self._static_urls = list(subagent_urls)
+        self._create_remote_agent = create_remote_agent
+        self._subagent_urls_file = subagent_urls_file
+        self._health_path = health_path
+        self._poll_interval_seconds = poll_interval_seconds
+        self._unhealthy_threshold = unhealthy_threshold
+        self._request_timeout_seconds = request_timeout_seconds
+        self._httpx_transport = httpx_transport
+        self._replicas: dict[str, _ReplicaEntry] = {}
+        # Keyed by ADK agent name, for lookups on every event
+        self._subagents: dict[str, _Subagent] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._poll_task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: Callable[[], None]):
+        """Adds a callback that is called when the available subagents change."""
+        self._listeners.append(listener)
+
+    @property
+    def available_agents(self) -> list[RemoteA2aAgent]:
+        """The RemoteA2aAgents of all available subagents."""
+        return [subagent.agent for subagent in self._subagents.values() if subagent.available]
+
+    @property
+    def available_cards(self) -> dict[str, AgentCard]:
+        """The agent cards of all available subagents keyed by agent name."""
+        return {subagent.agent.name: subagent.card for subagent in self._subagents.values() if subagent.available}
+
+    def is_available(self, agent_name: str) -> bool:
+        """Checks whether a subagent can currently be routed to."""
+        return (subagent := self._subagents.get(agent_name)) is not None and subagent.available
+
+    def get_incompatible_agent_names(self, client_capabilities: Optional[dict[str, Any]]) -> set[str]:
+        """Gets the available subagents whose A2UI components the client cannot render."""
+        return {
+            subagent.agent.name
+            for subagent in self._subagents.values()
+            if subagent.available
+            and not is_agent_compatible_with_client(subagent.a2ui_extension_params, client_capabilities)
+        }
+
+    def get_subagent_metadata(self, agent_name: str) -> Optional[dict[str, Any]]:
+        """Gets the parsed agent card metadata of a known subagent, available or not."""
+        if (subagent := self._subagents.get(agent_name)) is None:
+            return None
+        return subagent.metadata
+
+    def _read_subagent_urls(self) -> list[str]:
+        urls = list(self._static_urls)
+        if self._subagent_urls_file:
+            try:
+                urls.extend(
+                    line.strip()
+                    for line in Path(self._subagent_urls_file).read_text().splitlines()
+                    if line.strip() and not line.strip().startswith("#")
+                )
+            except OSError as e:
+                logger.warning(f"Failed to read subagent urls file {self._subagent_urls_file}: {e}")
+        return list(dict.fromkeys(urls))
+
+    async def _poll(self, httpx_client: httpx.AsyncClient, replica: _ReplicaEntry):
+        try:
+            card = await A2ACardResolver(httpx_client=httpx_client, base_url=replica.url).get_agent_card()
+            if self._health_path:
+                response = await httpx_client.get(replica.url.rstrip("/") + self._health_path)
+                response.raise_for_status()
+        except Exception as e:
+            replica.consecutive_failures += 1
+            logger.warning(f"Failed to poll subagent at {replica.url} ({replica.consecutive_failures} in a row): {e}")
+            if replica.available and replica.consecutive_failures >= self._unhealthy_threshold:
+                replica.available = False
+                logger.warning(f"Marked subagent at {replica.url} unavailable")
+            return
+
+        replica.card = card
+        replica.consecutive_failures = 0
+        replica.available = True
+
+    def _update_subagents(self) -> bool:
+        """Groups the available replicas into subagents.
+
+        Returns:
+            True if the available subagents or any of their agent cards changed.
+        """
+        replicas_by_card_name: dict[str, list[_ReplicaEntry]] = {}
+        for replica in self._replicas.values():
+            if replica.available:
+                replicas_by_card_name.setdefault(replica.card.name, []).append(replica)
+
+        # Card names that are already registered keep their agent name
+        registered_card_names = {subagent.card.name for subagent in self._subagents.values() if subagent.available}
+        replicas_by_agent_name: dict[str, list[_ReplicaEntry]] = {}
+        for card_name in sorted(replicas_by_card_name, key=lambda name: (name not in registered_card_names, name)):
+            agent_name = get_agent_name(card_name)
+            if (claimed := replicas_by_agent_name.get(agent_name)) is not None:
+                logger.error(
+                    f"Ignoring subagent '{card_name}', its agent name '{agent_name}' is taken by '{claimed[0].card.name}'"
+                )
+                continue
+            replicas_by_agent_name[agent_name] = replicas_by_card_name[card_name]
+
+        changed = False
+        for agent_name, replicas in replicas_by_agent_name.items():
+            # Replicas differ only in their URL
+            card = replicas[0].card
+            card_key = card.model_dump_json(exclude={"url"}, exclude_none=True)
+            subagent = self._subagents.get(agent_name)
+            if subagent is None or subagent.card_key != card_key:
+                circuit_breaker = SubagentCircuitBreaker(agent_name)
+                transport = ReplicaBalancingTransport(card.url, circuit_breaker=circuit_breaker)
+                subagent = self._subagents[agent_name] = _Subagent(
+                    card, card_key, self._create_remote_agent(card, transport, circuit_breaker), transport
+                )
+                logger.info(f"Registered subagent '{agent_name}'")
+                changed = True
+            elif not subagent.available:
+                subagent.available = changed = True
+            subagent.transport.set_replicas([replica.card.url for replica in replicas])
+
+        for agent_name, subagent in self._subagents.items():
+            if subagent.available and agent_name not in replicas_by_agent_name:
+                subagent.available = False
+                changed = True
+
+        return changed
+
+    async def refresh(self):
+        """Polls every subagent once and notifies listeners of any changes."""
+        urls = self._read_subagent_urls()
+        for url in [url for url in self._replicas if url not in urls]:
+            logger.info(f"Removed subagent at {url}")
+            del self._replicas[url]
+        for url in urls:
+            self._replicas.setdefault(url, _ReplicaEntry(url))
+
+        async with httpx.AsyncClient(
+            timeout=self._request_timeout_seconds, transport=self._httpx_transport
+        ) as httpx_client:
+            await asyncio.gather(*(self._poll(httpx_client, replica) for replica in self._replicas.values()))
+
+        if self._update_subagents():
+            logger.info(f"Available subagents changed to {list(self.available_cards)}")
+            for listener in self._listeners:
+                listener()
+
+    async def _poll_forever(self):
+        while True:
+            await asyncio.sleep(self._poll_interval_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh subagents: {e}")
+
+    async def start(self):
+        """Starts polling the subagents in the background on the running event loop."""
+        if self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._poll_forever())
+
+    async def stop(self):
+        """Stops polling the subagents."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
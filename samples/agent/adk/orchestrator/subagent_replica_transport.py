@@ -0,0 +1,149 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import itertools
+import json
+import logging
+import time
+from typing import Any, Optional
+
+import httpx
+from subagent_circuit_breaker import SubagentCircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaBalancingTransport(httpx.AsyncBaseTransport):
+    """Spreads the requests of one logical subagent across its replicas.
+
+    Requests are sent to the replica with the fewest outstanding requests.
+    Requests for an A2A contextId that a replica has already served go back to
+    that replica, since the subagent keeps the session, and so the surfaces,
+    of the context.
+
+    Pinning the contextId is equivalent to pinning the subagent's surfaces:
+    a surface is created in the context of the turn that rendered it, and the
+    RemoteA2aAgent sends every later turn of the orchestrator session, including
+    userActions routed by the surface route table, with that same contextId.
+    The transport only sees the A2A request, so the contextId is also the one
+    key it can read without parsing the A2UI parts of the message.
+
+    The outcome and latency of every request are recorded in the subagent's
+    circuit breaker, if any.
+    """
+
+    MAX_CONTEXT_AFFINITIES = 1024
+
+    def __init__(
+        self,
+        base_url: str,
+        circuit_breaker: Optional[SubagentCircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            base_url: The URL in the agent card the RemoteA2aAgent sends requests to.
+            circuit_breaker: If set, records the outcome of every request sent to a replica.
+            transport: The transport that sends the requests, by default a new httpx transport.
+        """
+        self._base_url = base_url.rstrip("/")
+        self._circuit_breaker = circuit_breaker
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._replica_urls: list[str] = [self._base_url]
+        self._outstanding: dict[str, int] = {}
+        self._round_robin = itertools.count()
+        self._context_affinities: collections.OrderedDict[str, str] = collections.OrderedDict()
+
+    def set_replicas(self, replica_urls: list[str]):
+        """Sets the URLs of the available replicas."""
+        if replica_urls:
+            self._replica_urls = [url.rstrip("/") for url in replica_urls]
+
+    def _pick_replica(self, context_id: Optional[str]) -> str:
+        candidates = self._replica_urls
+        if context_id and (replica_url := self._context_affinities.get(context_id)) in candidates:
+            self._context_affinities.move_to_end(context_id)
+            return replica_url
+
+        # Rotate the start so ties are spread evenly
+        offset = next(self._round_robin) % len(candidates)
+        rotated = candidates[offset:] + candidates[:offset]
+        return min(rotated, key=lambda url: self._outstanding.get(url, 0))
+
+    def _remember_context(self, context_id: Optional[str], replica_url: str):
+        if not context_id:
+            return
+        self._context_affinities[context_id] = replica_url
+        self._context_affinities.move_to_end(context_id)
+        if len(self._context_affinities) > self.MAX_CONTEXT_AFFINITIES:
+            self._context_affinities.popitem(last=False)
+
+    @classmethod
+    def _parse_json_object(cls, body: bytes) -> dict[str, Any]:
+        try:
+            value = json.loads(body)
+        except Exception:
+            return {}
+        return value if isinstance(value, dict) else {}
+
+    @classmethod
+    def _get_context_id(cls, payload: dict[str, Any], container_key: str) -> Optional[str]:
+        container = payload.get(container_key)
+        if isinstance(container, dict) and isinstance(context_id := container.get("contextId"), str):
+            return context_id
+        return None
+
+    async def _send(self, request: httpx.Request, replica_url: str) -> httpx.Response:
+        url = str(request.url)
+        if url.startswith(self._base_url):
+            url = replica_url + url[len(self._base_url):]
+        replica_request = httpx.Request(
+            request.method,
+            url,
+            headers=request.headers,
+            content=request.content,
+            extensions=request.extensions,
+        )
+
+        self._outstanding[replica_url] = self._outstanding.get(replica_url, 0) + 1
+        start = time.monotonic()
+        try:
+            response = await self._transport.handle_async_request(replica_request)
+            await response.aread()
+        except Exception:
+            if self._circuit_breaker:
+                self._circuit_breaker.record(False, time.monotonic() - start)
+            raise
+        finally:
+            self._outstanding[replica_url] -= 1
+
+        latency = time.monotonic() - start
+        # JSON-RPC errors are returned with a 2xx status
+        payload = self._parse_json_object(response.content)
+        success = response.is_success and "error" not in payload
+        if self._circuit_breaker:
+            self._circuit_breaker.record(success, latency)
+        if success:
+            self._remember_context(self._get_context_id(payload, "result"), replica_url)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        payload = self._parse_json_object(request.content)
+        context_id = self._get_context_id(payload.get("params") or {}, "message")
+        return await self._send(request, self._pick_replica(context_id))
+
+    async def aclose(self):
+        await self._transport.aclose()
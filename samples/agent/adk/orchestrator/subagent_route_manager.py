@@ -13,52 +13,118 @@
 # limitations under the License.
 
 import logging
-from typing import Optional
-from google.adk.agents.invocation_context import new_invocation_context_id
-from google.adk.events.event import Event
-from google.adk.events.event_actions import EventActions
-from google.adk.sessions.base_session_service import BaseSessionService
-from google.adk.sessions.session import Session
+from typing import Any, Mapping, Optional
 from google.adk.sessions.state import State
+from session_state_accumulator import SessionStateBatch
+
+logger = logging.getLogger(__name__)
 
 
 class SubagentRouteManager:
   """Manages routing of tasks to sub-agents."""
 
-  ROUTING_KEY_PREFIX = "route_to_subagent_name_for_surface_id_"
+  # Surface routes are kept in a single state key holding a dict of surface_id
+  # to subagent_name in least to most recently used order.
+  SURFACE_ROUTES_KEY = "surface_routes"
+  MAX_SURFACE_ROUTES = 256
+  LAST_SUBAGENT_NAME_KEY = "last_subagent_name"
+  # Prefix of the state keys that held one route per surface before the route table
+  LEGACY_ROUTING_KEY_PREFIX = "route_to_subagent_name_for_surface_id_"
 
   @classmethod
-  def _get_routing_key(cls, surface_id: str) -> str:
-    return cls.ROUTING_KEY_PREFIX + surface_id
+  def _get_surface_routes_for_update(cls, state_batch: SessionStateBatch) -> dict[str, str]:
+    """Gets a surface route table that can be updated in place for this batch."""
+    if not state_batch.is_staged(cls.SURFACE_ROUTES_KEY):
+      # Copy on first write so the session state is only changed through the batch
+      state_batch.stage({cls.SURFACE_ROUTES_KEY: dict(state_batch.get(cls.SURFACE_ROUTES_KEY) or {})})
+    return state_batch.get(cls.SURFACE_ROUTES_KEY)
 
   @classmethod
   async def get_route_to_subagent_name(
       cls, surface_id: str, state: State
   ) -> Optional[str]:
-    """Gets the subagent route for the given tool call id."""
-    subagent_name = state.get(cls._get_routing_key(surface_id), None)
-    logging.info("Got subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)    
+    """Gets the subagent route for the given surface id.
+
+    The lookup cannot write state, so the executor marks the route of a surface
+    the user interacts with as used through mark_route_used.
+    """
+    surface_routes = state.get(cls.SURFACE_ROUTES_KEY) or {}
+    subagent_name = surface_routes.get(surface_id)
+    logger.info("Got subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)
     return subagent_name
 
   @classmethod
-  async def set_route_to_subagent_name(
+  def set_route_to_subagent_name(
       cls,
       surface_id: str,
       subagent_name: str,
-      session_service: BaseSessionService,
-      session: Session,
+      state_batch: SessionStateBatch,
   ):
-    """Sets the subagent route for the given tool call id."""
-    key = cls._get_routing_key(surface_id)    
-
-    if session.state.get(key) != subagent_name:
-      await session_service.append_event(
-          session,
-          Event(
-              invocation_id=new_invocation_context_id(),
-              author="system",
-              actions=EventActions(state_delta={key: subagent_name}),
-          ),
-      )
-
-      logging.info("Set subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)
\ No newline at end of file
+    """Sets the subagent route for the given surface id and marks it as most recently used."""
+    surface_routes = state_batch.get(cls.SURFACE_ROUTES_KEY) or {}
+    if (
+        surface_routes.get(surface_id) == subagent_name
+        and next(reversed(surface_routes)) == surface_id
+    ):
+      return
+
+    surface_routes = cls._get_surface_routes_for_update(state_batch)
+    surface_routes.pop(surface_id, None)
+    surface_routes[surface_id] = subagent_name
+    while len(surface_routes) > cls.MAX_SURFACE_ROUTES:
+      evicted_surface_id = next(iter(surface_routes))
+      del surface_routes[evicted_surface_id]
+      logger.info("Evicted least recently used subagent route for surface_id %s", evicted_surface_id)
+
+    logger.info("Set subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)
+
+  @classmethod
+  def mark_route_used(cls, surface_id: str, state_batch: SessionStateBatch):
+    """Marks the route of a surface as most recently used, if it has one."""
+    if subagent_name := (state_batch.get(cls.SURFACE_ROUTES_KEY) or {}).get(surface_id):
+      cls.set_route_to_subagent_name(surface_id, subagent_name, state_batch)
+
+  @classmethod
+  def migrate_legacy_routes(cls, state: Mapping[str, Any], state_batch: SessionStateBatch):
+    """Moves routes stored one key per surface into the route table.
+
+    The migrated routes are the least recently used ones in the table. ADK
+    state keys cannot be deleted, so the old keys are set to None.
+    """
+    legacy_routes = {
+        key[len(cls.LEGACY_ROUTING_KEY_PREFIX):]: subagent_name
+        for key, subagent_name in state.items()
+        if key.startswith(cls.LEGACY_ROUTING_KEY_PREFIX) and subagent_name is not None
+    }
+    if not legacy_routes:
+      return
+
+    surface_routes = cls._get_surface_routes_for_update(state_batch)
+    migrated_routes = {**legacy_routes, **surface_routes}
+    surface_routes.clear()
+    surface_routes.update(list(migrated_routes.items())[-cls.MAX_SURFACE_ROUTES:])
+    state_batch.stage({cls.LEGACY_ROUTING_KEY_PREFIX + surface_id: None for surface_id in legacy_routes})
+    logger.info("Migrated %d subagent routes into the surface route table", len(legacy_routes))
+
+  @classmethod
+  def delete_route(cls, surface_id: str, state_batch: SessionStateBatch):
+    """Deletes the subagent route for a surface that was deleted."""
+    if surface_id in (state_batch.get(cls.SURFACE_ROUTES_KEY) or {}):
+      del cls._get_surface_routes_for_update(state_batch)[surface_id]
+      logger.info("Deleted subagent route for surface_id %s", surface_id)
+
+  @classmethod
+  def get_last_subagent_name(cls, state: State) -> Optional[str]:
+    """Gets the subagent that served the previous turn, used for sticky routing of follow-ups.
+
+    The surfaces of that subagent are not stored again next to it: they are the
+    surfaces that map to it in the surface route table.
+    """
+    return state.get(cls.LAST_SUBAGENT_NAME_KEY, None)
+
+  @classmethod
+  def set_last_subagent(cls, subagent_name: str, state_batch: SessionStateBatch):
+    """Sets the subagent that served the current turn."""
+    if state_batch.get(cls.LAST_SUBAGENT_NAME_KEY) != subagent_name:
+      state_batch.stage({cls.LAST_SUBAGENT_NAME_KEY: subagent_name})
+      logger.info("Set last subagent to %s", subagent_name)
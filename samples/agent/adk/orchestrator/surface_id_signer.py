@@ -0,0 +1,120 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import hashlib
+import hmac
+import logging
+from typing import Optional
+
+from a2a import types as a2a_types
+from google.adk.a2a.converters import part_converter
+from google.genai import types as genai_types
+from a2ui.a2ui_extension import is_a2ui_part
+
+logger = logging.getLogger(__name__)
+
+# A2UI server to client messages that carry a surfaceId
+SURFACE_MESSAGE_TYPES = ("beginRendering", "surfaceUpdate", "dataModelUpdate", "deleteSurface")
+
+
+class SurfaceIdSigner:
+    """Embeds a signed subagent tag in the surfaceIds sent to the client.
+
+    A signed surfaceId has the form `<subagent_name>.<signature>.<surface_id>`,
+    where the signature is a truncated HMAC-SHA256 of the subagent name and the
+    original surface_id. Subagent names only contain `[0-9a-zA-Z_]` and the
+    signature is unpadded base64url, so neither contains a `.`. Every
+    orchestrator replica configured with the same key can route a userAction
+    by verifying its surfaceId, without looking up session state.
+    """
+
+    SEPARATOR = "."
+    SIGNATURE_BYTES = 9
+
+    def __init__(self, key: str):
+        self._key = key.encode("utf-8")
+
+    def _signature(self, subagent_name: str, surface_id: str) -> str:
+        digest = hmac.new(
+            self._key,
+            f"{subagent_name}{self.SEPARATOR}{surface_id}".encode("utf-8"),
+            hashlib.sha256,
+        ).digest()[: self.SIGNATURE_BYTES]
+        return base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+    def sign(self, surface_id: str, subagent_name: str) -> str:
+        """Returns the surface_id prefixed with a signed tag for the subagent."""
+        return self.SEPARATOR.join([subagent_name, self._signature(subagent_name, surface_id), surface_id])
+
+    def verify(self, signed_surface_id: str) -> Optional[tuple[str, str]]:
+        """Verifies a signed surfaceId.
+
+        Returns:
+            A tuple of the subagent name and the original surface_id, or None if
+            the surfaceId is not signed or the signature does not match.
+        """
+        parts = signed_surface_id.split(self.SEPARATOR, 2)
+        if len(parts) != 3:
+            return None
+
+        subagent_name, signature, surface_id = parts
+        if not hmac.compare_digest(signature, self._signature(subagent_name, surface_id)):
+            logger.warning(f"Invalid signature for surfaceId {signed_surface_id}")
+            return None
+        return subagent_name, surface_id
+
+    def sign_a2ui_part(self, a2a_part: a2a_types.Part, subagent_name: str) -> a2a_types.Part:
+        """Returns a copy of a server to client A2UI part with its surfaceId signed."""
+        a2ui_message = a2a_part.root.data
+        for message_type in SURFACE_MESSAGE_TYPES:
+            if (message := a2ui_message.get(message_type)) and (surface_id := message.get("surfaceId")):
+                return a2a_types.Part(
+                    root=a2a_part.root.model_copy(
+                        update={
+                            "data": {
+                                **a2ui_message,
+                                message_type: {**message, "surfaceId": self.sign(surface_id, subagent_name)},
+                            }
+                        }
+                    )
+                )
+        return a2a_part
+
+    def unsign_user_action_part(self, a2a_part: a2a_types.Part) -> a2a_types.Part:
+        """Returns a copy of a client to server A2UI part with the original userAction surfaceId."""
+        if (
+            (user_action := a2a_part.root.data.get("userAction"))
+            and (surface_id := user_action.get("surfaceId"))
+            and (verified := self.verify(surface_id))
+        ):
+            return a2a_types.Part(
+                root=a2a_part.root.model_copy(
+                    update={"data": {**a2a_part.root.data, "userAction": {**user_action, "surfaceId": verified[1]}}}
+                )
+            )
+        return a2a_part
+
+    def wrap_genai_part_converter(
+        self, converter: part_converter.GenAIPartToA2APartConverter
+    ) -> part_converter.GenAIPartToA2APartConverter:
+        """Wraps a part converter for messages to subagents so they see their own surfaceIds."""
+
+        def convert_genai_part_to_a2a_part(part: genai_types.Part) -> Optional[a2a_types.Part]:
+            a2a_part = converter(part)
+            if a2a_part and is_a2ui_part(a2a_part):
+                return self.unsign_user_action_part(a2a_part)
+            return a2a_part
+
+        return convert_genai_part_to_a2a_part
@@ -0,0 +1,108 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.tools.transfer_to_agent_tool import TransferToAgentTool
+
+from agent import OrchestratorAgent
+from subagent_fan_out import FAN_OUT_TOOL_NAME
+
+
+class FakeRegistry:
+    def get_incompatible_agent_names(self, client_capabilities):
+        return {"maps"}
+
+
+def make_context(use_ui=True):
+    return SimpleNamespace(state={"use_ui": use_ui, "client_capabilities": {}})
+
+
+def make_tool(name):
+    return SimpleNamespace(name=name)
+
+
+def get_agent_name_enums(llm_request):
+    declaration = llm_request.config.tools[0].function_declarations[0]
+    enums = []
+    if declaration.parameters:
+        enums.append(declaration.parameters.properties["agent_name"].enum)
+    if declaration.parameters_json_schema:
+        enums.append(declaration.parameters_json_schema["properties"]["agent_name"]["enum"])
+    return enums
+
+
+def test_incompatible_subagents_are_removed_from_transfer_choices():
+    llm_request = LlmRequest()
+    llm_request.append_tools([TransferToAgentTool(["sales", "maps"])])
+
+    asyncio.run(OrchestratorAgent.exclude_incompatible_subagents_from_model(FakeRegistry(), make_context(), llm_request))
+
+    assert get_agent_name_enums(llm_request) == [["sales"]]
+
+
+def test_transfer_choices_are_kept_without_ui():
+    llm_request = LlmRequest()
+    llm_request.append_tools([TransferToAgentTool(["sales", "maps"])])
+
+    asyncio.run(
+        OrchestratorAgent.exclude_incompatible_subagents_from_model(FakeRegistry(), make_context(use_ui=False), llm_request)
+    )
+
+    assert get_agent_name_enums(llm_request) == [["sales", "maps"]]
+
+
+def test_transfer_to_incompatible_subagent_is_rejected():
+    response = asyncio.run(
+        OrchestratorAgent.reject_transfers_to_incompatible_subagents(
+            FakeRegistry(), make_tool("transfer_to_agent"), {"agent_name": "maps"}, make_context()
+        )
+    )
+
+    assert "error" in response
+
+
+def test_transfer_to_compatible_subagent_is_allowed():
+    response = asyncio.run(
+        OrchestratorAgent.reject_transfers_to_incompatible_subagents(
+            FakeRegistry(), make_tool("transfer_to_agent"), {"agent_name": "sales"}, make_context()
+        )
+    )
+
+    assert response is None
+
+
+def test_incompatible_subagents_are_dropped_from_fan_out():
+    args = {"agent_names": ["sales", "maps"]}
+
+    response = asyncio.run(
+        OrchestratorAgent.reject_transfers_to_incompatible_subagents(
+            FakeRegistry(), make_tool(FAN_OUT_TOOL_NAME), args, make_context()
+        )
+    )
+
+    assert response is None
+    assert args["agent_names"] == ["sales"]
+
+
+def test_fan_out_to_only_incompatible_subagents_is_rejected():
+    response = asyncio.run(
+        OrchestratorAgent.reject_transfers_to_incompatible_subagents(
+            FakeRegistry(), make_tool(FAN_OUT_TOOL_NAME), {"agent_names": ["maps"]}, make_context()
+        )
+    )
+
+    assert "error" in response
@@ -0,0 +1,123 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.genai import types as genai_types
+from a2ui.a2ui_extension import create_a2ui_part
+
+import part_converters
+
+
+def make_a2ui_part():
+    return create_a2ui_part({"dataModelUpdate": {"surfaceId": "sales", "contents": [{"key": "title", "valueString": "Q3"}]}})
+
+
+def test_a2ui_part_round_trips_through_the_registry():
+    a2a_part = make_a2ui_part()
+
+    genai_part = part_converters.convert_a2a_part_to_genai_part(a2a_part)
+    converted_part = part_converters.convert_genai_part_to_a2a_part(genai_part)
+
+    assert genai_part.text.startswith(part_converters.A2UI_PART_TEXT_PREFIX)
+    assert converted_part == a2a_part
+    assert converted_part is not a2a_part
+
+
+def test_converting_the_same_part_again_reuses_its_text():
+    a2a_part = make_a2ui_part()
+
+    assert (
+        part_converters.convert_a2a_part_to_genai_part(a2a_part).text
+        == part_converters.convert_a2a_part_to_genai_part(a2a_part).text
+    )
+    assert (
+        part_converters.convert_a2a_part_to_genai_part(make_a2ui_part()).text
+        != part_converters.convert_a2a_part_to_genai_part(a2a_part).text
+    )
+
+
+def test_looked_up_parts_are_independent_copies():
+    a2a_part = make_a2ui_part()
+    genai_part = part_converters.convert_a2a_part_to_genai_part(a2a_part)
+
+    first = part_converters.convert_genai_part_to_a2a_part(genai_part)
+    first.root.data["dataModelUpdate"]["contents"][0]["valueString"] = "changed"
+    a2a_part.root.data["dataModelUpdate"]["surfaceId"] = "changed"
+    second = part_converters.convert_genai_part_to_a2a_part(genai_part)
+
+    assert second.root.data == {
+        "dataModelUpdate": {"surfaceId": "sales", "contents": [{"key": "title", "valueString": "Q3"}]}
+    }
+
+
+def test_unregistered_handles_fall_back_to_the_json():
+    a2a_part = make_a2ui_part()
+    text = f"{part_converters.A2UI_PART_TEXT_PREFIX}unknown:{a2a_part.model_dump_json()}"
+
+    assert part_converters.convert_genai_part_to_a2a_part(genai_types.Part(text=text)) == a2a_part
+
+
+def test_plain_text_is_not_an_a2ui_part():
+    a2a_part = part_converters.convert_genai_part_to_a2a_part(genai_types.Part(text="Show me Q3 sales"))
+
+    assert a2a_part.root.text == "Show me Q3 sales"
+
+
+def get_handle(genai_part):
+    return genai_part.text[len(part_converters.A2UI_PART_TEXT_PREFIX):].partition(":")[0]
+
+
+def test_handles_only_resolve_in_the_session_that_registered_them():
+    token = part_converters.set_registry_session("session-a")
+    try:
+        handle = get_handle(part_converters.convert_a2a_part_to_genai_part(make_a2ui_part()))
+        assert part_converters._lookup_a2ui_part(handle) is not None
+    finally:
+        part_converters.reset_registry_session(token)
+
+    token = part_converters.set_registry_session("session-b")
+    try:
+        assert part_converters._lookup_a2ui_part(handle) is None
+    finally:
+        part_converters.reset_registry_session(token)
+
+
+def test_a_busy_session_does_not_evict_parts_of_another_session(monkeypatch):
+    monkeypatch.setattr(part_converters, "_A2UI_PART_REGISTRY_MAX_SIZE", 2)
+    token = part_converters.set_registry_session("quiet")
+    try:
+        quiet_handle = get_handle(part_converters.convert_a2a_part_to_genai_part(make_a2ui_part()))
+    finally:
+        part_converters.reset_registry_session(token)
+
+    token = part_converters.set_registry_session("busy")
+    try:
+        busy_handles = [get_handle(part_converters.convert_a2a_part_to_genai_part(make_a2ui_part())) for _ in range(3)]
+        assert part_converters._lookup_a2ui_part(busy_handles[0]) is None
+        assert part_converters._lookup_a2ui_part(busy_handles[-1]) is not None
+    finally:
+        part_converters.reset_registry_session(token)
+
+    token = part_converters.set_registry_session("quiet")
+    try:
+        assert part_converters._lookup_a2ui_part(quiet_handle) is not None
+    finally:
+        part_converters.reset_registry_session(token)
+
+
+def test_compacted_part_names_its_subagent():
+    genai_part = part_converters.convert_a2a_part_to_genai_part(make_a2ui_part())
+
+    compacted = part_converters.compact_a2ui_part_text(f"[rizzcharts] said: {genai_part.text}", {"sales": "rizzcharts"}.get)
+
+    assert compacted == "[rizzcharts] said: [A2UI dataModelUpdate surfaceId='sales', from rizzcharts, 1 data entries]"
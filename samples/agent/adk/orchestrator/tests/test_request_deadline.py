@@ -0,0 +1,55 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+import request_deadline
+
+
+def test_get_deadline_uses_the_remaining_budget_from_metadata():
+    deadline = request_deadline.get_deadline({request_deadline.REMAINING_DEADLINE_METADATA_KEY: 5}, 30)
+    assert 4 < deadline - time.time() <= 5
+
+
+def test_get_deadline_falls_back_to_the_default_budget():
+    deadline = request_deadline.get_deadline(None, 30)
+    assert 29 < deadline - time.time() <= 30
+
+
+def test_no_remaining_seconds_without_a_deadline():
+    assert request_deadline.get_remaining_seconds() is None
+
+
+def test_reset_restores_the_previous_deadline():
+    token = request_deadline.set_deadline(time.time() + 10)
+    request_deadline.reset_deadline(token)
+    assert request_deadline.get_remaining_seconds() is None
+
+
+def test_concurrent_requests_keep_their_own_deadline():
+    async def handle_request(budget_seconds):
+        token = request_deadline.set_deadline(time.time() + budget_seconds)
+        try:
+            await asyncio.sleep(0.01)
+            return request_deadline.get_remaining_seconds()
+        finally:
+            request_deadline.reset_deadline(token)
+
+    async def main():
+        return await asyncio.gather(handle_request(5), handle_request(60))
+
+    short_remaining, long_remaining = asyncio.run(main())
+    assert short_remaining <= 5
+    assert long_remaining > 55
@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from google.adk.sessions.session import Session
+
+from session_state_accumulator import SessionStateAccumulator
+
+
+class BlockingSessionService:
+    """Records written state deltas, holding writes to sessions until they are released."""
+
+    def __init__(self, blocked_session_ids: set[str]):
+        self.written: list[tuple[str, dict]] = []
+        self.release = asyncio.Event()
+        self._blocked_session_ids = blocked_session_ids
+        self._sessions: dict[str, Session] = {}
+
+    def create(self, session_id: str) -> Session:
+        session = self._sessions[session_id] = Session(id=session_id, app_name="app", user_id="user")
+        return session
+
+    async def get_session(self, app_name: str, user_id: str, session_id: str) -> Session:
+        if session_id in self._blocked_session_ids:
+            await self.release.wait()
+        return self._sessions[session_id]
+
+    async def append_event(self, session: Session, event):
+        self.written.append((session.id, event.actions.state_delta))
+
+
+def test_flush_writes_staged_state_as_one_event():
+    async def run():
+        session_service = BlockingSessionService(set())
+        session = session_service.create("a")
+        accumulator = SessionStateAccumulator()
+
+        accumulator.get_batch("task", session_service, session).stage({"x": 1})
+        accumulator.get_batch("task", session_service, session).stage({"x": 2, "y": 3})
+        await accumulator.flush("task")
+        await accumulator.flush("task")
+        return session_service.written
+
+    assert asyncio.run(run()) == [("a", {"x": 2, "y": 3})]
+
+
+def test_flushes_of_other_sessions_do_not_wait():
+    async def run():
+        session_service = BlockingSessionService({"a"})
+        accumulator = SessionStateAccumulator()
+        accumulator.get_batch("task_a", session_service, session_service.create("a")).stage({"x": 1})
+        accumulator.get_batch("task_b", session_service, session_service.create("b")).stage({"x": 2})
+
+        flush_a = asyncio.create_task(accumulator.flush("task_a"))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(accumulator.flush("task_b"), timeout=1)
+        written_before_release = list(session_service.written)
+
+        session_service.release.set()
+        await flush_a
+        return written_before_release, session_service.written
+
+    written_before_release, written = asyncio.run(run())
+    assert written_before_release == [("b", {"x": 2})]
+    assert written == [("b", {"x": 2}), ("a", {"x": 1})]
+
+
+def test_flushes_of_the_same_session_keep_their_order():
+    async def run():
+        session_service = BlockingSessionService({"a"})
+        session = session_service.create("a")
+        accumulator = SessionStateAccumulator()
+        accumulator.get_batch("first", session_service, session).stage({"x": 1})
+        accumulator.get_batch("second", session_service, session).stage({"x": 2})
+
+        flushes = [asyncio.create_task(accumulator.flush(task_id)) for task_id in ("first", "second")]
+        await asyncio.sleep(0)
+        session_service.release.set()
+        await asyncio.gather(*flushes)
+        return session_service.written
+
+    assert asyncio.run(run()) == [("a", {"x": 1}), ("a", {"x": 2})]
@@ -0,0 +1,154 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from subagent_circuit_breaker import SubagentCircuitBreaker
+
+OPEN_SECONDS = 30.0
+SLOW_SECONDS = 10.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock, **kwargs) -> SubagentCircuitBreaker:
+    return SubagentCircuitBreaker(
+        "sales",
+        failure_rate_threshold=0.5,
+        slow_request_seconds=SLOW_SECONDS,
+        slow_request_rate_threshold=0.8,
+        window_size=10,
+        min_requests=4,
+        open_seconds=OPEN_SECONDS,
+        clock=clock,
+        **kwargs,
+    )
+
+
+def record_all(breaker: SubagentCircuitBreaker, outcomes: list[bool], latency_seconds: float = 1.0):
+    for success in outcomes:
+        breaker.record(success, latency_seconds)
+
+
+def open_breaker(clock: FakeClock) -> SubagentCircuitBreaker:
+    breaker = make_breaker(clock)
+    record_all(breaker, [False] * 4)
+    assert breaker.state == SubagentCircuitBreaker.OPEN
+    return breaker
+
+
+def test_breaker_stays_closed_below_min_requests():
+    breaker = make_breaker(FakeClock())
+    record_all(breaker, [False] * 3)
+
+    assert breaker.state == SubagentCircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_breaker_opens_at_failure_rate_threshold():
+    breaker = make_breaker(FakeClock())
+    record_all(breaker, [True, True, True, False, False])
+    assert breaker.state == SubagentCircuitBreaker.CLOSED
+
+    breaker.record(False, 1.0)
+    assert breaker.state == SubagentCircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_opens_at_slow_request_rate_threshold():
+    breaker = make_breaker(FakeClock())
+    record_all(breaker, [True] * 4, latency_seconds=SLOW_SECONDS)
+
+    assert breaker.state == SubagentCircuitBreaker.OPEN
+
+
+def test_fast_requests_keep_slow_requests_below_threshold():
+    breaker = make_breaker(FakeClock())
+    record_all(breaker, [True] * 3, latency_seconds=SLOW_SECONDS)
+    record_all(breaker, [True])
+
+    assert breaker.state == SubagentCircuitBreaker.CLOSED
+
+
+def test_old_outcomes_leave_the_window():
+    breaker = make_breaker(FakeClock())
+    record_all(breaker, [True] * 10)
+    record_all(breaker, [False] * 4)
+    assert breaker.state == SubagentCircuitBreaker.CLOSED
+
+    # Half of the window of ten has now failed
+    breaker.record(False, 1.0)
+    assert breaker.state == SubagentCircuitBreaker.OPEN
+
+
+def test_open_breaker_lets_one_probe_through_after_open_seconds():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+
+    clock.now += OPEN_SECONDS - 1
+    assert not breaker.allow_request()
+
+    clock.now += 1
+    assert breaker.allow_request()
+    assert breaker.state == SubagentCircuitBreaker.HALF_OPEN
+    # Only the probe is let through until it completes or another period passes
+    assert not breaker.allow_request()
+
+    clock.now += OPEN_SECONDS
+    assert breaker.allow_request()
+
+
+def test_successful_probe_closes_the_breaker():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now += OPEN_SECONDS
+    assert breaker.allow_request()
+
+    breaker.record(True, 1.0)
+
+    assert breaker.state == SubagentCircuitBreaker.CLOSED
+    assert breaker.allow_request()
+    # The window starts empty, so single failures do not reopen the breaker
+    record_all(breaker, [False] * 3)
+    assert breaker.state == SubagentCircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens_the_breaker():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now += OPEN_SECONDS
+    assert breaker.allow_request()
+
+    clock.now += 5
+    breaker.record(False, 1.0)
+
+    assert breaker.state == SubagentCircuitBreaker.OPEN
+    clock.now += OPEN_SECONDS - 1
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
+
+
+def test_outcomes_of_requests_sent_before_opening_are_ignored():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+
+    breaker.record(True, 1.0)
+
+    assert breaker.state == SubagentCircuitBreaker.OPEN
+    assert not breaker.allow_request()
@@ -0,0 +1,103 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import AsyncGenerator
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.adk.sessions import InMemorySessionService
+from google.genai import types as genai_types
+
+from subagent_fan_out import FAN_OUT_AGENT_NAME, FAN_OUT_SUBAGENT_NAMES_STATE_KEY, SubagentFanOutAgent
+
+
+class TextAgent(BaseAgent):
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=genai_types.Content(role="model", parts=[genai_types.Part(text=f"Hello from {self.name}")]),
+        )
+
+
+class FailingAgent(BaseAgent):
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        raise RuntimeError("connection refused")
+        yield
+
+
+class ParentAgent(BaseAgent):
+    pass
+
+
+async def run_fan_out(agent_names: list[str]) -> list[Event]:
+    fan_out_agent = SubagentFanOutAgent(name=FAN_OUT_AGENT_NAME)
+    ParentAgent(name="orchestrator", sub_agents=[TextAgent(name="sales"), FailingAgent(name="contacts"), fan_out_agent])
+    session_service = InMemorySessionService()
+    session = await session_service.create_session(app_name="test", user_id="user")
+    session.state[FAN_OUT_SUBAGENT_NAMES_STATE_KEY] = agent_names
+    ctx = InvocationContext(
+        session_service=session_service,
+        invocation_id="invocation",
+        agent=fan_out_agent,
+        session=session,
+    )
+    return [event async for event in fan_out_agent.run_async(ctx)]
+
+
+def get_texts(events: list[Event]) -> dict[str, str]:
+    return {event.author: event.content.parts[0].text for event in events if event.content}
+
+
+def test_fan_out_yields_the_events_of_every_subagent():
+    events = asyncio.run(run_fan_out(["sales"]))
+
+    assert get_texts(events) == {"sales": "Hello from sales"}
+    assert events[0].branch == f"{FAN_OUT_AGENT_NAME}.sales"
+
+
+def test_failed_subagent_is_answered_with_a_fallback_text():
+    events = asyncio.run(run_fan_out(["sales", "contacts"]))
+
+    assert get_texts(events) == {
+        "sales": "Hello from sales",
+        "contacts": "The contacts agent failed to respond. Please try again later.",
+    }
+
+
+def test_unknown_subagents_are_skipped():
+    events = asyncio.run(run_fan_out(["sales", "maps", FAN_OUT_AGENT_NAME]))
+
+    assert get_texts(events) == {"sales": "Hello from sales"}
+
+
+def test_fan_out_subagent_names_are_not_persisted():
+    async def main():
+        session_service = InMemorySessionService()
+        session = await session_service.create_session(app_name="test", user_id="user")
+        await session_service.append_event(
+            session,
+            Event(author="orchestrator", actions=EventActions(state_delta={FAN_OUT_SUBAGENT_NAMES_STATE_KEY: ["sales"]})),
+        )
+        stored_session = await session_service.get_session(app_name="test", user_id="user", session_id=session.id)
+        return session, stored_session
+
+    session, stored_session = asyncio.run(main())
+
+    assert session.state[FAN_OUT_SUBAGENT_NAMES_STATE_KEY] == ["sales"]
+    assert FAN_OUT_SUBAGENT_NAMES_STATE_KEY not in stored_session.state
@@ -0,0 +1,102 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+
+from subagent_intent_router import SubagentIntentRouter
+
+
+def make_card(name: str, description: str, tags: list[str]) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=description,
+        url=f"http://localhost/{name}",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[AgentSkill(id=name, name=name, description=description, tags=tags)],
+    )
+
+
+def make_router() -> SubagentIntentRouter:
+    return SubagentIntentRouter(
+        {
+            "sales": make_card("Sales Dashboard", "Charts of revenue by product category", ["sales", "revenue", "chart"]),
+            "contacts": make_card("Contact Lookup", "Finds the email and phone of employees", ["contact", "employee", "phone"]),
+        }
+    )
+
+
+def test_pick_requires_min_score():
+    router = SubagentIntentRouter({}, min_score=3.0)
+
+    assert router.pick({"sales": 2.9}) is None
+    assert router.pick({"sales": 3.0}) == "sales"
+    assert router.pick({}) is None
+
+
+def test_pick_requires_margin_over_runner_up():
+    router = SubagentIntentRouter({}, min_score=3.0, min_margin=2.0)
+
+    assert router.pick({"sales": 6.0, "contacts": 3.0}) == "sales"
+    assert router.pick({"sales": 5.9, "contacts": 3.0}) is None
+
+
+def test_score_leaves_out_excluded_agents():
+    router = make_router()
+
+    scores = router.score("show revenue by category", excluded_agent_names={"contacts"})
+
+    assert list(scores) == ["sales"]
+    assert scores["sales"] > 0
+
+
+def test_is_topic_shift_only_when_another_agent_clearly_wins():
+    router = SubagentIntentRouter({}, min_score=3.0)
+
+    assert router.is_topic_shift({"sales": 1.0, "contacts": 4.0}, "sales")
+    assert not router.is_topic_shift({"sales": 5.0, "contacts": 4.0}, "sales")
+    assert not router.is_topic_shift({"sales": 0.0, "contacts": 2.0}, "sales")
+
+
+def test_is_follow_up_needs_the_current_agent_to_clear_min_score():
+    router = SubagentIntentRouter({}, min_score=3.0)
+
+    assert router.is_follow_up({"sales": 3.0, "contacts": 0.0}, "sales")
+    assert not router.is_follow_up({"sales": 2.9, "contacts": 0.0}, "sales")
+    assert not router.is_follow_up({"sales": 4.0, "contacts": 5.0}, "sales")
+
+
+def test_small_talk_is_not_a_follow_up():
+    router = make_router()
+
+    assert not router.is_follow_up(router.score("thanks, what else can you do?"), "sales")
+    assert router.is_follow_up(router.score("and the revenue chart for last year?"), "sales")
+
+
+def test_route_clauses_fans_out_to_each_confident_match():
+    router = make_router()
+
+    assert router.route_clauses("show me sales revenue and the phone of the employee contact") == [
+        "sales",
+        "contacts",
+    ]
+
+
+def test_route_clauses_skips_ambiguous_and_duplicate_clauses():
+    router = make_router()
+
+    assert router.route_clauses("sales revenue, then the revenue chart, and the weather") == ["sales"]
+    assert router.route_clauses("sales revenue and employee phone", excluded_agent_names={"contacts"}) == ["sales"]
@@ -0,0 +1,209 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import httpx
+from a2a.types import AgentCard
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+from subagent_registry import SubagentRegistry, get_agent_name
+
+
+class FakeSubagents(httpx.AsyncBaseTransport):
+    """Serves the agent card and health endpoint of each subagent URL."""
+
+    def __init__(self):
+        self.cards: dict[str, dict[str, Any]] = {}
+        self.down: set[str] = set()
+        self.unhealthy: set[str] = set()
+
+    def add(self, url: str, name: str, description: str = "A subagent"):
+        self.cards[url] = {
+            "name": name,
+            "description": description,
+            "url": url,
+            "version": "1.0.0",
+            "capabilities": {},
+            "defaultInputModes": ["text"],
+            "defaultOutputModes": ["text"],
+            "skills": [],
+        }
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = f"{request.url.scheme}://{request.url.host}"
+        if url not in self.cards or url in self.down:
+            raise httpx.ConnectError("Connection refused", request=request)
+        if request.url.path == AGENT_CARD_WELL_KNOWN_PATH:
+            return httpx.Response(200, json=self.cards[url])
+        return httpx.Response(503 if url in self.unhealthy else 200)
+
+
+def create_remote_agent(card: AgentCard, transport: httpx.AsyncBaseTransport, circuit_breaker) -> SimpleNamespace:
+    return SimpleNamespace(name=get_agent_name(card.name), description=json.dumps({"name": card.name}), card=card)
+
+
+def make_registry(
+    subagents: FakeSubagents, urls: list[str], **kwargs
+) -> tuple[SubagentRegistry, list[list[str]]]:
+    registry = SubagentRegistry(urls, create_remote_agent, httpx_transport=subagents, **kwargs)
+    notifications: list[list[str]] = []
+    registry.add_listener(lambda: notifications.append(sorted(registry.available_cards)))
+    return registry, notifications
+
+
+def get_replica_urls(registry: SubagentRegistry, agent_name: str) -> Optional[list[str]]:
+    if (subagent := registry._subagents.get(agent_name)) is None:
+        return None
+    return sorted(subagent.transport._replica_urls)
+
+
+def test_replicas_with_the_same_card_name_form_one_subagent():
+    subagents = FakeSubagents()
+    subagents.add("http://sales-a", "Sales Agent")
+    subagents.add("http://sales-b", "Sales Agent")
+    subagents.add("http://maps", "Maps Agent")
+    registry, notifications = make_registry(subagents, ["http://sales-a", "http://sales-b", "http://maps"])
+
+    asyncio.run(registry.refresh())
+
+    assert sorted(agent.name for agent in registry.available_agents) == ["Maps_Agent", "Sales_Agent"]
+    assert get_replica_urls(registry, "Sales_Agent") == ["http://sales-a", "http://sales-b"]
+    assert registry.is_available("Sales_Agent")
+    assert registry.get_subagent_metadata("Sales_Agent") == {"name": "Sales Agent"}
+    assert notifications == [["Maps_Agent", "Sales_Agent"]]
+
+
+def test_listeners_are_only_notified_of_changes():
+    subagents = FakeSubagents()
+    subagents.add("http://sales", "Sales Agent")
+    registry, notifications = make_registry(subagents, ["http://sales"])
+
+    asyncio.run(registry.refresh())
+    asyncio.run(registry.refresh())
+
+    assert notifications == [["Sales_Agent"]]
+
+
+def test_subagent_is_unavailable_after_unhealthy_threshold_failed_polls():
+    subagents = FakeSubagents()
+    subagents.add("http://sales", "Sales Agent")
+    registry, notifications = make_registry(subagents, ["http://sales"], unhealthy_threshold=2)
+    asyncio.run(registry.refresh())
+
+    subagents.down.add("http://sales")
+    asyncio.run(registry.refresh())
+    assert registry.is_available("Sales_Agent")
+
+    asyncio.run(registry.refresh())
+    assert not registry.is_available("Sales_Agent")
+    # Known subagents keep their metadata while unavailable
+    assert registry.get_subagent_metadata("Sales_Agent") == {"name": "Sales Agent"}
+
+    subagents.down.clear()
+    asyncio.run(registry.refresh())
+    assert registry.is_available("Sales_Agent")
+    assert notifications == [["Sales_Agent"], [], ["Sales_Agent"]]
+
+
+def test_failed_health_check_counts_as_failed_poll():
+    subagents = FakeSubagents()
+    subagents.add("http://sales", "Sales Agent")
+    subagents.unhealthy.add("http://sales")
+    registry, _ = make_registry(subagents, ["http://sales"], health_path="/healthz", unhealthy_threshold=1)
+
+    asyncio.run(registry.refresh())
+    assert registry.available_agents == []
+
+    subagents.unhealthy.clear()
+    asyncio.run(registry.refresh())
+    assert registry.is_available("Sales_Agent")
+
+
+def test_unavailable_replica_is_removed_from_the_subagent():
+    subagents = FakeSubagents()
+    subagents.add("http://sales-a", "Sales Agent")
+    subagents.add("http://sales-b", "Sales Agent")
+    registry, notifications = make_registry(subagents, ["http://sales-a", "http://sales-b"], unhealthy_threshold=1)
+    asyncio.run(registry.refresh())
+
+    subagents.down.add("http://sales-b")
+    asyncio.run(registry.refresh())
+
+    assert registry.is_available("Sales_Agent")
+    assert get_replica_urls(registry, "Sales_Agent") == ["http://sales-a"]
+    assert notifications == [["Sales_Agent"]]
+
+
+def test_urls_file_is_re_read_on_every_poll(tmp_path):
+    subagents = FakeSubagents()
+    subagents.add("http://sales", "Sales Agent")
+    subagents.add("http://maps", "Maps Agent")
+    urls_file = tmp_path / "subagents.txt"
+    urls_file.write_text("# Subagents\nhttp://sales\n")
+    registry, notifications = make_registry(subagents, [], subagent_urls_file=str(urls_file))
+
+    asyncio.run(registry.refresh())
+    urls_file.write_text("http://maps\n")
+    asyncio.run(registry.refresh())
+
+    assert [agent.name for agent in registry.available_agents] == ["Maps_Agent"]
+    assert notifications == [["Sales_Agent"], ["Maps_Agent"]]
+
+
+def test_changed_card_replaces_the_remote_agent():
+    subagents = FakeSubagents()
+    subagents.add("http://sales", "Sales Agent")
+    registry, notifications = make_registry(subagents, ["http://sales"])
+    asyncio.run(registry.refresh())
+    first_agent = registry.available_agents[0]
+
+    asyncio.run(registry.refresh())
+    assert registry.available_agents[0] is first_agent
+
+    subagents.add("http://sales", "Sales Agent", description="A new description")
+    asyncio.run(registry.refresh())
+
+    replaced_agent = registry.available_agents[0]
+    assert replaced_agent is not first_agent
+    assert replaced_agent.card.description == "A new description"
+    assert len(notifications) == 2
+
+
+def test_card_names_with_the_same_agent_name_do_not_replace_each_other():
+    subagents = FakeSubagents()
+    subagents.add("http://sales-a", "Sales Agent")
+    registry, notifications = make_registry(subagents, ["http://sales-a", "http://sales-b"])
+    asyncio.run(registry.refresh())
+    first_agent = registry.available_agents[0]
+
+    # Sorts before "Sales Agent", but the registered subagent keeps the name
+    subagents.add("http://sales-b", "Sales-Agent")
+    asyncio.run(registry.refresh())
+    asyncio.run(registry.refresh())
+
+    assert registry.available_agents == [first_agent]
+    assert get_replica_urls(registry, "Sales_Agent") == ["http://sales-a"]
+    assert notifications == [["Sales_Agent"]]
+
+    # Once the registered subagent is gone, the other card takes the name
+    subagents.down.add("http://sales-a")
+    for _ in range(2):
+        asyncio.run(registry.refresh())
+
+    assert [agent.card.name for agent in registry.available_agents] == ["Sales-Agent"]
+    assert get_replica_urls(registry, "Sales_Agent") == ["http://sales-b"]
@@ -0,0 +1,86 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+
+import httpx
+
+from subagent_replica_transport import ReplicaBalancingTransport
+
+REPLICA_URLS = ["http://replica-a", "http://replica-b"]
+
+
+class FakeReplicas(httpx.AsyncBaseTransport):
+    """Answers JSON-RPC requests and records where each was sent."""
+
+    def __init__(self):
+        self.sent: list[tuple[str, str]] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        replica_url = f"{request.url.scheme}://{request.url.host}"
+        payload = json.loads(request.content)
+        self.sent.append((replica_url, payload["method"]))
+        context_id = ((payload.get("params") or {}).get("message") or {}).get("contextId")
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": {"contextId": context_id}})
+
+
+def make_transport() -> tuple[ReplicaBalancingTransport, FakeReplicas]:
+    replicas = FakeReplicas()
+    transport = ReplicaBalancingTransport(REPLICA_URLS[0], transport=replicas)
+    transport.set_replicas(REPLICA_URLS)
+    return transport, replicas
+
+
+def send_message(context_id: str) -> httpx.Request:
+    return httpx.Request(
+        "POST",
+        REPLICA_URLS[0],
+        json={"jsonrpc": "2.0", "id": 1, "method": "message/send", "params": {"message": {"contextId": context_id}}},
+    )
+
+
+def test_requests_are_spread_across_replicas():
+    async def run():
+        transport, replicas = make_transport()
+        for index in range(4):
+            await transport.handle_async_request(send_message(f"context-{index}"))
+        return replicas.sent
+
+    assert sorted(replica_url for replica_url, _ in asyncio.run(run())) == sorted(REPLICA_URLS * 2)
+
+
+def test_messages_of_a_context_stick_to_its_replica():
+    async def run():
+        transport, replicas = make_transport()
+        for _ in range(4):
+            await transport.handle_async_request(send_message("context"))
+        return replicas.sent
+
+    sent = asyncio.run(run())
+    assert len(sent) == 4
+    assert len({replica_url for replica_url, _ in sent}) == 1
+
+
+def test_context_moves_to_another_replica_when_its_replica_is_removed():
+    async def run():
+        transport, replicas = make_transport()
+        await transport.handle_async_request(send_message("context"))
+        pinned_url = replicas.sent[0][0]
+        transport.set_replicas([url for url in REPLICA_URLS if url != pinned_url])
+        await transport.handle_async_request(send_message("context"))
+        return replicas.sent
+
+    sent = asyncio.run(run())
+    assert sent[0][0] != sent[1][0]
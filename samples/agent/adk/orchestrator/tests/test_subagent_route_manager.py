@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.adk.sessions.session import Session
+
+from session_state_accumulator import SessionStateBatch
+from subagent_route_manager import SubagentRouteManager
+
+
+def make_batch(state=None) -> SessionStateBatch:
+    return SessionStateBatch(None, Session(id="session", app_name="app", user_id="user", state=state or {}))
+
+
+def get_routes(state_batch: SessionStateBatch) -> dict[str, str]:
+    return state_batch.get(SubagentRouteManager.SURFACE_ROUTES_KEY)
+
+
+def test_least_recently_set_route_is_evicted(monkeypatch):
+    monkeypatch.setattr(SubagentRouteManager, "MAX_SURFACE_ROUTES", 2)
+    state_batch = make_batch()
+
+    for surface_id in ("a", "b", "c"):
+        SubagentRouteManager.set_route_to_subagent_name(surface_id, "sales", state_batch)
+
+    assert list(get_routes(state_batch)) == ["b", "c"]
+
+
+def test_used_route_is_evicted_last(monkeypatch):
+    monkeypatch.setattr(SubagentRouteManager, "MAX_SURFACE_ROUTES", 2)
+    state_batch = make_batch()
+    SubagentRouteManager.set_route_to_subagent_name("a", "sales", state_batch)
+    SubagentRouteManager.set_route_to_subagent_name("b", "contacts", state_batch)
+
+    SubagentRouteManager.mark_route_used("a", state_batch)
+    SubagentRouteManager.set_route_to_subagent_name("c", "sales", state_batch)
+
+    assert get_routes(state_batch) == {"a": "sales", "c": "sales"}
+
+
+def test_marking_an_unknown_surface_stages_nothing():
+    state_batch = make_batch({SubagentRouteManager.SURFACE_ROUTES_KEY: {"a": "sales"}})
+
+    SubagentRouteManager.mark_route_used("b", state_batch)
+    SubagentRouteManager.mark_route_used("a", state_batch)
+
+    assert not state_batch.is_staged(SubagentRouteManager.SURFACE_ROUTES_KEY)
+
+
+def test_routes_are_only_changed_through_the_batch():
+    session_routes = {"a": "sales", "b": "contacts"}
+    state_batch = make_batch({SubagentRouteManager.SURFACE_ROUTES_KEY: session_routes})
+
+    SubagentRouteManager.mark_route_used("a", state_batch)
+    SubagentRouteManager.delete_route("b", state_batch)
+
+    assert get_routes(state_batch) == {"a": "sales"}
+    assert session_routes == {"a": "sales", "b": "contacts"}
+
+
+def test_legacy_routes_are_migrated_as_least_recently_used():
+    prefix = SubagentRouteManager.LEGACY_ROUTING_KEY_PREFIX
+    state = {
+        f"{prefix}old": "contacts",
+        f"{prefix}cleared": None,
+        f"{prefix}a": "contacts",
+        SubagentRouteManager.SURFACE_ROUTES_KEY: {"a": "sales"},
+    }
+    state_batch = make_batch(state)
+
+    SubagentRouteManager.migrate_legacy_routes(state, state_batch)
+
+    assert list(get_routes(state_batch).items()) == [("old", "contacts"), ("a", "sales")]
+    assert state_batch.get(f"{prefix}old") is None
+    assert state_batch.get(f"{prefix}a") is None
+    assert not state_batch.is_staged(f"{prefix}cleared")
+
+
+def test_nothing_is_staged_without_legacy_routes():
+    state = {SubagentRouteManager.SURFACE_ROUTES_KEY: {"a": "sales"}}
+    state_batch = make_batch(state)
+
+    SubagentRouteManager.migrate_legacy_routes(state, state_batch)
+
+    assert not state_batch.is_staged(SubagentRouteManager.SURFACE_ROUTES_KEY)
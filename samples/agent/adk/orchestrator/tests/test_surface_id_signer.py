@@ -0,0 +1,112 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from types import SimpleNamespace
+
+from a2ui.a2ui_extension import create_a2ui_part
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types as genai_types
+
+import part_converters
+from agent import OrchestratorAgent
+from surface_id_signer import SurfaceIdSigner
+
+
+def test_sign_verify_round_trip():
+    signer = SurfaceIdSigner("secret")
+
+    signed_surface_id = signer.sign("sales", "rizzcharts")
+
+    assert signed_surface_id.startswith("rizzcharts.")
+    assert signer.verify(signed_surface_id) == ("rizzcharts", "sales")
+
+
+def test_surface_id_with_dots_round_trips():
+    signer = SurfaceIdSigner("secret")
+
+    assert signer.verify(signer.sign("dashboard.q3.sales", "rizzcharts")) == ("rizzcharts", "dashboard.q3.sales")
+
+
+def test_tampered_signature_is_rejected():
+    signer = SurfaceIdSigner("secret")
+    subagent_name, signature, surface_id = signer.sign("sales", "rizzcharts").split(".", 2)
+    tampered_signature = ("A" if signature[0] != "A" else "B") + signature[1:]
+
+    assert signer.verify(f"{subagent_name}.{tampered_signature}.{surface_id}") is None
+
+
+def test_wrong_agent_prefix_is_rejected():
+    signer = SurfaceIdSigner("secret")
+    _, signature, surface_id = signer.sign("sales", "rizzcharts").split(".", 2)
+
+    assert signer.verify(f"contact_lookup.{signature}.{surface_id}") is None
+
+
+def test_other_key_and_unsigned_surface_ids_are_rejected():
+    signed_surface_id = SurfaceIdSigner("secret").sign("sales", "rizzcharts")
+
+    assert SurfaceIdSigner("other secret").verify(signed_surface_id) is None
+    assert SurfaceIdSigner("secret").verify("sales") is None
+
+
+def test_sign_a2ui_part_signs_the_surface_id():
+    signer = SurfaceIdSigner("secret")
+    a2a_part = create_a2ui_part({"beginRendering": {"surfaceId": "sales", "root": "root"}})
+
+    signed_part = signer.sign_a2ui_part(a2a_part, "rizzcharts")
+
+    assert signed_part.root.data["beginRendering"] == {"surfaceId": signer.sign("sales", "rizzcharts"), "root": "root"}
+    assert a2a_part.root.data["beginRendering"]["surfaceId"] == "sales"
+
+
+def test_unsign_user_action_part_restores_the_surface_id():
+    signer = SurfaceIdSigner("secret")
+    a2a_part = create_a2ui_part(
+        {"userAction": {"name": "select", "surfaceId": signer.sign("dashboard.sales", "rizzcharts")}}
+    )
+
+    assert signer.unsign_user_action_part(a2a_part).root.data["userAction"] == {
+        "name": "select",
+        "surfaceId": "dashboard.sales",
+    }
+
+
+def test_unsign_user_action_part_keeps_forged_surface_ids():
+    signer = SurfaceIdSigner("secret")
+    forged_surface_id = SurfaceIdSigner("other secret").sign("sales", "rizzcharts")
+    a2a_part = create_a2ui_part({"userAction": {"name": "select", "surfaceId": forged_surface_id}})
+
+    unsigned_part = signer.unsign_user_action_part(a2a_part)
+
+    assert unsigned_part.root.data["userAction"]["surfaceId"] == forged_surface_id
+
+
+def test_compacted_user_action_names_the_subagent_of_a_signed_surface_id():
+    signer = SurfaceIdSigner("secret")
+    user_action_part = create_a2ui_part(
+        {"userAction": {"name": "select", "surfaceId": signer.sign("sales", "rizzcharts"), "context": {}}}
+    )
+    llm_request = LlmRequest(
+        contents=[
+            genai_types.Content(role="user", parts=[part_converters.convert_a2a_part_to_genai_part(user_action_part)]),
+            genai_types.Content(role="user", parts=[genai_types.Part(text="Show me Q3 sales")]),
+        ]
+    )
+
+    asyncio.run(
+        OrchestratorAgent.compact_a2ui_parts_in_model_context(signer, SimpleNamespace(state={}), llm_request)
+    )
+
+    assert "from rizzcharts" in llm_request.contents[0].parts[0].text
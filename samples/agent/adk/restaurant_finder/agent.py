@@ -19,6 +19,7 @@ from collections.abc import AsyncIterable
 from typing import Any
 
 import jsonschema
+from a2ui.log_utils import EVENT_LOG_CATEGORY, PAYLOAD_LOG_CATEGORY, Truncated, get_category_logger
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
@@ -35,6 +36,8 @@ from prompt_builder import (
 from tools import get_restaurants
 
 logger = logging.getLogger(__name__)
+event_logger = get_category_logger(EVENT_LOG_CATEGORY)
+payload_logger = get_category_logger(PAYLOAD_LOG_CATEGORY)
 
 AGENT_INSTRUCTION = """
     You are a helpful restaurant finding assistant. Your goal is to help users find and book restaurants using a rich UI.
@@ -166,7 +169,7 @@ class RestaurantAgent:
                 session_id=session.id,
                 new_message=current_message,
             ):
-                logger.info(f"Event from runner: {event}")
+                event_logger.debug("Event from runner: %s", Truncated(event))
                 if event.is_final_response():
                     if (
                         event.content
@@ -178,7 +181,7 @@ class RestaurantAgent:
                         )
                     break  # Got the final response, stop consuming events
                 else:
-                    logger.info(f"Intermediate event: {event}")
+                    event_logger.debug("Intermediate event: %s", Truncated(event))
                     # Yield intermediate updates on every attempt
                     yield {
                         "is_task_complete": False,
@@ -266,7 +269,7 @@ class RestaurantAgent:
                 logger.info(
                     f"--- RestaurantAgent.stream: Response is valid. Sending final response (Attempt {attempt}). ---"
                 )
-                logger.info(f"Final response: {final_response_content}")
+                payload_logger.debug("Final response: %s", Truncated(final_response_content))
                 yield {
                     "is_task_complete": True,
                     "content": final_response_content,
@@ -21,12 +21,16 @@ from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
 from agent_executor import RizzchartsAgentExecutor
+from sales_store import SalesStore
+import tools
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from a2ui.log_utils import configure_log_categories
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
+configure_log_categories()
 logger = logging.getLogger(__name__)
 
 
@@ -37,7 +41,13 @@ class MissingAPIKeyError(Exception):
 @click.command()
 @click.option("--host", default="localhost")
 @click.option("--port", default=10002)
-def main(host, port):
+@click.option(
+    "--sales_data",
+    envvar="RIZZCHARTS_SALES_DATA",
+    default=None,
+    help="CSV or Parquet file of order rows to serve instead of the generated demo data.",
+)
+def main(host, port, sales_data):
     try:
         # Check for API key only if Vertex AI is not configured
         if not os.getenv("GOOGLE_GENAI_USE_VERTEXAI") == "TRUE":
@@ -46,6 +56,8 @@ def main(host, port):
                     "GEMINI_API_KEY environment variable not set and GOOGLE_GENAI_USE_VERTEXAI is not TRUE."
                 )
 
+        tools.set_sales_store(SalesStore.load(sales_data) if sales_data else SalesStore.demo())
+
         base_url = f"http://{host}:{port}"
         agent_executor = RizzchartsAgentExecutor(base_url=base_url)
 
@@ -12,6 +12,63 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import contextvars
+from typing import Any, NamedTuple, Optional
+
 A2UI_ENABLED_STATE_KEY = "user:a2ui_enabled"
 A2UI_CATALOG_URI_STATE_KEY = "user:a2ui_catalog_uri"
-A2UI_SCHEMA_STATE_KEY = "user:a2ui_schema"
\ No newline at end of file
+
+_MAX_A2UI_SCHEMAS = 256
+
+# Merged A2UI schemas keyed by fingerprint, shared by all sessions in the process.
+# Clients sending the same inline catalog share one copy of the schema. Inline
+# catalogs come from clients, so only the most recently used schemas are kept.
+_a2ui_schemas_by_fingerprint: collections.OrderedDict[str, dict[str, Any]] = collections.OrderedDict()
+
+
+class RequestA2uiSchema(NamedTuple):
+    """The A2UI schema negotiated with the client of the request being handled."""
+
+    a2ui_schema: dict[str, Any]
+    fingerprint: str
+    catalog_uri: Optional[str]
+
+
+# Each request runs in its own asyncio task, so concurrent sessions with different
+# catalogs don't see each other's schema. `user:` state is shared by all of a
+# user's sessions, so it can't hold the schema.
+_request_a2ui_schema: contextvars.ContextVar[Optional[RequestA2uiSchema]] = contextvars.ContextVar(
+    "request_a2ui_schema", default=None
+)
+
+
+def intern_a2ui_schema(a2ui_schema: dict[str, Any], fingerprint: str) -> dict[str, Any]:
+    """Registers an A2UI schema under its fingerprint.
+
+    Returns:
+        The schema already registered under the fingerprint, or a2ui_schema if there was none.
+    """
+    if (interned_a2ui_schema := _a2ui_schemas_by_fingerprint.get(fingerprint)) is not None:
+        _a2ui_schemas_by_fingerprint.move_to_end(fingerprint)
+        return interned_a2ui_schema
+
+    _a2ui_schemas_by_fingerprint[fingerprint] = a2ui_schema
+    if len(_a2ui_schemas_by_fingerprint) > _MAX_A2UI_SCHEMAS:
+        _a2ui_schemas_by_fingerprint.popitem(last=False)
+    return a2ui_schema
+
+
+def set_request_a2ui_schema(a2ui_schema: dict[str, Any], fingerprint: str, catalog_uri: Optional[str]):
+    """Sets the A2UI schema of the current request.
+
+    Must be called from the task that runs the agent, e.g. from _prepare_session.
+    """
+    _request_a2ui_schema.set(RequestA2uiSchema(a2ui_schema, fingerprint, catalog_uri))
+
+
+def get_request_a2ui_schema() -> RequestA2uiSchema:
+    """Gets the A2UI schema of the current request."""
+    if (request_a2ui_schema := _request_a2ui_schema.get()) is None:
+        raise ValueError("A2UI schema is not set for this request")
+    return request_a2ui_schema
@@ -12,8 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import json
-import jsonschema
 import logging
 from typing import Any, List, Optional
 
@@ -24,7 +24,8 @@ from google.adk.tools.base_tool import BaseTool
 from google.adk.tools import base_toolset
 from google.adk.tools.tool_context import ToolContext
 from google.adk.agents.readonly_context import ReadonlyContext
-from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_SCHEMA_STATE_KEY
+from a2ui_session_util import A2UI_ENABLED_STATE_KEY, get_request_a2ui_schema
+from a2ui_validation import parse_and_validate_a2ui_json
 
 logger = logging.getLogger(__name__)
 
@@ -52,8 +53,12 @@ class A2uiToolset(base_toolset.BaseToolset):
 class SendA2uiJsonToClientTool(BaseTool):
     TOOL_NAME = "send_a2ui_json_to_client"
     A2UI_JSON_ARG_NAME = "a2ui_json"
+    MAX_SCHEMA_BLOCKS = 256
 
     def __init__(self):
+        # Serialized schema instructions keyed by schema fingerprint, shared by all sessions.
+        # Inline catalogs come from clients, so only the most recently used blocks are kept.
+        self._schema_blocks_by_fingerprint: collections.OrderedDict[str, str] = collections.OrderedDict()
         super().__init__(
             name=self.TOOL_NAME,
             description="Sends A2UI JSON to the client to render rich UI for the user. This tool can be called multiple times in the same call to render multiple UI surfaces."
@@ -77,10 +82,8 @@ class SendA2uiJsonToClientTool(BaseTool):
             ),
         )
 
-    def get_a2ui_schema(self, tool_context: ToolContext) -> dict[str, Any]:
-        a2ui_schema = tool_context.state.get(A2UI_SCHEMA_STATE_KEY)
-        if not a2ui_schema:
-            raise ValueError("A2UI schema is empty")
+    def get_a2ui_schema(self) -> dict[str, Any]:
+        a2ui_schema = get_request_a2ui_schema().a2ui_schema
         a2ui_schema_object = {"type": "array", "items": a2ui_schema} # Make a list since we support multiple parts in this tool call
         return a2ui_schema_object 
 
@@ -91,17 +94,19 @@ class SendA2uiJsonToClientTool(BaseTool):
             tool_context=tool_context, llm_request=llm_request
         )
 
-        a2ui_schema = self.get_a2ui_schema(tool_context)
-
-        llm_request.append_instructions(
-            [
-                f"""    
+        fingerprint = get_request_a2ui_schema().fingerprint
+        if (schema_block := self._schema_blocks_by_fingerprint.get(fingerprint)) is not None:
+            self._schema_blocks_by_fingerprint.move_to_end(fingerprint)
+        else:
+            schema_block = self._schema_blocks_by_fingerprint[fingerprint] = f"""    
 ---BEGIN A2UI JSON SCHEMA---
-{json.dumps(a2ui_schema)}
+{json.dumps(self.get_a2ui_schema())}
 ---END A2UI JSON SCHEMA---
 """
-            ]
-        )
+            if len(self._schema_blocks_by_fingerprint) > self.MAX_SCHEMA_BLOCKS:
+                self._schema_blocks_by_fingerprint.popitem(last=False)
+
+        llm_request.append_instructions([schema_block])
 
         logger.info("Added a2ui_schema to system instructions")
 
@@ -115,11 +120,10 @@ class SendA2uiJsonToClientTool(BaseTool):
                     f"Failed to call tool {self.TOOL_NAME} because missing required arg {self.A2UI_JSON_ARG_NAME} "
                 )
 
-            a2ui_json_payload = json.loads(a2ui_json)
-            a2ui_schema = self.get_a2ui_schema(tool_context)
-            jsonschema.validate(
-                instance=a2ui_json_payload, schema=a2ui_schema
-            )
+            # The part converter only sends the payload to the client after this succeeds,
+            # and then reuses the messages parsed here
+            request_a2ui_schema = get_request_a2ui_schema()
+            parse_and_validate_a2ui_json(a2ui_json, request_a2ui_schema.a2ui_schema, request_a2ui_schema.fingerprint)
 
             logger.info(
                 f"Validated call to tool {self.TOOL_NAME} with {self.A2UI_JSON_ARG_NAME}"
@@ -0,0 +1,91 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import hashlib
+import json
+import jsonschema
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_MAX_VALIDATED_PAYLOADS = 256
+_MAX_VALIDATORS = 256
+
+# Parsed A2UI messages keyed by schema fingerprint and payload hash
+_validated_payloads: collections.OrderedDict[tuple[str, str], list[dict[str, Any]]] = collections.OrderedDict()
+
+# Compiled validators keyed by schema fingerprint. Inline catalogs come from clients,
+# so only the most recently used validators are kept.
+_validators_by_fingerprint: collections.OrderedDict[str, jsonschema.protocols.Validator] = collections.OrderedDict()
+
+
+def get_a2ui_validator(a2ui_schema: dict[str, Any], schema_fingerprint: str) -> jsonschema.protocols.Validator:
+    """Gets the validator for a list of A2UI messages, compiling it once per schema.
+
+    Args:
+        a2ui_schema: The A2UI schema of a single message.
+        schema_fingerprint: Identifies the schema, see get_a2ui_schema_fingerprint.
+
+    Returns:
+        The validator of the array of messages sent by send_a2ui_json_to_client.
+    """
+    if (validator := _validators_by_fingerprint.get(schema_fingerprint)) is not None:
+        _validators_by_fingerprint.move_to_end(schema_fingerprint)
+        return validator
+
+    a2ui_schema_object = {"type": "array", "items": a2ui_schema} # Make a list since we support multiple parts in this tool call
+    validator_class = jsonschema.validators.validator_for(a2ui_schema)
+    validator_class.check_schema(a2ui_schema_object)
+    validator = validator_class(a2ui_schema_object)
+    _validators_by_fingerprint[schema_fingerprint] = validator
+    if len(_validators_by_fingerprint) > _MAX_VALIDATORS:
+        _validators_by_fingerprint.popitem(last=False)
+    return validator
+
+
+def parse_and_validate_a2ui_json(a2ui_json: str, a2ui_schema: dict[str, Any], schema_fingerprint: str) -> list[dict[str, Any]]:
+    """Parses a send_a2ui_json_to_client payload and validates it against the A2UI schema.
+
+    The same payload is seen twice: by the tool when it runs, and then by the
+    part converter, which sends it to the client once the tool accepted it.
+    The parsed messages of valid payloads are cached so that the converter
+    skips both the parse and the validation.
+
+    Args:
+        a2ui_json: The JSON array of A2UI messages.
+        a2ui_schema: The A2UI schema of a single message.
+        schema_fingerprint: Identifies the schema, see get_a2ui_schema_fingerprint.
+
+    Returns:
+        The parsed A2UI messages, which must not be modified.
+
+    Raises:
+        json.JSONDecodeError: If the payload is not valid JSON.
+        jsonschema.ValidationError: If the payload does not match the schema.
+    """
+    key = (schema_fingerprint, hashlib.sha256(a2ui_json.encode("utf-8")).hexdigest())
+    if (messages := _validated_payloads.get(key)) is not None:
+        _validated_payloads.move_to_end(key)
+        logger.info("Reusing validated A2UI payload")
+        return messages
+
+    messages = json.loads(a2ui_json)
+    get_a2ui_validator(a2ui_schema, schema_fingerprint).validate(messages)
+
+    _validated_payloads[key] = messages
+    if len(_validated_payloads) > _MAX_VALIDATED_PAYLOADS:
+        _validated_payloads.popitem(last=False)
+    return messages
@@ -16,7 +16,7 @@ import json
 import logging
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 import jsonschema
 
 from google.adk.models.lite_llm import LiteLlm
@@ -24,53 +24,69 @@ from google.adk.agents.llm_agent import LlmAgent
 from google.adk.planners.built_in_planner import BuiltInPlanner
 from google.genai import types
 from google.adk.agents.readonly_context import ReadonlyContext
-from tools import get_store_sales, get_sales_data
+from tools import get_revenue_trend, get_store_sales, get_sales_data
+from user_actions import answer_user_action_without_llm
 from a2ui_toolset import A2uiToolset
-from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_CATALOG_URI_STATE_KEY, A2UI_SCHEMA_STATE_KEY
+from a2ui_session_util import A2UI_ENABLED_STATE_KEY, get_request_a2ui_schema
 from a2ui.a2ui_extension import STANDARD_CATALOG_ID
 
 logger = logging.getLogger(__name__)
 
 RIZZCHARTS_CATALOG_URI = "https://raw.githubusercontent.com/google/A2UI/refs/heads/main/a2a_agents/python/adk/samples/rizzcharts/rizzcharts_catalog_definition.json"
 
+EXAMPLES_DIR = Path(__file__).parent / "examples"
+CATALOG_EXAMPLE_DIRS = {
+    RIZZCHARTS_CATALOG_URI: "rizzcharts_catalog",
+    STANDARD_CATALOG_ID: "standard_catalog",
+}
+
 class rizzchartsAgent:
     """An agent that runs an ecommerce dashboard"""
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
-    
-    @classmethod
-    def get_a2ui_schema(cls, readonly_context: ReadonlyContext) -> dict[str, Any]:
-        a2ui_schema = readonly_context.state.get(A2UI_SCHEMA_STATE_KEY)
-        if not a2ui_schema:
-            raise ValueError("A2UI schema is empty")
-        a2ui_schema_object = {"type": "array", "items": a2ui_schema} # Make a list since we support multiple parts in this tool call
-        return a2ui_schema_object 
 
+    # The instructions only depend on the catalog, so they are built once per catalog uri
+    _instructions_by_catalog_uri: dict[str, str] = {}
+    
     @classmethod
     def load_example(cls, path: str, a2ui_schema: dict[str, Any]) -> dict[str, Any]:
-        example_str = Path(path).read_text()
+        example_str = (EXAMPLES_DIR / path).read_text()
         example_json = json.loads(example_str)
         jsonschema.validate(
             instance=example_json, schema=a2ui_schema
         )
         return example_json
 
+    @classmethod
+    def precompute_instructions(cls, a2ui_schemas_by_catalog_uri: dict[str, dict[str, Any]]):
+        """Builds the instructions for each catalog up front, so no request pays for reading and validating examples."""
+        for catalog_uri, a2ui_schema in a2ui_schemas_by_catalog_uri.items():
+            cls._instructions_by_catalog_uri[catalog_uri] = cls.build_instructions(
+                catalog_uri, {"type": "array", "items": a2ui_schema}
+            )
+
     @classmethod
     def get_instructions(cls, readonly_context: ReadonlyContext) -> str:
         use_ui = readonly_context.state.get(A2UI_ENABLED_STATE_KEY)
         if not use_ui:
             raise ValueError("A2UI must be enabled to run rizzcharts agent")
 
-        a2ui_schema = cls.get_a2ui_schema(readonly_context)
-        catalog_uri = readonly_context.state.get(A2UI_CATALOG_URI_STATE_KEY)
-        if catalog_uri == RIZZCHARTS_CATALOG_URI:
-            map_example = cls.load_example("examples/rizzcharts_catalog/map.json", a2ui_schema)
-            chart_example = cls.load_example("examples/rizzcharts_catalog/chart.json", a2ui_schema)
-        elif catalog_uri == STANDARD_CATALOG_ID:
-            map_example = cls.load_example("examples/standard_catalog/map.json", a2ui_schema)
-            chart_example = cls.load_example("examples/standard_catalog/chart.json", a2ui_schema)
-        else:
+        # Read from the request, since `user:` state is shared with the user's other sessions
+        request_a2ui_schema = get_request_a2ui_schema()
+        catalog_uri = request_a2ui_schema.catalog_uri
+        if (instructions := cls._instructions_by_catalog_uri.get(catalog_uri)) is None:
+            instructions = cls._instructions_by_catalog_uri[catalog_uri] = cls.build_instructions(
+                catalog_uri, {"type": "array", "items": request_a2ui_schema.a2ui_schema} # Make a list since we support multiple parts in this tool call
+            )
+        return instructions
+
+    @classmethod
+    def build_instructions(cls, catalog_uri: Optional[str], a2ui_schema: dict[str, Any]) -> str:
+        """Builds the system instructions for a catalog, validating its examples against the A2UI schema."""
+        if not (examples_dir := CATALOG_EXAMPLE_DIRS.get(catalog_uri)):
             raise ValueError(f"Unsupported catalog uri: {catalog_uri if catalog_uri else 'None'}")
+        map_example = cls.load_example(f"{examples_dir}/map.json", a2ui_schema)
+        chart_example = cls.load_example(f"{examples_dir}/chart.json", a2ui_schema)
 
         final_prompt = f"""
 ### System Instructions
@@ -104,6 +120,8 @@ Your task is to analyze the user's request, fetch the necessary data, select the
 2.  **Fetch Data:** Select and use the appropriate tool to retrieve the necessary data.
     * Use **`get_sales_data`** for general sales, revenue, and product category trends (typically for Charts).
     * Use **`get_store_sales`** for regional performance, store locations, and geospatial outliers (typically for Maps).
+    * Use **`get_revenue_trend`** for revenue over time, such as trends by day or month. To zoom in on part of a trend, call it again with `start_date` and `end_date`.
+    * Pass the time period (e.g. "Q3 2025", "last month") and region the user asked about as the `period` and `region` arguments. Leave them unset if the user didn't specify them.
 
 3.  **Select Example:** Based on the intent, choose the correct example block to use as your template.
     * **Intent** (Chart/Data Viz) -> Use `---BEGIN CHART EXAMPLE---`.
@@ -113,6 +131,9 @@ Your task is to analyze the user's request, fetch the necessary data, select the
     * Use the **entire** JSON array from the chosen example as the base value for the `a2ui_json` argument.
     * **Generate a new `surfaceId`:** You MUST generate a new, unique `surfaceId` for this request (e.g., `sales_breakdown_q3_surface`, `regional_outliers_northeast_surface`). This new ID must be used for the `surfaceId` in all three messages within the JSON array (`beginRendering`, `surfaceUpdate`, `dataModelUpdate`).
     * **Update the title Text:** You MUST update the `literalString` value for the `Text` component (the component with `id: "page_header"`) to accurately reflect the specific user query. For example, if the user asks for "Q3" sales, update the generic template text to "Q3 2025 Sales by Product Category".
+    * **Trends:** If the chart example uses the `Chart` component, set its `type` to `line`. Use the `trend` points from `get_revenue_trend` as the chart items, without `drillDown`.
+    * **Chart items:** Add every category returned by `get_sales_data` to the chart items, and copy its `drillDownId` if it has one. Pass `include_drill_down` only if the user asks to see the subcategories up front.
+    * **Map locations:** Add every location returned by `get_store_sales` to `mapConfig.locations`. Use its `outlier_reason` as the `description`, and copy its `clusterId` if it has one. Pass `include_all_stores` only if the user asks to see all stores, not just outliers.
     * Ensure the generated JSON perfectly matches the A2UI specification. It will be validated against the json_schema and rejected if it does not conform.  
     * If you get an error in the tool response apologize to the user and let them know they should try again.
 
@@ -127,7 +148,7 @@ Your task is to analyze the user's request, fetch the necessary data, select the
 ---END MAP EXAMPLE---
 """
         
-        logger.info(f"Generated system instructions for A2UI {'ENABLED' if use_ui else 'DISABLED'} and catalog {catalog_uri}")
+        logger.info(f"Generated system instructions for catalog {catalog_uri}")
 
         return final_prompt
 
@@ -141,12 +162,13 @@ Your task is to analyze the user's request, fetch the necessary data, select the
             name="rizzcharts_agent",
             description="An agent that lets sales managers request sales data.",
             instruction=cls.get_instructions,
-            tools=[get_store_sales, get_sales_data, A2uiToolset()],
+            tools=[get_store_sales, get_sales_data, get_revenue_trend, A2uiToolset()],
             planner=BuiltInPlanner(
                 thinking_config=types.ThinkingConfig(
                     include_thoughts=True,
                 )
             ),
             disallow_transfer_to_peers=True,
+            before_model_callback=answer_user_action_without_llm,
 
         )
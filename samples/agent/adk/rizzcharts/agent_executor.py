@@ -33,15 +33,17 @@ from a2ui.a2ui_extension import A2UI_EXTENSION_URI, get_a2ui_agent_extension, tr
 from component_catalog_builder import ComponentCatalogBuilder
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 from a2a.types import AgentExtension
-from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_CATALOG_URI_STATE_KEY, A2UI_SCHEMA_STATE_KEY
+from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_CATALOG_URI_STATE_KEY
 from agent import RIZZCHARTS_CATALOG_URI
-from a2ui.a2ui_extension import STANDARD_CATALOG_ID
+from a2ui.a2ui_extension import STANDARD_CATALOG_ID, SUPPORTED_CATALOG_IDS_KEY
+from a2ui.log_utils import PAYLOAD_LOG_CATEGORY, Truncated, get_category_logger
 
 from agent import rizzchartsAgent
 import part_converter
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
+payload_logger = get_category_logger(PAYLOAD_LOG_CATEGORY)
 
 
 class RizzchartsAgentExecutor(A2aAgentExecutor):
@@ -60,6 +62,10 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
             },
             default_catalog_uri=STANDARD_CATALOG_ID
         )
+        rizzchartsAgent.precompute_instructions({
+            catalog_uri: self._component_catalog_builder.load_a2ui_schema({SUPPORTED_CATALOG_IDS_KEY: [catalog_uri]})[0]
+            for catalog_uri in (RIZZCHARTS_CATALOG_URI, STANDARD_CATALOG_ID)
+        })
         agent = rizzchartsAgent.build_agent()
         runner = Runner(
             app_name=agent.name,
@@ -70,7 +76,8 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
         )
         self._part_converter = part_converter.A2uiPartConverter()
         config = A2aAgentExecutorConfig(
-            gen_ai_part_converter=self._part_converter.convert_genai_part_to_a2a_part
+            gen_ai_part_converter=self._part_converter.convert_genai_part_to_a2a_part,
+            a2a_part_converter=self._part_converter.convert_a2a_part_to_genai_part,
         )
         super().__init__(runner=runner, config=config)
 
@@ -84,7 +91,7 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
             default_output_modes=rizzchartsAgent.SUPPORTED_CONTENT_TYPES,
             capabilities=AgentCapabilities(
                 streaming=True,
-                extensions=[get_a2ui_agent_extension()],
+                extensions=[get_a2ui_agent_extension(supported_catalog_ids=[RIZZCHARTS_CATALOG_URI, STANDARD_CATALOG_ID])],
             ),
             skills=[
                 AgentSkill(
@@ -117,7 +124,7 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
         run_request: AgentRunRequest,
         runner: Runner,
     ):
-        logger.info(f"Loading session for message {context.message}")
+        payload_logger.debug("Loading session for message %s", Truncated(context.message))
 
         session = await super()._prepare_session(context, run_request, runner)
 
@@ -126,9 +133,9 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
                 
         use_ui = try_activate_a2ui_extension(context)
         if use_ui:
-            a2ui_schema, catalog_uri = self._component_catalog_builder.load_a2ui_schema(client_ui_capabilities=context.message.metadata.get(A2UI_CLIENT_CAPABILITIES_KEY) if context.message and context.message.metadata else None)
+            a2ui_schema, catalog_uri, a2ui_schema_fingerprint = self._component_catalog_builder.load_a2ui_schema(client_ui_capabilities=context.message.metadata.get(A2UI_CLIENT_CAPABILITIES_KEY) if context.message and context.message.metadata else None)
 
-            self._part_converter.set_a2ui_schema(a2ui_schema)
+            self._part_converter.set_a2ui_schema(a2ui_schema, a2ui_schema_fingerprint, catalog_uri)
         
             await runner.session_service.append_event(
                 session,
@@ -138,7 +145,6 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
                     actions=EventActions(
                         state_delta={
                             A2UI_ENABLED_STATE_KEY: use_ui,
-                            A2UI_SCHEMA_STATE_KEY: a2ui_schema,
                             A2UI_CATALOG_URI_STATE_KEY: catalog_uri,
                         }
                     ),
@@ -15,28 +15,37 @@
 from functools import cache
 from typing import Any, List, Optional
 from pathlib import Path
+import hashlib
 import json
 import logging
 from agent import RIZZCHARTS_CATALOG_URI
 from a2ui.a2ui_extension import STANDARD_CATALOG_ID, SUPPORTED_CATALOG_IDS_KEY, INLINE_CATALOGS_KEY
+from a2ui_session_util import intern_a2ui_schema
 logger = logging.getLogger(__name__)
 
 
+def get_a2ui_schema_fingerprint(a2ui_schema: dict[str, Any]) -> str:
+    """Returns a short hash that identifies an A2UI schema by its content."""
+    canonical_json = json.dumps(a2ui_schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()[:16]
+
+
 class ComponentCatalogBuilder:
     def __init__(self, a2ui_schema_path: str, uri_to_local_catalog_path: dict[str, str], default_catalog_uri: Optional[str]):
         self._a2ui_schema_path = a2ui_schema_path
         self._uri_to_local_catalog_path = uri_to_local_catalog_path
         self._default_catalog_uri = default_catalog_uri
-        pass
+        # Schemas merged with a local catalog are the same for every request
+        self._schemas_by_catalog_uri: dict[str, tuple[dict[str, Any], str]] = {}
 
     @cache
     def get_file_content(self, path: str) -> str:
         return Path(path).read_text()
 
-    def load_a2ui_schema(self, client_ui_capabilities: Optional[dict[str, Any]]) -> tuple[dict[str, Any], Optional[str]]:
+    def load_a2ui_schema(self, client_ui_capabilities: Optional[dict[str, Any]]) -> tuple[dict[str, Any], Optional[str], str]:
         """
         Returns:
-            A tuple of the a2ui_schema and the catalog uri
+            A tuple of the a2ui_schema, the catalog uri and the schema fingerprint
         """
         try: 
             logger.info(f"Loading A2UI client capabilities {client_ui_capabilities}")
@@ -60,6 +69,9 @@ class ComponentCatalogBuilder:
             
             if catalog_uri and inline_catalog_str:
                 raise ValueError(f"Cannot set both {SUPPORTED_CATALOG_IDS_KEY} and {INLINE_CATALOGS_KEY} in ClientUiCapabilities: {client_ui_capabilities}")    
+            elif catalog_uri in self._schemas_by_catalog_uri:
+                a2ui_schema_json, fingerprint = self._schemas_by_catalog_uri[catalog_uri]
+                return a2ui_schema_json, catalog_uri, fingerprint
             elif catalog_uri:
                 if local_path := self._uri_to_local_catalog_path.get(catalog_uri):
                     logger.info(f"Loading local component catalog with uri {catalog_uri} and local path {local_path}")
@@ -78,8 +90,13 @@ class ComponentCatalogBuilder:
             a2ui_schema_json = json.loads(a2ui_schema)
 
             a2ui_schema_json["properties"]["surfaceUpdate"]["properties"]["components"]["items"]["properties"]["component"]["properties"] = catalog_json
-            
-            return a2ui_schema_json, catalog_uri
+
+            fingerprint = get_a2ui_schema_fingerprint(a2ui_schema_json)
+            # Clients sending the same inline catalog share one copy of the schema
+            a2ui_schema_json = intern_a2ui_schema(a2ui_schema_json, fingerprint)
+            if catalog_uri:
+                self._schemas_by_catalog_uri[catalog_uri] = (a2ui_schema_json, fingerprint)
+            return a2ui_schema_json, catalog_uri, fingerprint
     
         except Exception as e:
             logger.error(f"Failed to a2ui schema with client ui capabilities {client_ui_capabilities}: {e}")
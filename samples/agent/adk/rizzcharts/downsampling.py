@@ -0,0 +1,85 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+DOWNSAMPLING_METHODS = ("lttb", "min_max")
+
+
+def lttb(y: np.ndarray, target_points: int) -> np.ndarray:
+    """Picks the points of an evenly spaced series that best keep its visual shape.
+
+    Implements Largest-Triangle-Three-Buckets (Steinarsson, 2013). The first
+    and last points are always kept. Every bucket in between contributes the
+    point that forms the largest triangle with the point kept from the bucket
+    before and the average of the bucket after.
+
+    Returns:
+        The sorted indices of the kept points.
+    """
+    num_points = len(y)
+    if target_points >= num_points:
+        return np.arange(num_points)
+    if target_points < 3:
+        raise ValueError("LTTB needs at least 3 target points")
+
+    x = np.arange(num_points, dtype=np.float64)
+    # Bucket boundaries for the points between the first and the last
+    edges = np.linspace(1, num_points - 1, target_points - 1).astype(np.int64)
+    bucket_sums = np.add.reduceat(y[1:num_points - 1], edges[:-1] - 1)
+    bucket_means = np.append(bucket_sums / np.diff(edges), y[-1])
+    bucket_mean_x = np.append((edges[:-1] + edges[1:] - 1) / 2, num_points - 1)
+
+    kept = np.empty(target_points, dtype=np.int64)
+    kept[0], kept[-1] = 0, num_points - 1
+    previous = 0
+    for bucket in range(target_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Twice the triangle areas for all candidates of the bucket at once
+        areas = np.abs(
+            (x[previous] - bucket_mean_x[bucket + 1]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (bucket_means[bucket + 1] - y[previous])
+        )
+        previous = kept[bucket + 1] = start + int(np.argmax(areas))
+    return kept
+
+
+def min_max(y: np.ndarray, target_points: int) -> np.ndarray:
+    """Keeps the minimum and the maximum of each bucket, so that no peak or dip is lost.
+
+    Returns:
+        The sorted indices of the kept points.
+    """
+    num_points = len(y)
+    num_buckets = target_points // 2
+    if target_points >= num_points:
+        return np.arange(num_points)
+    if num_buckets < 1:
+        raise ValueError("Min-max downsampling needs at least 2 target points")
+
+    edges = np.linspace(0, num_points, num_buckets + 1).astype(np.int64)
+    bucket_of_point = np.repeat(np.arange(num_buckets), np.diff(edges))
+    # Sorting by bucket and then value puts each bucket's minimum first and maximum last
+    order = np.lexsort((y, bucket_of_point))
+    kept = np.concatenate((order[edges[:-1]], order[edges[1:] - 1]))
+    return np.unique(kept)
+
+
+def downsample(y: np.ndarray, target_points: int, method: str = "lttb") -> np.ndarray:
+    """Returns the sorted indices of at most target_points points of a series that keep its shape."""
+    if method == "lttb":
+        return lttb(y, target_points)
+    if method == "min_max":
+        return min_max(y, target_points)
+    raise ValueError(f"Unsupported downsampling method '{method}'. Use one of {', '.join(DOWNSAMPLING_METHODS)}.")
@@ -0,0 +1,86 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+# Map tiles are 256 pixels wide at every zoom level
+_TILE_PIXELS = 256
+# Size of the map in the rizzcharts client, used to work out which locations are in view
+VIEWPORT_WIDTH_PIXELS = 800
+VIEWPORT_HEIGHT_PIXELS = 500
+# Locations closer than this on screen are merged into one cluster marker
+DEFAULT_CELL_PIXELS = 64
+MAX_ZOOM = 18
+
+
+def get_degrees_per_pixel(zoom: int) -> float:
+    return 360 / (_TILE_PIXELS * 2**zoom)
+
+
+def get_zoom_to_fit(lat: np.ndarray, lng: np.ndarray) -> int:
+    """Returns the largest zoom level at which all the locations fit in the viewport."""
+    if len(lat) < 2:
+        return 12
+    lat_span = max(float(np.ptp(lat)), 1e-6)
+    lng_span = max(float(np.ptp(lng)), 1e-6)
+    zoom = min(
+        math.log2(360 * VIEWPORT_WIDTH_PIXELS / (_TILE_PIXELS * lng_span)),
+        math.log2(360 * VIEWPORT_HEIGHT_PIXELS / (_TILE_PIXELS * lat_span)),
+    )
+    return int(min(max(math.floor(zoom), 2), MAX_ZOOM))
+
+
+def get_in_viewport(lat: np.ndarray, lng: np.ndarray, center_lat: float, center_lng: float, zoom: int) -> np.ndarray:
+    """Returns a mask of the locations shown on a map with the given center and zoom."""
+    degrees_per_pixel = get_degrees_per_pixel(zoom)
+    return (np.abs(lat - center_lat) <= degrees_per_pixel * VIEWPORT_HEIGHT_PIXELS / 2) & (
+        np.abs(lng - center_lng) <= degrees_per_pixel * VIEWPORT_WIDTH_PIXELS / 2
+    )
+
+
+@dataclass
+class GridClusters:
+    """Locations grouped by the grid cell they fall in. Arrays are indexed by cluster."""
+
+    # The cluster of each location
+    cluster_of_location: np.ndarray
+    count: np.ndarray
+    # Centroid of the locations in the cluster
+    lat: np.ndarray
+    lng: np.ndarray
+
+
+def cluster_locations(
+    lat: np.ndarray, lng: np.ndarray, zoom: int, cell_pixels: int = DEFAULT_CELL_PIXELS
+) -> GridClusters:
+    """Groups locations into square grid cells of cell_pixels on a map at the given zoom.
+
+    Each cell becomes one cluster placed at the centroid of its locations, so
+    the number of markers is bounded by the number of cells in view instead of
+    the number of locations.
+    """
+    cell_degrees = get_degrees_per_pixel(zoom) * cell_pixels
+    row = np.floor((np.asarray(lat) + 90) / cell_degrees).astype(np.int64)
+    col = np.floor((np.asarray(lng) + 180) / cell_degrees).astype(np.int64)
+    num_cols = int(math.ceil(360 / cell_degrees)) + 1
+    _, cluster_of_location, count = np.unique(row * num_cols + col, return_inverse=True, return_counts=True)
+    return GridClusters(
+        cluster_of_location=cluster_of_location,
+        count=count,
+        lat=np.bincount(cluster_of_location, weights=lat, minlength=len(count)) / count,
+        lng=np.bincount(cluster_of_location, weights=lng, minlength=len(count)) / count,
+    )
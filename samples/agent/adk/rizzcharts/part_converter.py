@@ -12,70 +12,92 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextvars
 import json
-import jsonschema
 import logging
-from typing import Any, List
+from typing import Any, List, Optional
 
 from a2a import types as a2a_types
 from google.genai import types as genai_types
 
 from google.adk.a2a.converters import part_converter
-from a2ui.a2ui_extension import create_a2ui_part
+from a2ui.a2ui_extension import create_a2ui_part, is_a2ui_part
+from a2ui.log_utils import PAYLOAD_LOG_CATEGORY, Truncated, get_category_logger
+from a2ui_session_util import get_request_a2ui_schema, set_request_a2ui_schema
 from a2ui_toolset import SendA2uiJsonToClientTool
+from a2ui_validation import parse_and_validate_a2ui_json
 
 logger = logging.getLogger(__name__)
+payload_logger = get_category_logger(PAYLOAD_LOG_CATEGORY)
+
+# The a2ui_json of send_a2ui_json_to_client calls of the request being handled, keyed
+# by function call id, until the tool has validated them
+_pending_a2ui_json_context: contextvars.ContextVar[Optional[dict[str, str]]] = contextvars.ContextVar(
+    "pending_a2ui_json", default=None
+)
 
 class A2uiPartConverter:
 
-  def __init__(self):
-      self._a2ui_schema = None
+  def set_a2ui_schema(self, a2ui_schema: dict[str, Any], a2ui_schema_fingerprint: str, catalog_uri: Optional[str]):
+      """Sets the A2UI schema of the current request, for the converter, the A2UI tool and the instructions.
 
-  def set_a2ui_schema(self, a2ui_schema: dict[str, Any]):
-      self._a2ui_schema = a2ui_schema    
+      Must be called from the task that runs the agent, e.g. from _prepare_session.
+      """
+      set_request_a2ui_schema(a2ui_schema, a2ui_schema_fingerprint, catalog_uri)
+      _pending_a2ui_json_context.set({})
       
+  def convert_a2a_part_to_genai_part(self, a2a_part: a2a_types.Part) -> Optional[genai_types.Part]:
+      # Pass A2UI client events as their JSON text, so that callbacks can recognize userActions
+      if is_a2ui_part(a2a_part) and "userAction" in a2a_part.root.data:
+          return genai_types.Part(text=json.dumps(a2a_part.root.data))
+
+      return part_converter.convert_a2a_part_to_genai_part(a2a_part)
+
   def convert_genai_part_to_a2a_part(self, part: genai_types.Part) -> List[a2a_types.Part]:
+      # A2UI is sent to the client once the tool has validated it, see _convert_a2ui_function_response
       if (function_call := part.function_call) and function_call.name == SendA2uiJsonToClientTool.TOOL_NAME:
-          if self._a2ui_schema is None:
+          if (pending_a2ui_json := _pending_a2ui_json_context.get()) is None:
               raise Exception("A2UI schema is not set in part converter")
-          
-          try:
-            a2ui_json = function_call.args.get(SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME)
-            if a2ui_json is None:
-                raise ValueError(f"Failed to convert A2UI function call because required arg {SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME} not found in {str(part)}")
-            if not a2ui_json.strip():
-                logger.info("Empty a2ui_json, skipping")
-                return []
-            
-            logger.info(f"Converting a2ui json: {a2ui_json}")
-
-            json_data = json.loads(a2ui_json)            
-            a2ui_schema_object = {"type": "array", "items": self._a2ui_schema} # Make a list since we support multiple parts in this tool call
-            jsonschema.validate(
-                  instance=json_data, schema=a2ui_schema_object
-              )          
-
-            final_parts = []
-            if isinstance(json_data, list):
-                logger.info( f"Found {len(json_data)} messages. Creating individual DataParts." )
-                for message in json_data:
-                  final_parts.append(create_a2ui_part(message))
-            else:
-                # Handle the case where a single JSON object is returned
-                logger.info("Received a single JSON object. Creating a DataPart." )
-                final_parts.append(create_a2ui_part(json_data))
-
-            return final_parts
-          except Exception as e:
-              logger.error(f"Error converting A2UI function call to A2A parts: {str(e)}")
-              return []
-          
-      # Don't send a2ui tool responses
-      elif (function_response := part.function_response) and function_response.name == SendA2uiJsonToClientTool.TOOL_NAME:    
+          a2ui_json = function_call.args.get(SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME)
+          if a2ui_json is None:
+              logger.error(f"Failed to convert A2UI function call because required arg {SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME} not found in {str(part)}")
+          elif not a2ui_json.strip():
+              logger.info("Empty a2ui_json, skipping")
+          else:
+              pending_a2ui_json[function_call.id or ""] = a2ui_json
           return []
+
+      elif (function_response := part.function_response) and function_response.name == SendA2uiJsonToClientTool.TOOL_NAME:    
+          return self._convert_a2ui_function_response(function_response)
       
       # Use default part converter for other types (images, etc)
       converted_part = part_converter.convert_genai_part_to_a2a_part(part)
 
-      logger.info(f"Returning converted part: {converted_part}" )
+      payload_logger.debug("Returning converted part: %s", Truncated(converted_part))
       return [converted_part] if converted_part else []
+
+  def _convert_a2ui_function_response(self, function_response: genai_types.FunctionResponse) -> List[a2a_types.Part]:
+      """Converts the A2UI JSON of a send_a2ui_json_to_client call into A2A parts once the tool has run.
+
+      The tool response itself isn't sent. Payloads the tool rejected aren't sent
+      either, since the model is told about the error and sends a corrected one.
+      """
+      a2ui_json = (_pending_a2ui_json_context.get() or {}).pop(function_response.id or "", None)
+      if a2ui_json is None:
+          return []
+      if (function_response.response or {}).get("error"):
+          logger.info("Not sending A2UI JSON rejected by the tool")
+          return []
+
+      try:
+        payload_logger.debug("Converting a2ui json: %s", Truncated(a2ui_json))
+
+        # The tool already validated this payload, so this reuses its parsed messages
+        request_a2ui_schema = get_request_a2ui_schema()
+        json_data = parse_and_validate_a2ui_json(a2ui_json, request_a2ui_schema.a2ui_schema, request_a2ui_schema.fingerprint)
+
+        logger.info( f"Found {len(json_data)} messages. Creating individual DataParts." )
+        return [create_a2ui_part(message) for message in json_data]
+      except Exception as e:
+          logger.error(f"Error converting A2UI function call to A2A parts: {str(e)}")
+          return []
@@ -0,0 +1,585 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Columns of the order rows in a CSV or Parquet sales file. Every row repeats the attributes of its store.
+SALES_DATA_COLUMNS = ["order_date", "store_id", "store_name", "region", "lat", "lng", "category", "subcategory", "revenue"]
+
+# Numeric columns cached as .npy files next to the sales file and memory-mapped on load
+_CACHED_COLUMNS = ["day", "store", "drill_down", "revenue", "store_region", "store_lat", "store_lng"]
+_CACHE_META_FILE = "meta.json"
+_CACHE_VERSION = 2
+
+_MONTH_NAMES = ["january", "february", "march", "april", "may", "june", "july", "august", "september", "october", "november", "december"]
+_QUARTER_RE = re.compile(r"^q([1-4])(?:\s+(\d{4}))?$")
+_MONTH_NAME_RE = re.compile(r"^([a-z]+)(?:\s+(\d{4}))?$")
+_YEAR_MONTH_RE = re.compile(r"^(\d{4})-(\d{1,2})$")
+_YEAR_RE = re.compile(r"^(\d{4})$")
+
+
+def _month_index(year: int, month: int) -> int:
+    """Returns the number of months since January 1970, the unit of numpy datetime64[M]."""
+    return (year - 1970) * 12 + month - 1
+
+
+def _month_label(month_index: int) -> str:
+    return str(np.datetime64(month_index, "M"))
+
+
+# Robust z-scores above this are flagged as outliers, as suggested by Iglewicz and Hoaglin
+DEFAULT_OUTLIER_THRESHOLD = 3.5
+# Scales the MAD so that robust z-scores match z-scores for normally distributed values
+_MAD_TO_STANDARD_DEVIATION = 0.6745
+
+OUTLIER_BASELINES = ("region", "previous_period")
+
+# The stores of the generated demo data, by region: the center of the region and
+# the named stores, with their location, revenue multiplier and count of other stores
+_DEMO_REGIONS = {
+    "West": (
+        (34.05, -118.24),
+        [
+            ("Santa Monica Branch", 34.0195, -118.4912, 1.8),
+            ("Downtown Flagship", 34.0488, -118.2518, 1.0),
+            ("Hollywood Boulevard Store", 34.1016, -118.3287, 1.0),
+            ("Pasadena Location", 34.1478, -118.1445, 1.0),
+            ("Long Beach Outlet", 33.7701, -118.1937, 1.0),
+            ("Beverly Hills Boutique", 34.0736, -118.4004, 1.0),
+        ],
+        6,
+    ),
+    "Northeast": ((40.71, -74.0), [("Brooklyn Heights Store", 40.6959, -73.9956, 0.4)], 11),
+    "South": ((33.75, -84.39), [], 12),
+    "Midwest": ((41.88, -87.63), [], 12),
+}
+# Categories with the weights of their subcategories. A category with one subcategory has no drill down.
+_DEMO_CATEGORIES = {
+    "Apparel": {"Tops": 31, "Bottoms": 38, "Outerwear": 20, "Footwear": 11},
+    "Home Goods": {"Pillow": 8, "Coffee Maker": 16, "Area Rug": 3, "Bath Towels": 14},
+    "Electronics": {"Phones": 25, "Laptops": 27, "TVs": 21, "Other": 27},
+    "Health & Beauty": {"Health & Beauty": 1},
+    "Other": {"Other": 1},
+}
+_DEMO_CATEGORY_WEIGHTS = {"Apparel": 41, "Home Goods": 15, "Electronics": 28, "Health & Beauty": 10, "Other": 6}
+
+
+def grouped_median(values: np.ndarray, groups: np.ndarray, num_groups: int) -> np.ndarray:
+    """Returns the median of the values in each group, or NaN for empty groups, without a Python loop over groups."""
+    counts = np.bincount(groups, minlength=num_groups)
+    median = np.full(num_groups, np.nan)
+    if len(values) == 0:
+        return median
+    sorted_values = values[np.lexsort((values, groups))]
+    starts = np.cumsum(counts) - counts
+    non_empty = counts > 0
+    lower = sorted_values[(starts + (counts - 1) // 2)[non_empty]]
+    upper = sorted_values[(starts + counts // 2)[non_empty]]
+    median[non_empty] = (lower + upper) / 2
+    return median
+
+
+def robust_z_scores(values: np.ndarray, groups: np.ndarray, num_groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """Scores each value by its deviation from the median of its group, in units of the group's scaled MAD.
+
+    Returns:
+        The robust z-scores, which are 0 in groups whose MAD is 0, and the median of each group.
+    """
+    median = grouped_median(values, groups, num_groups)
+    deviation = values - median[groups]
+    mad = grouped_median(np.abs(deviation), groups, num_groups)[groups]
+    z_scores = np.zeros(len(values))
+    np.divide(_MAD_TO_STANDARD_DEVIATION * deviation, mad, out=z_scores, where=mad > 0)
+    return z_scores, median
+
+
+class SalesStore:
+    """Columnar store of order rows with precomputed rollups for the rizzcharts tools.
+
+    Order rows are dictionary encoded into NumPy columns and summed once into
+    revenue cubes by month, region and category/subcategory, by month and
+    store, and by day, region and category. Queries only slice and sum the
+    cubes, so they take the same few milliseconds no matter how many orders
+    were loaded.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray], meta: dict[str, Any]):
+        self._region_labels: list[str] = meta["region_labels"]
+        self._category_labels: list[str] = meta["category_labels"]
+        self._drill_down_labels: list[str] = meta["drill_down_labels"]
+        self._store_names: list[str] = meta["store_names"]
+        self._drill_down_category = np.asarray(meta["drill_down_category"], dtype=np.int32)
+        self._store_region = np.asarray(columns["store_region"])
+        self._store_lat = np.asarray(columns["store_lat"])
+        self._store_lng = np.asarray(columns["store_lng"])
+
+        day = columns["day"]
+        month = day.astype("datetime64[D]").astype("datetime64[M]").astype(np.int32)
+        self._first_month = int(month.min())
+        self._last_month = int(month.max())
+        month_offset = month - self._first_month
+        num_months = self._last_month - self._first_month + 1
+        num_regions = len(self._region_labels)
+        num_drill_downs = len(self._drill_down_labels)
+        num_stores = len(self._store_names)
+        revenue = columns["revenue"]
+        region = self._store_region[columns["store"]]
+
+        # [month, region, category/subcategory]
+        self._drill_down_cube = np.bincount(
+            (month_offset * num_regions + region) * num_drill_downs + columns["drill_down"],
+            weights=revenue,
+            minlength=num_months * num_regions * num_drill_downs,
+        ).reshape(num_months, num_regions, num_drill_downs)
+        # [month, region, category], rolled up from the subcategories
+        category_one_hot = np.zeros((num_drill_downs, len(self._category_labels)))
+        category_one_hot[np.arange(num_drill_downs), self._drill_down_category] = 1
+        self._category_cube = self._drill_down_cube @ category_one_hot
+        # [month, store]
+        self._store_cube = np.bincount(
+            month_offset * num_stores + columns["store"],
+            weights=revenue,
+            minlength=num_months * num_stores,
+        ).reshape(num_months, num_stores)
+        # [day, region, category], kept at full resolution for revenue trends
+        self._first_day = int(day.min())
+        num_days = int(day.max()) - self._first_day + 1
+        num_categories = len(self._category_labels)
+        self._daily_category_cube = np.bincount(
+            ((day - self._first_day) * num_regions + region) * num_categories + self._drill_down_category[columns["drill_down"]],
+            weights=revenue,
+            minlength=num_days * num_regions * num_categories,
+        ).reshape(num_days, num_regions, num_categories)
+
+        logger.info(
+            f"Loaded {len(revenue)} orders for {num_stores} stores from {_month_label(self._first_month)} to {_month_label(self._last_month)}"
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "SalesStore":
+        """Loads order rows from a CSV or Parquet file.
+
+        The first load encodes the file into a `<path>.npcache` directory of
+        .npy columns. Later loads memory-map those columns instead of parsing
+        the file again, until the file changes.
+        """
+        source = Path(path)
+        cache_dir = source.with_name(f"{source.name}.npcache")
+        source_stat = source.stat()
+        source_version = [_CACHE_VERSION, source_stat.st_size, source_stat.st_mtime_ns]
+
+        meta_path = cache_dir / _CACHE_META_FILE
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else None
+        if not meta or meta.get("source_version") != source_version:
+            logger.info(f"Encoding sales data {source} into {cache_dir}")
+            columns, meta = cls._encode(cls._read_columns(source))
+            meta["source_version"] = source_version
+            cache_dir.mkdir(exist_ok=True)
+            for name in _CACHED_COLUMNS:
+                np.save(cache_dir / f"{name}.npy", columns[name])
+            meta_path.write_text(json.dumps(meta))
+
+        columns = {name: np.load(cache_dir / f"{name}.npy", mmap_mode="r") for name in _CACHED_COLUMNS}
+        return cls(columns, meta)
+
+    @classmethod
+    def demo(cls, seed: int = 0) -> "SalesStore":
+        """Generates two years of daily orders for the demo stores, the same for every seed.
+
+        Revenue grows over time, peaks on weekends and in December, and a few
+        stores sell far more or less than the others in their region, so that
+        every tool has something to show without a sales data file.
+        """
+        rng = np.random.default_rng(seed)
+        store_ids, store_names, store_regions, store_lat, store_lng, store_multiplier = [], [], [], [], [], []
+        for region, ((center_lat, center_lng), named_stores, other_store_count) in _DEMO_REGIONS.items():
+            other_stores = [
+                (f"{region} Store {n}", center_lat + rng.uniform(-0.3, 0.3), center_lng + rng.uniform(-0.4, 0.4), 1.0)
+                for n in range(1, other_store_count + 1)
+            ]
+            for name, lat, lng, multiplier in named_stores + other_stores:
+                store_ids.append(f"S{len(store_ids) + 1}")
+                store_names.append(name)
+                store_regions.append(region)
+                store_lat.append(lat)
+                store_lng.append(lng)
+                store_multiplier.append(multiplier * rng.lognormal(0, 0.05))
+
+        days = np.arange(np.datetime64("2024-01-01"), np.datetime64("2026-01-01"))
+        day_of_year = (days - days.astype("datetime64[Y]")).astype(np.int64)
+        seasonality = (
+            (1 + 0.3 * np.arange(len(days)) / len(days))
+            * np.where((days.astype(np.int64) + 3) % 7 >= 5, 1.4, 1.0)
+            * (1 + 0.25 * np.exp(-(((day_of_year - 350) / 12.0) ** 2)))
+        )
+        # Orders per store and day
+        order_counts = rng.poisson(4 * np.outer(seasonality, store_multiplier))
+        order_day = np.repeat(np.tile(np.arange(len(days)), (len(store_ids), 1)).T.ravel(), order_counts.ravel())
+        order_store = np.repeat(np.tile(np.arange(len(store_ids)), len(days)), order_counts.ravel())
+
+        drill_downs = [
+            (category, subcategory, _DEMO_CATEGORY_WEIGHTS[category] * weight / sum(subcategories.values()))
+            for category, subcategories in _DEMO_CATEGORIES.items()
+            for subcategory, weight in subcategories.items()
+        ]
+        drill_down_weights = np.array([weight for _, _, weight in drill_downs])
+        order_drill_down = rng.choice(len(drill_downs), size=len(order_day), p=drill_down_weights / drill_down_weights.sum())
+
+        columns, meta = cls._encode({
+            "order_date": days[order_day],
+            "store_id": np.array(store_ids)[order_store],
+            "store_name": np.array(store_names)[order_store],
+            "region": np.array(store_regions)[order_store],
+            "lat": np.array(store_lat)[order_store],
+            "lng": np.array(store_lng)[order_store],
+            "category": np.array([category for category, _, _ in drill_downs])[order_drill_down],
+            "subcategory": np.array([subcategory for _, subcategory, _ in drill_downs])[order_drill_down],
+            "revenue": np.round(rng.lognormal(3.5, 0.6, size=len(order_day)), 2),
+        })
+        return cls(columns, meta)
+
+    @staticmethod
+    def _read_columns(source: Path) -> dict[str, np.ndarray]:
+        if source.suffix == ".parquet":
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Reading Parquet sales data requires pyarrow: pip install pyarrow") from e
+            table = pq.read_table(source, columns=SALES_DATA_COLUMNS)
+            return {name: table.column(name).to_numpy() for name in SALES_DATA_COLUMNS}
+
+        with source.open(newline="") as f:
+            reader = csv.DictReader(f)
+            if missing_columns := set(SALES_DATA_COLUMNS) - set(reader.fieldnames or []):
+                raise ValueError(f"Sales data {source} is missing columns {sorted(missing_columns)}")
+            values: dict[str, list[str]] = {name: [] for name in SALES_DATA_COLUMNS}
+            for row in reader:
+                for name in SALES_DATA_COLUMNS:
+                    values[name].append(row[name])
+        return {name: np.array(column_values) for name, column_values in values.items()}
+
+    @staticmethod
+    def _encode(raw_columns: dict[str, np.ndarray]) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+        """Dictionary encodes the raw order columns into the numeric columns of the cache."""
+        store_ids, store_first_row, store = np.unique(
+            raw_columns["store_id"].astype(str), return_index=True, return_inverse=True
+        )
+        region_labels, store_region = np.unique(
+            raw_columns["region"].astype(str)[store_first_row], return_inverse=True
+        )
+        category_labels, category = np.unique(raw_columns["category"].astype(str), return_inverse=True)
+        subcategory_labels, subcategory = np.unique(raw_columns["subcategory"].astype(str), return_inverse=True)
+        # The same subcategory label can appear under several categories, so drill downs are category/subcategory pairs
+        drill_down_keys, drill_down = np.unique(
+            category.astype(np.int64) * len(subcategory_labels) + subcategory, return_inverse=True
+        )
+
+        columns = {
+            "day": np.asarray(raw_columns["order_date"], dtype="datetime64[D]").astype(np.int32),
+            "store": store.astype(np.int32),
+            "drill_down": drill_down.astype(np.int32),
+            "revenue": raw_columns["revenue"].astype(np.float64),
+            "store_region": store_region.astype(np.int32),
+            "store_lat": raw_columns["lat"].astype(np.float64)[store_first_row],
+            "store_lng": raw_columns["lng"].astype(np.float64)[store_first_row],
+        }
+        meta = {
+            "region_labels": region_labels.tolist(),
+            "category_labels": category_labels.tolist(),
+            "drill_down_labels": subcategory_labels[drill_down_keys % len(subcategory_labels)].tolist(),
+            "drill_down_category": (drill_down_keys // len(subcategory_labels)).tolist(),
+            "store_ids": store_ids.tolist(),
+            "store_names": raw_columns["store_name"].astype(str)[store_first_row].tolist(),
+        }
+        return columns, meta
+
+    @property
+    def region_labels(self) -> list[str]:
+        return self._region_labels
+
+    def resolve_period(self, period: Optional[str]) -> tuple[int, int, str]:
+        """Resolves a period such as "Q3 2025", "2025-07", "July", "2025" or "last quarter".
+
+        Periods without a year refer to the latest such period in the data.
+
+        Returns:
+            The first and the end (exclusive) month index of the period, and its label.
+
+        Raises:
+            ValueError: If the period is not recognized.
+        """
+        text = " ".join((period or "").lower().split())
+        last_year, last_month = divmod(self._last_month, 12)
+        last_year += 1970
+
+        if text in ("", "all", "all time"):
+            return self._first_month, self._last_month + 1, "All time"
+        if text == "last month":
+            return self._last_month, self._last_month + 1, _month_label(self._last_month)
+        if text == "last quarter":
+            start = self._last_month - self._last_month % 3
+            return start, start + 3, f"Q{last_month // 3 + 1} {last_year}"
+        if text == "last year":
+            return _month_index(last_year - 1, 1), _month_index(last_year, 1), str(last_year - 1)
+        if text == "last 12 months":
+            return self._last_month - 11, self._last_month + 1, "Last 12 months"
+        if text in ("ytd", "year to date", "this year"):
+            return _month_index(last_year, 1), self._last_month + 1, f"{last_year} year to date"
+        if match := _YEAR_RE.match(text):
+            year = int(match[1])
+            return _month_index(year, 1), _month_index(year + 1, 1), str(year)
+        if match := _YEAR_MONTH_RE.match(text):
+            start = _month_index(int(match[1]), int(match[2]))
+            return start, start + 1, _month_label(start)
+        if match := _QUARTER_RE.match(text):
+            first_month = (int(match[1]) - 1) * 3 + 1
+            year = int(match[2]) if match[2] else self._latest_year_with_month(first_month)
+            start = _month_index(year, first_month)
+            return start, start + 3, f"Q{match[1]} {year}"
+        if (match := _MONTH_NAME_RE.match(text)) and len(match[1]) >= 3 and (month_names := [m for m in _MONTH_NAMES if m.startswith(match[1])]):
+            month = _MONTH_NAMES.index(month_names[0]) + 1
+            year = int(match[2]) if match[2] else self._latest_year_with_month(month)
+            start = _month_index(year, month)
+            return start, start + 1, _month_label(start)
+        raise ValueError(f"Unsupported period '{period}'. Use e.g. 'Q3 2025', '2025-07', 'July', '2025', 'last month' or 'last quarter'.")
+
+    def _latest_year_with_month(self, month: int) -> int:
+        last_year = self._last_month // 12 + 1970
+        return last_year if _month_index(last_year, month) <= self._last_month else last_year - 1
+
+    def resolve_region(self, region: Optional[str]) -> Optional[int]:
+        """Returns the index of a region, or None for all regions.
+
+        Raises:
+            ValueError: If the region is not known.
+        """
+        if not region or region.lower() in ("all", "all regions"):
+            return None
+        lowered_labels = [label.lower() for label in self._region_labels]
+        if region.lower() not in lowered_labels:
+            raise ValueError(f"Unknown region '{region}'. Known regions: {', '.join(self._region_labels)}")
+        return lowered_labels.index(region.lower())
+
+    def _slice_months(self, cube: np.ndarray, start: int, end: int) -> np.ndarray:
+        """Sums a cube over the months in [start, end), clipped to the months in the data."""
+        start_offset = min(max(start - self._first_month, 0), len(cube))
+        end_offset = min(max(end - self._first_month, 0), len(cube))
+        return cube[start_offset:end_offset].sum(axis=0)
+
+    def get_sales_by_category(
+        self, period: Optional[str] = None, region: Optional[str] = None, compare_to_previous_year: bool = False
+    ) -> dict[str, Any]:
+        """Gets each category's share of revenue with its subcategory drill down.
+
+        Values are percentages of the total, and drill down values are percentages
+        of their category, rounded to one decimal.
+        """
+        start, end, period_label = self.resolve_period(period)
+        region_index = self.resolve_region(region)
+
+        def revenue_by(cube: np.ndarray, start: int, end: int) -> np.ndarray:
+            by_region = self._slice_months(cube, start, end)
+            return by_region.sum(axis=0) if region_index is None else by_region[region_index]
+
+        category_revenue = revenue_by(self._category_cube, start, end)
+        drill_down_revenue = revenue_by(self._drill_down_cube, start, end)
+        previous_category_revenue = revenue_by(self._category_cube, start - 12, end - 12) if compare_to_previous_year else None
+        total_revenue = float(category_revenue.sum())
+
+        sales_data = []
+        for category in np.argsort(-category_revenue, kind="stable"):
+            revenue = float(category_revenue[category])
+            if revenue <= 0:
+                continue
+            entry: dict[str, Any] = {
+                "label": self._category_labels[category],
+                "value": round(100 * revenue / total_revenue, 1),
+                "revenue": round(revenue, 2),
+            }
+            if previous_category_revenue is not None and (previous_revenue := float(previous_category_revenue[category])) > 0:
+                entry["yoy_change_percent"] = round(100 * (revenue / previous_revenue - 1), 1)
+
+            drill_downs = np.flatnonzero(self._drill_down_category == category)
+            drill_downs = drill_downs[np.argsort(-drill_down_revenue[drill_downs], kind="stable")]
+            if len(drill_downs) > 1:
+                entry["drillDown"] = [
+                    {"label": self._drill_down_labels[d], "value": round(100 * float(drill_down_revenue[d]) / revenue, 1)}
+                    for d in drill_downs
+                    if drill_down_revenue[d] > 0
+                ]
+            sales_data.append(entry)
+
+        return {
+            "period": period_label,
+            "region": self._region_labels[region_index] if region_index is not None else "All regions",
+            "total_revenue": round(total_revenue, 2),
+            "sales_data": sales_data,
+        }
+
+    def get_daily_revenue(
+        self,
+        period: Optional[str] = None,
+        region: Optional[str] = None,
+        category: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Gets the revenue of each day, at full resolution.
+
+        Args:
+            start_date: The first day, as YYYY-MM-DD. Overrides the period.
+            end_date: The last day, as YYYY-MM-DD. Overrides the period.
+
+        Returns:
+            A dict with the period, region and category labels, and the dates
+            (datetime64[D]) and revenue arrays.
+        """
+        start, end, period_label = self.resolve_period(period)
+        first_day = int(np.datetime64(start, "M").astype("datetime64[D]").astype(np.int64))
+        end_day = int(np.datetime64(end, "M").astype("datetime64[D]").astype(np.int64))
+        try:
+            if start_date:
+                first_day = int(np.datetime64(start_date, "D").astype(np.int64))
+            if end_date:
+                end_day = int(np.datetime64(end_date, "D").astype(np.int64)) + 1
+        except ValueError as e:
+            raise ValueError(f"Dates must be formatted as YYYY-MM-DD: {e}") from e
+        if start_date or end_date:
+            period_label = f"{np.datetime64(first_day, 'D')} to {np.datetime64(end_day - 1, 'D')}"
+
+        region_index = self.resolve_region(region)
+        if category:
+            lowered_labels = [label.lower() for label in self._category_labels]
+            if category.lower() not in lowered_labels:
+                raise ValueError(f"Unknown category '{category}'. Known categories: {', '.join(self._category_labels)}")
+            category_index = lowered_labels.index(category.lower())
+
+        num_days = len(self._daily_category_cube)
+        first_offset = min(max(first_day - self._first_day, 0), num_days)
+        end_offset = min(max(end_day - self._first_day, first_offset), num_days)
+        daily = self._daily_category_cube[first_offset:end_offset]
+        daily = daily.sum(axis=1) if region_index is None else daily[:, region_index]
+        daily = daily.sum(axis=1) if not category else daily[:, category_index]
+        return {
+            "period": period_label,
+            "region": self._region_labels[region_index] if region_index is not None else "All regions",
+            "category": self._category_labels[category_index] if category else "All categories",
+            "dates": np.arange(self._first_day + first_offset, self._first_day + end_offset).astype("datetime64[D]"),
+            "revenue": daily,
+        }
+
+    def get_store_revenue(self, period: Optional[str] = None, region: Optional[str] = None) -> dict[str, Any]:
+        """Gets the revenue of each store in a period, as columns.
+
+        Returns:
+            A dict with the period and region labels, and the store_index,
+            revenue, lat and lng arrays of the stores in the region.
+        """
+        start, end, period_label = self.resolve_period(period)
+        region_index = self.resolve_region(region)
+        store_index = np.arange(len(self._store_names)) if region_index is None else np.flatnonzero(self._store_region == region_index)
+        return {
+            "period": period_label,
+            "region": self._region_labels[region_index] if region_index is not None else "All regions",
+            "store_index": store_index,
+            "revenue": self._slice_months(self._store_cube, start, end)[store_index],
+            "lat": self._store_lat[store_index],
+            "lng": self._store_lng[store_index],
+        }
+
+    def find_store_outliers(
+        self,
+        period: Optional[str] = None,
+        region: Optional[str] = None,
+        baseline: str = "region",
+        threshold: float = DEFAULT_OUTLIER_THRESHOLD,
+    ) -> dict[str, Any]:
+        """Flags stores whose revenue in a period deviates from their baseline.
+
+        Stores are scored with robust z-scores within their region, so one
+        extreme store doesn't hide others the way it would with the mean and
+        standard deviation. The baseline is either:
+            region: The revenue of the other stores in the region.
+            previous_period: The store's own revenue in the period before, so that
+                stores are scored by their growth. Stores without revenue in the
+                period before are not scored.
+
+        Returns:
+            A dict with the period and region labels, the store_index, revenue,
+            baseline_revenue, z_score, lat and lng arrays of the flagged stores,
+            per region aggregates, all the stores as returned by get_store_revenue
+            and the positions of the flagged stores among them.
+        """
+        if baseline not in OUTLIER_BASELINES:
+            raise ValueError(f"Unsupported baseline '{baseline}'. Use one of {', '.join(OUTLIER_BASELINES)}.")
+        start, end, period_label = self.resolve_period(period)
+        store_revenue = self.get_store_revenue(period, region)
+        store_index = store_revenue["store_index"]
+        revenue = store_revenue["revenue"]
+        store_region = self._store_region[store_index]
+        num_regions = len(self._region_labels)
+
+        if baseline == "region":
+            z_scores, region_median = robust_z_scores(revenue, store_region, num_regions)
+            baseline_revenue = region_median[store_region]
+        else:
+            region_median = grouped_median(revenue, store_region, num_regions)
+            baseline_revenue = self._slice_months(self._store_cube, 2 * start - end, start)[store_index]
+            scored = baseline_revenue > 0
+            z_scores = np.zeros(len(store_index))
+            z_scores[scored], _ = robust_z_scores(
+                revenue[scored] / baseline_revenue[scored], store_region[scored], num_regions
+            )
+
+        flagged = np.flatnonzero(np.abs(z_scores) > threshold)
+        flagged = flagged[np.argsort(-np.abs(z_scores[flagged]), kind="stable")]
+
+        store_count = np.bincount(store_region, minlength=num_regions)
+        outlier_count = np.bincount(store_region[flagged], minlength=num_regions)
+        region_revenue = np.bincount(store_region, weights=revenue, minlength=num_regions)
+        return {
+            "period": period_label,
+            "region": store_revenue["region"],
+            "baseline": baseline,
+            "store_index": store_index[flagged],
+            "revenue": revenue[flagged],
+            "baseline_revenue": baseline_revenue[flagged],
+            "z_score": z_scores[flagged],
+            "lat": store_revenue["lat"][flagged],
+            "lng": store_revenue["lng"][flagged],
+            "flagged": flagged,
+            "stores": store_revenue,
+            "regions": [
+                {
+                    "region": self._region_labels[r],
+                    "store_count": int(store_count[r]),
+                    "outlier_count": int(outlier_count[r]),
+                    "total_revenue": round(float(region_revenue[r]), 2),
+                    "median_store_revenue": round(float(region_median[r]), 2),
+                }
+                for r in np.flatnonzero(store_count)
+            ],
+        }
+
+    def get_store_name(self, store_index: int) -> str:
+        return self._store_names[store_index]
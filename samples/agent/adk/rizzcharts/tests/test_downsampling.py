@@ -0,0 +1,89 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from downsampling import downsample, lttb, min_max
+
+
+def make_series(num_points=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.sin(np.linspace(0, 12, num_points)) * 100 + rng.normal(0, 5, num_points)
+
+
+@pytest.mark.parametrize("method", ["lttb", "min_max"])
+@pytest.mark.parametrize("target_points", [10, 11])
+def test_target_at_least_the_series_length_keeps_every_point(method, target_points):
+    assert downsample(make_series(10), target_points, method).tolist() == list(range(10))
+
+
+@pytest.mark.parametrize("method", ["lttb", "min_max"])
+def test_empty_series(method):
+    assert downsample(np.array([]), 3, method).tolist() == []
+
+
+@pytest.mark.parametrize("target_points", [1, 2])
+def test_lttb_rejects_fewer_than_3_target_points(target_points):
+    with pytest.raises(ValueError, match="at least 3"):
+        lttb(make_series(), target_points)
+
+
+def test_min_max_rejects_fewer_than_2_target_points():
+    with pytest.raises(ValueError, match="at least 2"):
+        min_max(make_series(), 1)
+
+
+def test_min_max_with_2_target_points_keeps_the_minimum_and_maximum():
+    y = make_series()
+
+    assert sorted(min_max(y, 2).tolist()) == sorted([int(np.argmin(y)), int(np.argmax(y))])
+
+
+@pytest.mark.parametrize("target_points", [3, 4, 60, 999])
+def test_lttb_keeps_the_endpoints_and_the_target_count(target_points):
+    y = make_series()
+
+    kept = lttb(y, target_points)
+
+    assert len(kept) == target_points
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_lttb_keeps_a_single_spike():
+    y = np.zeros(1000)
+    y[437] = 1000
+
+    assert 437 in lttb(y, 20)
+
+
+@pytest.mark.parametrize("target_points", [2, 3, 10, 61, 500])
+def test_min_max_keeps_the_extremes_of_every_bucket(target_points):
+    y = make_series()
+
+    kept = min_max(y, target_points)
+
+    assert len(kept) <= target_points
+    assert np.all(np.diff(kept) > 0)
+    assert int(np.argmin(y)) in kept and int(np.argmax(y)) in kept
+    edges = np.linspace(0, len(y), target_points // 2 + 1).astype(np.int64)
+    for start, end in zip(edges[:-1], edges[1:]):
+        assert start + int(np.argmin(y[start:end])) in kept
+        assert start + int(np.argmax(y[start:end])) in kept
+
+
+def test_unsupported_method_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported downsampling method"):
+        downsample(make_series(), 10, "average")
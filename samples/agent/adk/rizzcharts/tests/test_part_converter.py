@@ -0,0 +1,172 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import collections
+import json
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types as genai_types
+
+import a2ui_session_util
+import a2ui_validation
+from a2ui_session_util import get_request_a2ui_schema, intern_a2ui_schema
+from a2ui_toolset import SendA2uiJsonToClientTool
+from part_converter import A2uiPartConverter
+
+# Minimal stand-ins for A2UI schemas merged with two different catalogs
+CHART_SCHEMA = {"type": "object", "properties": {"chart": {"type": "object"}}, "required": ["chart"]}
+MAP_SCHEMA = {"type": "object", "properties": {"map": {"type": "object"}}, "required": ["map"]}
+CHART_JSON = json.dumps([{"chart": {"title": "Sales"}}])
+MAP_JSON = json.dumps([{"map": {"center": "NYC"}}])
+
+
+def make_tool_context():
+    return SimpleNamespace(actions=SimpleNamespace(skip_summarization=False))
+
+
+def make_function_call_part(a2ui_json, call_id="call-1"):
+    return genai_types.Part(
+        function_call=genai_types.FunctionCall(
+            id=call_id,
+            name=SendA2uiJsonToClientTool.TOOL_NAME,
+            args={SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME: a2ui_json},
+        )
+    )
+
+
+def make_function_response_part(response, call_id="call-1"):
+    return genai_types.Part(
+        function_response=genai_types.FunctionResponse(
+            id=call_id,
+            name=SendA2uiJsonToClientTool.TOOL_NAME,
+            response=response if isinstance(response, dict) else {"result": response},
+        )
+    )
+
+
+async def send_a2ui_json(converter, schema, fingerprint, a2ui_json):
+    """Runs one send_a2ui_json_to_client call in the order ADK emits its events."""
+    converter.set_a2ui_schema(schema, fingerprint, catalog_uri=fingerprint)
+    sent_on_call = converter.convert_genai_part_to_a2a_part(make_function_call_part(a2ui_json))
+    # Let a concurrent request set its own schema in between
+    await asyncio.sleep(0)
+    response = await SendA2uiJsonToClientTool().run_async(
+        args={SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME: a2ui_json}, tool_context=make_tool_context()
+    )
+    sent_on_response = converter.convert_genai_part_to_a2a_part(make_function_response_part(response))
+    return sent_on_call, response, sent_on_response
+
+
+@pytest.fixture(autouse=True)
+def clear_validation_caches():
+    a2ui_validation._validated_payloads.clear()
+    a2ui_validation._validators_by_fingerprint.clear()
+
+
+def test_a2ui_is_sent_once_the_tool_has_validated_it(monkeypatch):
+    converter = A2uiPartConverter()
+
+    async def run():
+        converter.set_a2ui_schema(CHART_SCHEMA, "chart", catalog_uri="chart")
+        assert converter.convert_genai_part_to_a2a_part(make_function_call_part(CHART_JSON)) == []
+        assert a2ui_validation._validated_payloads == {}
+
+        response = await SendA2uiJsonToClientTool().run_async(
+            args={SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME: CHART_JSON}, tool_context=make_tool_context()
+        )
+        assert response is None
+        assert len(a2ui_validation._validated_payloads) == 1
+
+        # The converter reuses the tool's parsed messages instead of validating again
+        monkeypatch.setattr(a2ui_validation, "get_a2ui_validator", lambda *args: pytest.fail("validated twice"))
+        return converter.convert_genai_part_to_a2a_part(make_function_response_part(response))
+
+    parts = asyncio.run(run())
+    assert [part.root.data for part in parts] == [{"chart": {"title": "Sales"}}]
+
+
+def test_a2ui_rejected_by_the_tool_is_not_sent():
+    async def run():
+        return await send_a2ui_json(A2uiPartConverter(), CHART_SCHEMA, "chart", MAP_JSON)
+
+    sent_on_call, response, sent_on_response = asyncio.run(run())
+    assert sent_on_call == []
+    assert "error" in response
+    assert sent_on_response == []
+
+
+def test_concurrent_requests_use_their_own_schema():
+    converter = A2uiPartConverter()
+
+    async def run():
+        return await asyncio.gather(
+            asyncio.create_task(send_a2ui_json(converter, CHART_SCHEMA, "chart", CHART_JSON)),
+            asyncio.create_task(send_a2ui_json(converter, MAP_SCHEMA, "map", MAP_JSON)),
+        )
+
+    (_, chart_response, chart_parts), (_, map_response, map_parts) = asyncio.run(run())
+    assert chart_response is None and map_response is None
+    assert [part.root.data for part in chart_parts] == [{"chart": {"title": "Sales"}}]
+    assert [part.root.data for part in map_parts] == [{"map": {"center": "NYC"}}]
+
+
+def test_schema_instructions_use_the_schema_of_the_request():
+    tool = SendA2uiJsonToClientTool()
+
+    async def get_instructions(schema, fingerprint):
+        A2uiPartConverter().set_a2ui_schema(schema, fingerprint, catalog_uri=fingerprint)
+        await asyncio.sleep(0)
+        assert get_request_a2ui_schema().catalog_uri == fingerprint
+        llm_request = LlmRequest()
+        await tool.process_llm_request(tool_context=make_tool_context(), llm_request=llm_request)
+        return llm_request.config.system_instruction
+
+    async def run():
+        return await asyncio.gather(
+            asyncio.create_task(get_instructions(CHART_SCHEMA, "chart")),
+            asyncio.create_task(get_instructions(MAP_SCHEMA, "map")),
+        )
+
+    chart_instructions, map_instructions = asyncio.run(run())
+    assert json.dumps(CHART_SCHEMA["properties"]) in chart_instructions
+    assert json.dumps(MAP_SCHEMA["properties"]) in map_instructions
+    assert json.dumps(MAP_SCHEMA["properties"]) not in chart_instructions
+
+
+def test_caches_keyed_by_client_catalogs_keep_the_most_recently_used(monkeypatch):
+    monkeypatch.setattr(a2ui_session_util, "_MAX_A2UI_SCHEMAS", 2)
+    monkeypatch.setattr(a2ui_session_util, "_a2ui_schemas_by_fingerprint", collections.OrderedDict())
+    monkeypatch.setattr(a2ui_validation, "_MAX_VALIDATORS", 2)
+    monkeypatch.setattr(SendA2uiJsonToClientTool, "MAX_SCHEMA_BLOCKS", 2)
+    tool = SendA2uiJsonToClientTool()
+
+    async def use_schema(fingerprint):
+        schema = {"type": "object", "required": [fingerprint]}
+        schema = intern_a2ui_schema(schema, fingerprint)
+        A2uiPartConverter().set_a2ui_schema(schema, fingerprint, catalog_uri=None)
+        a2ui_validation.get_a2ui_validator(schema, fingerprint)
+        await tool.process_llm_request(tool_context=make_tool_context(), llm_request=LlmRequest())
+
+    async def run():
+        for fingerprint in ["inline-1", "inline-2", "inline-1", "inline-3"]:
+            await use_schema(fingerprint)
+
+    asyncio.run(run())
+    # inline-2 was used least recently
+    assert list(a2ui_session_util._a2ui_schemas_by_fingerprint) == ["inline-1", "inline-3"]
+    assert list(a2ui_validation._validators_by_fingerprint) == ["inline-1", "inline-3"]
+    assert list(tool._schema_blocks_by_fingerprint) == ["inline-1", "inline-3"]
@@ -0,0 +1,181 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sales_store import SalesStore
+
+# Orders from October 2024 to May 2025 for stores S1 and S2 in North and S3 in South
+FIXTURE_CSV = Path(__file__).parent / "data" / "sales.csv"
+
+
+def month_index(year, month):
+    return (year - 1970) * 12 + month - 1
+
+
+@pytest.fixture
+def sales_csv(tmp_path):
+    path = tmp_path / "sales.csv"
+    shutil.copy(FIXTURE_CSV, path)
+    return path
+
+
+@pytest.fixture
+def store(sales_csv):
+    return SalesStore.load(str(sales_csv))
+
+
+def test_first_load_writes_the_cache(sales_csv):
+    SalesStore.load(str(sales_csv))
+
+    cache_dir = sales_csv.with_name("sales.csv.npcache")
+    assert (cache_dir / "meta.json").exists()
+    assert (cache_dir / "revenue.npy").exists()
+
+
+def test_later_loads_memory_map_the_cache(sales_csv, monkeypatch):
+    SalesStore.load(str(sales_csv))
+
+    def fail_encode(raw_columns):
+        raise AssertionError("The sales file was encoded again")
+
+    monkeypatch.setattr(SalesStore, "_encode", staticmethod(fail_encode))
+    loaded_columns = {}
+    original_init = SalesStore.__init__
+
+    def recording_init(self, columns, meta):
+        loaded_columns.update(columns)
+        original_init(self, columns, meta)
+
+    monkeypatch.setattr(SalesStore, "__init__", recording_init)
+    store = SalesStore.load(str(sales_csv))
+
+    assert isinstance(loaded_columns["revenue"], np.memmap)
+    assert store.get_sales_by_category()["total_revenue"] == 1000
+
+
+def test_changed_file_is_encoded_again(sales_csv):
+    SalesStore.load(str(sales_csv))
+    with sales_csv.open("a") as f:
+        f.write("2025-06-01,S3,Gamma,South,30.0,-90.0,Home,Decor,500\n")
+
+    store = SalesStore.load(str(sales_csv))
+
+    assert store.get_sales_by_category()["total_revenue"] == 1500
+
+
+def test_missing_columns_are_rejected(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text("order_date,store_id,revenue\n2025-01-01,S1,10\n")
+
+    with pytest.raises(ValueError, match="missing columns"):
+        SalesStore.load(str(path))
+
+
+@pytest.mark.parametrize(
+    "period, expected",
+    [
+        ("last quarter", (month_index(2025, 4), month_index(2025, 7), "Q2 2025")),
+        ("Last  Quarter", (month_index(2025, 4), month_index(2025, 7), "Q2 2025")),
+        ("ytd", (month_index(2025, 1), month_index(2025, 6), "2025 year to date")),
+        ("last month", (month_index(2025, 5), month_index(2025, 6), "2025-05")),
+        ("last year", (month_index(2024, 1), month_index(2025, 1), "2024")),
+        ("March", (month_index(2025, 3), month_index(2025, 4), "2025-03")),
+        ("mar", (month_index(2025, 3), month_index(2025, 4), "2025-03")),
+        # The latest July in the data is in the year before the last order
+        ("july", (month_index(2024, 7), month_index(2024, 8), "2024-07")),
+        ("july 2025", (month_index(2025, 7), month_index(2025, 8), "2025-07")),
+        ("Q4", (month_index(2024, 10), month_index(2025, 1), "Q4 2024")),
+        ("q1 2025", (month_index(2025, 1), month_index(2025, 4), "Q1 2025")),
+        ("2025-02", (month_index(2025, 2), month_index(2025, 3), "2025-02")),
+        ("2025", (month_index(2025, 1), month_index(2026, 1), "2025")),
+        (None, (month_index(2024, 10), month_index(2025, 6), "All time")),
+    ],
+)
+def test_resolve_period(store, period, expected):
+    assert store.resolve_period(period) == expected
+
+
+@pytest.mark.parametrize("period", ["ju", "next week", "Q5"])
+def test_unsupported_period_is_rejected(store, period):
+    with pytest.raises(ValueError, match="Unsupported period"):
+        store.resolve_period(period)
+
+
+def test_sales_by_category_rolls_up_subcategories(store):
+    result = store.get_sales_by_category(period="2025")
+
+    assert result["total_revenue"] == 900
+    assert result["sales_data"] == [
+        {
+            "label": "Apparel",
+            "value": 50.0,
+            "revenue": 450.0,
+            "drillDown": [{"label": "Shirts", "value": 66.7}, {"label": "Pants", "value": 33.3}],
+        },
+        {"label": "Home", "value": 50.0, "revenue": 450.0},
+    ]
+
+
+def test_sales_by_category_in_region(store):
+    result = store.get_sales_by_category(period="2025", region="north")
+
+    assert result["region"] == "North"
+    assert [(entry["label"], entry["revenue"]) for entry in result["sales_data"]] == [("Apparel", 350.0), ("Home", 300.0)]
+
+
+def test_unknown_region_is_rejected(store):
+    with pytest.raises(ValueError, match="Unknown region"):
+        store.get_sales_by_category(region="West")
+
+
+def test_store_revenue(store):
+    result = store.get_store_revenue(period="2025")
+
+    assert result["store_index"].tolist() == [0, 1, 2]
+    assert result["revenue"].tolist() == [500, 150, 250]
+    assert result["lat"].tolist() == [40.0, 41.0, 30.0]
+    assert [store.get_store_name(index) for index in result["store_index"]] == ["Alpha", "Beta", "Gamma"]
+
+
+def test_daily_revenue_between_dates(store):
+    result = store.get_daily_revenue(start_date="2025-05-14", end_date="2025-05-20", category="apparel")
+
+    assert result["period"] == "2025-05-14 to 2025-05-20"
+    assert result["category"] == "Apparel"
+    assert len(result["dates"]) == 7
+    assert result["revenue"].tolist() == [0, 100, 0, 0, 0, 0, 100]
+
+
+def test_demo_data_is_the_same_every_time():
+    demo = SalesStore.demo()
+
+    assert demo.get_sales_by_category("Q3 2025", "West") == SalesStore.demo().get_sales_by_category("Q3 2025", "West")
+    assert demo.resolve_period("last month")[2] == "2025-12"
+    assert [entry["label"] for entry in demo.get_sales_by_category()["sales_data"]] == [
+        "Apparel", "Electronics", "Home Goods", "Health & Beauty", "Other"
+    ]
+
+
+@pytest.mark.parametrize("region, outlier", [("West", "Santa Monica Branch"), ("Northeast", "Brooklyn Heights Store")])
+def test_demo_data_has_outlier_stores(region, outlier):
+    demo = SalesStore.demo()
+
+    outliers = demo.find_store_outliers("Q3 2025", region)
+
+    assert outlier in [demo.get_store_name(int(store_index)) for store_index in outliers["store_index"]]
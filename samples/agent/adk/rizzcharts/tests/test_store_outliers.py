@@ -0,0 +1,136 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from sales_store import DEFAULT_OUTLIER_THRESHOLD, SalesStore, grouped_median, robust_z_scores
+
+
+def make_store(orders):
+    """Builds a store from (order_date, store_id, region, revenue) tuples."""
+    raw_columns = {
+        "order_date": np.array([order[0] for order in orders]),
+        "store_id": np.array([order[1] for order in orders]),
+        "store_name": np.array([f"Store {order[1]}" for order in orders]),
+        "region": np.array([order[2] for order in orders]),
+        "lat": np.array([40.0] * len(orders)),
+        "lng": np.array([-74.0] * len(orders)),
+        "category": np.array(["Apparel"] * len(orders)),
+        "subcategory": np.array(["Shirts"] * len(orders)),
+        "revenue": np.array([float(order[3]) for order in orders]),
+    }
+    return SalesStore(*SalesStore._encode(raw_columns))
+
+
+def test_grouped_median_of_even_odd_and_empty_groups():
+    values = np.array([4.0, 1.0, 3.0, 2.0, 10.0])
+    groups = np.array([0, 0, 0, 0, 1])
+
+    median = grouped_median(values, groups, 3)
+
+    assert median[:2].tolist() == [2.5, 10.0]
+    assert np.isnan(median[2])
+
+
+def test_robust_z_scores_scale_the_mad_by_0_6745():
+    values = np.array([1.0, 2.0, 3.0, 4.0, 100.0])
+
+    z_scores, median = robust_z_scores(values, np.zeros(5, dtype=int), 1)
+
+    # The median is 3 and the median absolute deviation is 1
+    assert median.tolist() == [3.0]
+    assert np.allclose(z_scores, 0.6745 * np.array([-2.0, -1.0, 0.0, 1.0, 97.0]))
+
+
+def test_robust_z_scores_are_zero_when_the_mad_is_zero():
+    values = np.array([5.0, 5.0, 5.0, 5.0, 9.0, 1.0, 2.0, 3.0])
+    groups = np.array([0, 0, 0, 0, 0, 1, 1, 1])
+
+    z_scores, _ = robust_z_scores(values, groups, 2)
+
+    assert z_scores[:5].tolist() == [0.0] * 5
+    assert np.allclose(z_scores[5:], [-0.6745, 0.0, 0.6745])
+
+
+@pytest.mark.parametrize("revenue, flagged", [(116, False), (117, True)])
+def test_stores_are_flagged_above_the_3_5_threshold(revenue, flagged):
+    # The median is 101 and the MAD is 3, so the threshold lies at a revenue of about 116.6
+    store = make_store(
+        [("2025-02-01", f"S{index}", "North", value) for index, value in enumerate([96, 98, 100, 102, 104, revenue])]
+    )
+
+    result = store.find_store_outliers(period="2025-02")
+
+    assert DEFAULT_OUTLIER_THRESHOLD == 3.5
+    assert result["store_index"].tolist() == ([5] if flagged else [])
+    assert result["regions"] == [
+        {
+            "region": "North",
+            "store_count": 6,
+            "outlier_count": 1 if flagged else 0,
+            "total_revenue": 500.0 + revenue,
+            "median_store_revenue": 101.0,
+        }
+    ]
+
+
+def test_stores_are_scored_within_their_region():
+    store = make_store(
+        [("2025-02-01", f"N{index}", "North", value) for index, value in enumerate([96, 98, 100, 102, 104])]
+        + [("2025-02-01", f"S{index}", "South", value) for index, value in enumerate([960, 980, 1000, 1020, 1040])]
+    )
+
+    result = store.find_store_outliers(period="2025-02")
+
+    assert result["store_index"].tolist() == []
+    assert [region["median_store_revenue"] for region in result["regions"]] == [100.0, 1000.0]
+
+
+def previous_period_orders():
+    # Stores N0-N5 had January sales and grew by 0.96x to 3x in February. N6 only opened in February.
+    orders = []
+    for index, february_revenue in enumerate([96, 98, 100, 102, 104, 300]):
+        orders.append(("2025-01-15", f"N{index}", "North", 100))
+        orders.append(("2025-02-15", f"N{index}", "North", february_revenue))
+    orders.append(("2025-02-15", "N6", "North", 1000))
+    return orders
+
+
+def test_previous_period_baseline_scores_growth():
+    store = make_store(previous_period_orders())
+
+    result = store.find_store_outliers(period="2025-02", baseline="previous_period")
+
+    assert [store.get_store_name(index) for index in result["store_index"]] == ["Store N5"]
+    assert result["baseline_revenue"].tolist() == [100.0]
+    assert result["revenue"].tolist() == [300.0]
+
+
+def test_previous_period_baseline_skips_stores_without_previous_sales():
+    store = make_store(previous_period_orders())
+
+    by_region = store.find_store_outliers(period="2025-02")
+    by_growth = store.find_store_outliers(period="2025-02", baseline="previous_period")
+
+    new_store = next(index for index in range(7) if store.get_store_name(index) == "Store N6")
+    assert new_store in by_region["store_index"]
+    assert new_store not in by_growth["store_index"]
+
+
+def test_unsupported_baseline_is_rejected():
+    store = make_store([("2025-02-01", "S0", "North", 100)])
+
+    with pytest.raises(ValueError, match="Unsupported baseline"):
+        store.find_store_outliers(baseline="last_year")
@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+from pathlib import Path
+from urllib.parse import urlencode
+
+import pytest
+
+import tools
+from sales_store import SalesStore
+
+FIXTURE_CSV = Path(__file__).parent / "data" / "sales.csv"
+
+
+@pytest.fixture(autouse=True)
+def sales_store(tmp_path):
+    path = tmp_path / "sales.csv"
+    shutil.copy(FIXTURE_CSV, path)
+    tools.set_sales_store(SalesStore.load(str(path)))
+    yield
+    tools.set_sales_store(None)
+
+
+def test_expand_store_cluster_zooms_in_on_the_cluster():
+    cluster_id = urlencode(
+        {"period": "2025", "region": "North", "baseline": "region", "zoom": 9, "center_lat": 40.5, "center_lng": -73.5}
+    )
+
+    result = tools.expand_store_cluster(cluster_id)
+
+    assert "error" not in result
+    assert result["zoom"] == 9
+    assert result["center"] == {"lat": 40.5, "lng": -73.5}
+    assert result["region"] == "North"
+
+
+@pytest.mark.parametrize(
+    "cluster_id",
+    [
+        "garbage",
+        "",
+        "zoom=x&center_lat=40.5&center_lng=-73.5",
+        "zoom=9&center_lat=north&center_lng=-73.5",
+        "zoom=9&center_lat=40.5",
+    ],
+)
+def test_expand_store_cluster_rejects_malformed_ids(cluster_id):
+    result = tools.expand_store_cluster(cluster_id)
+
+    assert result["error"].startswith("Invalid clusterId")
+
+
+def test_expand_store_cluster_reports_unknown_regions():
+    cluster_id = urlencode({"region": "West", "zoom": 9, "center_lat": 40.5, "center_lng": -73.5})
+
+    assert "Unknown region" in tools.expand_store_cluster(cluster_id)["error"]
+
+
+def test_revenue_trend_keeps_at_least_3_points():
+    result = tools.get_revenue_trend(max_points=1)
+
+    assert result["downsampled"]
+    assert len(result["trend"]) == 3
+    assert result["trend"][0]["label"] == "2024-10-15"
+    assert result["trend"][-1]["label"] == "2025-05-20"
+
+
+def test_tools_use_the_demo_data_without_sales_data():
+    tools.set_sales_store(None)
+
+    trend = tools.get_revenue_trend(period="Q3 2025", region="West", max_points=30)
+    sales_data = tools.get_sales_data(period="last month", region="Northeast")
+    store_sales = tools.get_store_sales(period="2025", region="West", include_all_stores=True, zoom=8)
+
+    assert "error" not in trend
+    assert (trend["period"], trend["region"], trend["total_points"], len(trend["trend"])) == ("Q3 2025", "West", 92, 30)
+    assert (sales_data["period"], sales_data["region"]) == ("2025-12", "Northeast")
+    assert all("drillDownId" in item for item in sales_data["sales_data"] if item["label"] == "Apparel")
+    assert store_sales["locations"][0]["name"] == "Santa Monica Branch"
+    assert len(store_sales["locations"]) > 1
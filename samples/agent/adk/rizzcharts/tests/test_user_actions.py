@@ -0,0 +1,121 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types as genai_types
+
+import tools
+from a2ui_session_util import A2UI_ENABLED_STATE_KEY
+from a2ui_toolset import SendA2uiJsonToClientTool
+from sales_store import SalesStore
+from user_actions import LOAD_DRILL_DOWN_ACTION, answer_user_action_without_llm, load_drill_down
+
+FIXTURE_CSV = Path(__file__).parent / "data" / "sales.csv"
+
+
+@pytest.fixture(autouse=True)
+def sales_store(tmp_path):
+    path = tmp_path / "sales.csv"
+    shutil.copy(FIXTURE_CSV, path)
+    tools.set_sales_store(SalesStore.load(str(path)))
+    yield
+    tools.set_sales_store(None)
+
+
+def get_drill_down_id(category):
+    sales_data = tools.get_sales_data(period="2025")
+    return next(item["drillDownId"] for item in sales_data["sales_data"] if item["label"] == category)
+
+
+def make_user_action(**context):
+    return {"name": LOAD_DRILL_DOWN_ACTION, "surfaceId": "sales", "context": context}
+
+
+def make_request(text):
+    return LlmRequest(contents=[genai_types.Content(role="user", parts=[genai_types.Part(text=text)])])
+
+
+def make_callback_context(a2ui_enabled=True):
+    return SimpleNamespace(state={A2UI_ENABLED_STATE_KEY: a2ui_enabled})
+
+
+def test_load_drill_down_updates_only_the_item_drill_down():
+    user_action = make_user_action(drillDownId=get_drill_down_id("Apparel"), itemPath="chart.items[0]")
+
+    assert load_drill_down(user_action) == [
+        {
+            "dataModelUpdate": {
+                "surfaceId": "sales",
+                "path": "chart.items[0].drillDown",
+                "contents": [
+                    {"key": "[0].label", "valueString": "Shirts"},
+                    {"key": "[0].value", "valueNumber": 66.7},
+                    {"key": "[1].label", "valueString": "Pants"},
+                    {"key": "[1].value", "valueNumber": 33.3},
+                ],
+            }
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    "context",
+    [
+        {"itemPath": "chart.items[0]"},
+        {"drillDownId": "period=2025&region=&category=Apparel"},
+        {"drillDownId": "", "itemPath": "chart.items[0]"},
+        {"drillDownId": "period=2025&region=&category=Apparel", "itemPath": "chart"},
+        {"drillDownId": "period=2025&region=&category=Apparel", "itemPath": "chart.items[0]}"},
+        {"drillDownId": "period=2025&region=&category=Garden", "itemPath": "chart.items[0]"},
+    ],
+)
+def test_load_drill_down_without_a_valid_id_or_path_is_left_to_the_llm(context):
+    assert load_drill_down(make_user_action(**context)) is None
+
+
+def test_load_drill_down_without_context_is_left_to_the_llm():
+    assert load_drill_down({"name": LOAD_DRILL_DOWN_ACTION, "surfaceId": "sales"}) is None
+
+
+def test_user_action_is_answered_with_a_synthetic_function_call():
+    user_action = make_user_action(drillDownId=get_drill_down_id("Apparel"), itemPath="chart.items[0]")
+
+    response = answer_user_action_without_llm(
+        make_callback_context(), make_request(json.dumps({"userAction": user_action}))
+    )
+
+    function_call = response.content.parts[0].function_call
+    assert response.content.role == "model"
+    assert function_call.name == SendA2uiJsonToClientTool.TOOL_NAME
+    assert json.loads(function_call.args[SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME]) == load_drill_down(user_action)
+
+
+@pytest.mark.parametrize(
+    "a2ui_enabled, text",
+    [
+        (False, json.dumps({"userAction": make_user_action(drillDownId="category=Apparel", itemPath="chart.items[0]")})),
+        (True, json.dumps({"userAction": {"name": "open_details", "surfaceId": "sales", "context": {}}})),
+        (True, json.dumps({"userAction": make_user_action(itemPath="chart.items[0]")})),
+        (True, '{"userAction": not json'),
+        (True, "Show me the sales by category"),
+    ],
+)
+def test_other_requests_are_left_to_the_llm(a2ui_enabled, text):
+    assert answer_user_action_without_llm(make_callback_context(a2ui_enabled), make_request(text)) is None
@@ -12,84 +12,301 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any
+from functools import cache
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode
 import logging
 
+import numpy as np
+
+from downsampling import downsample
+from map_clustering import MAX_ZOOM, cluster_locations, get_in_viewport, get_zoom_to_fit
+from sales_store import SalesStore
+
 logger = logging.getLogger(__name__)
 
+# Set from --sales_data. The tools use the generated demo data while it is None.
+_sales_store: Optional[SalesStore] = None
+
+_OVER_BASELINE_COLOR = "#4285F4"
+_UNDER_BASELINE_COLOR = "#EA4335"
+_CLUSTER_COLOR = "#5F6368"
+# Zoom levels added when a cluster is expanded
+_CLUSTER_EXPAND_ZOOM_STEP = 2
+DEFAULT_TREND_POINTS = 60
+# The rizzcharts Chart component renders at most this many items
+MAX_TREND_POINTS = 500
+
+
+def set_sales_store(sales_store: Optional[SalesStore]):
+    global _sales_store
+    _sales_store = sales_store
+
 
-def get_store_sales() -> dict[str, Any]:
+@cache
+def _get_demo_sales_store() -> SalesStore:
+    return SalesStore.demo()
+
+
+def get_sales_store() -> SalesStore:
+    """Gets the sales store loaded from --sales_data, or the demo data if none was loaded."""
+    return _sales_store if _sales_store is not None else _get_demo_sales_store()
+
+
+def _get_outlier_location(store_index: int, revenue: float, baseline_revenue: float, lat: float, lng: float) -> dict[str, Any]:
+    change_percent = 100 * (revenue / baseline_revenue - 1) if baseline_revenue else 0
+    return {
+        "lat": round(lat, 4),
+        "lng": round(lng, 4),
+        "name": get_sales_store().get_store_name(store_index),
+        "revenue": round(revenue, 2),
+        "outlier_reason": f"Yes, {abs(change_percent):.0f}% sales {'over' if change_percent >= 0 else 'under'} baseline",
+        "background": _OVER_BASELINE_COLOR if change_percent >= 0 else _UNDER_BASELINE_COLOR,
+        "borderColor": "#FFFFFF",
+        "glyphColor": "#FFFFFF",
+    }
+
+
+def _get_other_store_locations(
+    stores: dict[str, Any], other_stores: np.ndarray, zoom: int, cluster_query: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Returns a marker per store that is alone in its grid cell, and a cluster marker per cell with several stores.
+
+    Args:
+        stores: The stores as returned by SalesStore.get_store_revenue.
+        other_stores: The positions in stores of the stores to show.
+        zoom: The map zoom level.
+        cluster_query: The get_store_sales arguments the stores were queried with.
+    """
+    if len(other_stores) == 0:
+        return []
+    lat = stores["lat"][other_stores]
+    lng = stores["lng"][other_stores]
+    clusters = cluster_locations(lat, lng, zoom)
+    cluster_revenue = np.bincount(clusters.cluster_of_location, weights=stores["revenue"][other_stores], minlength=len(clusters.count))
+    # Position in stores of one store of each cluster, used for clusters of a single store
+    cluster_store = np.empty(len(clusters.count), dtype=np.int64)
+    cluster_store[clusters.cluster_of_location] = other_stores
+
+    locations = []
+    for cluster in range(len(clusters.count)):
+        count = int(clusters.count[cluster])
+        if count == 1:
+            locations.append({
+                "lat": round(float(clusters.lat[cluster]), 4),
+                "lng": round(float(clusters.lng[cluster]), 4),
+                "name": get_sales_store().get_store_name(int(stores["store_index"][cluster_store[cluster]])),
+                "revenue": round(float(cluster_revenue[cluster]), 2),
+            })
+            continue
+        cluster_lat = round(float(clusters.lat[cluster]), 5)
+        cluster_lng = round(float(clusters.lng[cluster]), 5)
+        locations.append({
+            "lat": cluster_lat,
+            "lng": cluster_lng,
+            "name": f"{count} stores",
+            "description": f"{count} stores with ${cluster_revenue[cluster]:,.0f} in sales. Select to expand.",
+            "revenue": round(float(cluster_revenue[cluster]), 2),
+            "store_count": count,
+            # The query that shows the stores of the cluster, so expanding it needs no server side state
+            "clusterId": urlencode({
+                **cluster_query,
+                "zoom": min(zoom + _CLUSTER_EXPAND_ZOOM_STEP, MAX_ZOOM),
+                "center_lat": cluster_lat,
+                "center_lng": cluster_lng,
+            }),
+            "background": _CLUSTER_COLOR,
+            "borderColor": "#FFFFFF",
+            "glyphColor": "#FFFFFF",
+        })
+    return locations
+
+
+def get_store_sales(
+    period: Optional[str] = None,
+    region: Optional[str] = None,
+    baseline: str = "region",
+    include_all_stores: bool = False,
+    zoom: Optional[int] = None,
+    center_lat: Optional[float] = None,
+    center_lng: Optional[float] = None,
+) -> dict[str, Any]:
     """
     Gets individual store sales
 
+    Args:
+        period: The time period, e.g. "Q3 2025", "2025-07", "July", "2025", "last month" or "last quarter". All time if not set.
+        region: The sales region of the stores. All regions if not set.
+        baseline: What outlier stores are compared to. "region" compares a store to the other stores in its region,
+            "previous_period" compares its growth since the period before to that of the other stores in its region.
+        include_all_stores: Whether to also return the stores that are not outliers. Nearby stores are grouped into
+            cluster locations with a store_count and a clusterId.
+        zoom: The map zoom level. Fits all the stores if not set.
+        center_lat: The latitude of the map center. Only stores in view are returned if the center is set.
+        center_lng: The longitude of the map center.
+
     Returns:
         A dict containing the stores with locations and their sales, and with outlier stores highlighted
     """
+    try:
+        outliers = get_sales_store().find_store_outliers(period, region, baseline)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    stores = outliers["stores"]
+    zoom = int(zoom) if zoom is not None else get_zoom_to_fit(stores["lat"], stores["lng"])
+    if center_lat is not None and center_lng is not None:
+        in_view = get_in_viewport(stores["lat"], stores["lng"], center_lat, center_lng, zoom)
+    else:
+        in_view = np.ones(len(stores["store_index"]), dtype=bool)
+        center_lat = float(stores["lat"].min() + stores["lat"].max()) / 2 if len(stores["lat"]) else 0
+        center_lng = float(stores["lng"].min() + stores["lng"].max()) / 2 if len(stores["lng"]) else 0
+
+    flagged_in_view = in_view[outliers["flagged"]]
+    # Outliers are always shown individually. Other stores are only sent on request, and then clustered,
+    # so the payload doesn't grow with the number of stores.
+    locations = [
+        _get_outlier_location(int(store_index), float(revenue), float(baseline_revenue), float(lat), float(lng))
+        for store_index, revenue, baseline_revenue, lat, lng in zip(
+            outliers["store_index"][flagged_in_view],
+            outliers["revenue"][flagged_in_view],
+            outliers["baseline_revenue"][flagged_in_view],
+            outliers["lat"][flagged_in_view],
+            outliers["lng"][flagged_in_view],
+        )
+    ]
+    if include_all_stores:
+        is_other = in_view.copy()
+        is_other[outliers["flagged"]] = False
+        cluster_query = {"period": period or "", "region": region or "", "baseline": baseline}
+        locations += _get_other_store_locations(stores, np.flatnonzero(is_other), zoom, cluster_query)
 
     return {
-        "center": {"lat": 34, "lng": -118.2437},
-        "zoom": 10,
-        "locations": [
-            {
-                "lat": 34.0195,
-                "lng": -118.4912,
-                "name": "Santa Monica Branch",
-                "description": "High traffic coastal location.",
-                "outlier_reason": "Yes, 15% sales over baseline",
-                "background": "#4285F4",
-                "borderColor": "#FFFFFF",
-                "glyphColor": "#FFFFFF",
-            },
-            {"lat": 34.0488, "lng": -118.2518, "name": "Downtown Flagship"},
-            {"lat": 34.1016, "lng": -118.3287, "name": "Hollywood Boulevard Store"},
-            {"lat": 34.1478, "lng": -118.1445, "name": "Pasadena Location"},
-            {"lat": 33.7701, "lng": -118.1937, "name": "Long Beach Outlet"},
-            {"lat": 34.0736, "lng": -118.4004, "name": "Beverly Hills Boutique"},
-        ],
+        "period": outliers["period"],
+        "region": outliers["region"],
+        "baseline": outliers["baseline"],
+        "center": {"lat": round(center_lat, 4), "lng": round(center_lng, 4)},
+        "zoom": zoom,
+        "regions": outliers["regions"],
+        "locations": locations,
     }
 
 
-def get_sales_data() -> dict[str, Any]:
+def _get_sales_data_with_drill_downs(
+    period: Optional[str], region: Optional[str], compare_to_previous_year: bool
+) -> dict[str, Any]:
+    try:
+        return get_sales_store().get_sales_by_category(period, region, compare_to_previous_year)
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+def get_sales_data(
+    period: Optional[str] = None,
+    region: Optional[str] = None,
+    compare_to_previous_year: bool = False,
+    include_drill_down: bool = False,
+) -> dict[str, Any]:
     """
     Gets the sales data.
 
+    Args:
+        period: The time period, e.g. "Q3 2025", "2025-07", "July", "2025", "last month" or "last quarter". All time if not set.
+        region: The sales region. All regions if not set.
+        compare_to_previous_year: Whether to include each category's year over year change.
+        include_drill_down: Whether to include each category's subcategories. If not set, categories with
+            subcategories have a drillDownId instead, which the client uses to load them when selected.
+
     Returns:
         A dict containing the sales breakdown by product category.
     """
+    sales_data = _get_sales_data_with_drill_downs(period, region, compare_to_previous_year)
+    if include_drill_down or "error" in sales_data:
+        return sales_data
+
+    # Subcategories are only loaded when the user drills down, so the initial chart stays small
+    items = []
+    for item in sales_data["sales_data"]:
+        item = dict(item)
+        if item.pop("drillDown", None):
+            item["drillDownId"] = urlencode({"period": period or "", "region": region or "", "category": item["label"]})
+        items.append(item)
+    return {**sales_data, "sales_data": items}
+
+
+def get_sales_drill_down(drill_down_id: str) -> Optional[list[dict[str, Any]]]:
+    """Gets the subcategories of a category returned by get_sales_data with a drillDownId."""
+    query = dict(parse_qsl(drill_down_id))
+    sales_data = _get_sales_data_with_drill_downs(query.get("period") or None, query.get("region") or None, False)
+    return next(
+        (item.get("drillDown") for item in sales_data.get("sales_data", []) if item["label"] == query.get("category")),
+        None,
+    )
+
+
+def expand_store_cluster(cluster_id: str) -> dict[str, Any]:
+    """Gets the stores of a cluster returned by get_store_sales, zoomed in on the cluster.
+
+    Outliers in view are included as well, so the result can replace the whole map.
+    """
+    query = dict(parse_qsl(cluster_id))
+    try:
+        zoom = int(query["zoom"])
+        center_lat = float(query["center_lat"])
+        center_lng = float(query["center_lng"])
+    except (KeyError, ValueError) as e:
+        return {"error": f"Invalid clusterId '{cluster_id}': {e!r}"}
+    return get_store_sales(
+        period=query.get("period") or None,
+        region=query.get("region") or None,
+        baseline=query.get("baseline", "region"),
+        include_all_stores=True,
+        zoom=zoom,
+        center_lat=center_lat,
+        center_lng=center_lng,
+    )
+
+
+def get_revenue_trend(
+    period: Optional[str] = None,
+    region: Optional[str] = None,
+    category: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    max_points: int = DEFAULT_TREND_POINTS,
+) -> dict[str, Any]:
+    """
+    Gets the daily revenue trend over a period, reduced to at most max_points points that keep its shape.
 
+    Args:
+        period: The time period, e.g. "2025", "Q3 2025", "last 12 months" or "last quarter". All time if not set.
+        region: The sales region. All regions if not set.
+        category: The product category. All categories if not set.
+        start_date: The first day, as YYYY-MM-DD, to zoom in on part of the trend. Overrides the period.
+        end_date: The last day, as YYYY-MM-DD, to zoom in on part of the trend. Overrides the period.
+        max_points: The maximum number of points to return.
+
+    Returns:
+        A dict containing the trend as a list of points with a date label and a revenue value.
+    """
+    try:
+        daily_revenue = get_sales_store().get_daily_revenue(period, region, category, start_date, end_date)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    # Long series are reduced before they reach the LLM, which copies them into the payload.
+    # Zooming in with start_date and end_date returns the days of a shorter range at full resolution.
+    revenue = daily_revenue["revenue"]
+    kept = downsample(revenue, min(max(int(max_points), 3), MAX_TREND_POINTS))
     return {
-        "sales_data": [
-            {
-                "label": "Apparel",
-                "value": 41,
-                "drillDown": [
-                    {"label": "Tops", "value": 31},
-                    {"label": "Bottoms", "value": 38},
-                    {"label": "Outerwear", "value": 20},
-                    {"label": "Footwear", "value": 11},
-                ],
-            },
-            {
-                "label": "Home Goods",
-                "value": 15,
-                "drillDown": [
-                    {"label": "Pillow", "value": 8},
-                    {"label": "Coffee Maker", "value": 16},
-                    {"label": "Area Rug", "value": 3},
-                    {"label": "Bath Towels", "value": 14},
-                ],
-            },
-            {
-                "label": "Electronics",
-                "value": 28,
-                "drillDown": [
-                    {"label": "Phones", "value": 25},
-                    {"label": "Laptops", "value": 27},
-                    {"label": "TVs", "value": 21},
-                    {"label": "Other", "value": 27},
-                ],
-            },
-            {"label": "Health & Beauty", "value": 10},
-            {"label": "Other", "value": 6},
-        ]
+        "period": daily_revenue["period"],
+        "region": daily_revenue["region"],
+        "category": daily_revenue["category"],
+        "resolution": "day",
+        "total_points": len(revenue),
+        "downsampled": len(kept) < len(revenue),
+        "trend": [
+            {"label": str(date), "value": round(float(value), 2)}
+            for date, value in zip(daily_revenue["dates"][kept], revenue[kept])
+        ],
     }
@@ -0,0 +1,170 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import re
+from typing import Any, Callable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types as genai_types
+
+from a2ui_session_util import A2UI_ENABLED_STATE_KEY
+from a2ui_toolset import SendA2uiJsonToClientTool
+from a2ui.log_utils import PAYLOAD_LOG_CATEGORY, Truncated, get_category_logger
+from tools import expand_store_cluster, get_sales_drill_down
+
+logger = logging.getLogger(__name__)
+payload_logger = get_category_logger(PAYLOAD_LOG_CATEGORY)
+
+# Dispatched by the GoogleMap pinAction of the map example when a cluster pin is selected
+EXPAND_MAP_CLUSTER_ACTION = "expand_map_cluster"
+# Dispatched by the Chart drillDownAction of the chart example when a category without subcategories is selected
+LOAD_DRILL_DOWN_ACTION = "load_drill_down"
+
+# Data model path of a chart item, e.g. "chart.items[2]"
+_CHART_ITEM_PATH_RE = re.compile(r"^/?[A-Za-z_][\w./]*\[\d+\]$")
+
+# Fields of get_store_sales locations that the GoogleMap component reads from the data model
+_MAP_PIN_FIELDS = ["lat", "lng", "name", "description", "background", "borderColor", "glyphColor", "clusterId"]
+
+
+def get_user_action(llm_request: LlmRequest) -> Optional[dict[str, Any]]:
+    """Returns the userAction if the latest user message is an A2UI userAction.
+
+    A2uiPartConverter.convert_a2a_part_to_genai_part passes userActions to the
+    agent as the JSON text of the A2UI client event.
+    """
+    if not (
+        llm_request.contents
+        and (last_content := llm_request.contents[-1]).role == "user"
+        and last_content.parts
+        and (text := last_content.parts[-1].text)
+        and text.startswith('{"userAction"')
+    ):
+        return None
+    try:
+        return json.loads(text).get("userAction")
+    except json.JSONDecodeError:
+        return None
+
+
+def to_data_model_contents(value: Any, key: str) -> list[dict[str, Any]]:
+    """Flattens a value into dataModelUpdate entries with keys such as "mapConfig.locations[0].lat"."""
+    if isinstance(value, dict):
+        return [entry for k, v in value.items() for entry in to_data_model_contents(v, f"{key}.{k}")]
+    if isinstance(value, list):
+        return [entry for i, v in enumerate(value) for entry in to_data_model_contents(v, f"{key}[{i}]")]
+    if isinstance(value, bool):
+        return [{"key": key, "valueBoolean": value}]
+    if isinstance(value, (int, float)):
+        return [{"key": key, "valueNumber": value}]
+    return [{"key": key, "valueString": str(value)}]
+
+
+def _get_map_pin(location: dict[str, Any]) -> dict[str, Any]:
+    pin = {field: location[field] for field in _MAP_PIN_FIELDS if field in location}
+    if "outlier_reason" in location:
+        pin["description"] = location["outlier_reason"]
+    return pin
+
+
+def expand_map_cluster(user_action: dict[str, Any]) -> Optional[list[dict[str, Any]]]:
+    """Replaces the map's data model with the stores of the selected cluster."""
+    if not (cluster_id := (user_action.get("context") or {}).get("clusterId")):
+        return None
+    store_sales = expand_store_cluster(cluster_id)
+    if "error" in store_sales:
+        logger.warning(f"Failed to expand map cluster {cluster_id}: {store_sales['error']}")
+        return None
+
+    map_config = {
+        "center": store_sales["center"],
+        "zoom": store_sales["zoom"],
+        "locations": [_get_map_pin(location) for location in store_sales["locations"]],
+    }
+    # Only the data model changes, so the surface's components are not sent again
+    return [
+        {
+            "dataModelUpdate": {
+                "surfaceId": user_action["surfaceId"],
+                "path": "/",
+                "contents": to_data_model_contents(map_config, "mapConfig"),
+            }
+        }
+    ]
+
+
+def load_drill_down(user_action: dict[str, Any]) -> Optional[list[dict[str, Any]]]:
+    """Sets the subcategories of the selected chart item."""
+    context = user_action.get("context") or {}
+    drill_down_id = context.get("drillDownId")
+    item_path = context.get("itemPath")
+    if not (drill_down_id and item_path and _CHART_ITEM_PATH_RE.match(item_path)):
+        return None
+    if not (drill_down := get_sales_drill_down(drill_down_id)):
+        logger.warning(f"No drill down found for {drill_down_id}")
+        return None
+
+    # Only the item's drillDown is updated, the rest of the chart stays as it is
+    return [
+        {
+            "dataModelUpdate": {
+                "surfaceId": user_action["surfaceId"],
+                "path": f"{item_path}.drillDown",
+                "contents": to_data_model_contents(drill_down, ""),
+            }
+        }
+    ]
+
+
+# Handlers of userActions that can be answered without the LLM, by action name.
+# A handler returns the A2UI messages to send, or None to let the LLM answer.
+USER_ACTION_HANDLERS: dict[str, Callable[[dict[str, Any]], Optional[list[dict[str, Any]]]]] = {
+    EXPAND_MAP_CLUSTER_ACTION: expand_map_cluster,
+    LOAD_DRILL_DOWN_ACTION: load_drill_down,
+}
+
+
+def answer_user_action_without_llm(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """Answers userActions with a registered handler by calling send_a2ui_json_to_client directly.
+
+    The function call goes through the same part converter and tool as the
+    LLM's calls, and the tool skips summarization, so no LLM call is made.
+    """
+    if not (
+        callback_context.state.get(A2UI_ENABLED_STATE_KEY)
+        and (user_action := get_user_action(llm_request))
+        and (handler := USER_ACTION_HANDLERS.get(user_action.get("name")))
+        and (a2ui_messages := handler(user_action))
+    ):
+        return None
+
+    logger.info(f"Answering userAction {user_action.get('name')} for surfaceId '{user_action.get('surfaceId')}' without the LLM")
+    payload_logger.debug("userAction answer: %s", Truncated(a2ui_messages))
+    return LlmResponse(
+        content=genai_types.Content(
+            role="model",
+            parts=[
+                genai_types.Part(
+                    function_call=genai_types.FunctionCall(
+                        name=SendA2uiJsonToClientTool.TOOL_NAME,
+                        args={SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME: json.dumps(a2ui_messages)},
+                    )
+                )
+            ],
+        )
+    )
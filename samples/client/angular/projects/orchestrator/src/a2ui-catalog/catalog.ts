@@ -27,6 +27,10 @@ export const DEMO_CATALOG = {
         'chartData',
         () => ('chartData' in properties && properties['chartData']) || undefined,
       ),
+      inputBinding(
+        'drillDownAction',
+        () => ('drillDownAction' in properties && properties['drillDownAction']) || undefined,
+      ),
     ],
   },
   GoogleMap: {
@@ -36,6 +40,10 @@ export const DEMO_CATALOG = {
       inputBinding('center', () => ('center' in properties && properties['center']) || undefined),
       inputBinding('pins', () => ('pins' in properties && properties['pins']) || undefined),
       inputBinding('title', () => ('title' in properties && properties['title']) || undefined),
+      inputBinding(
+        'pinAction',
+        () => ('pinAction' in properties && properties['pinAction']) || undefined,
+      ),
     ],
   },
 } as Catalog;
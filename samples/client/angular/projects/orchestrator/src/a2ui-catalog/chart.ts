@@ -114,7 +114,7 @@ ChartJS.register(ChartDataLabels);
           baseChart
           [data]="currentData()"
           [type]="chartType()"
-          [options]="chartOptions"
+          [options]="chartType() === 'line' ? lineChartOptions : chartOptions"
           (chartClick)="onClick($event)"
         ></canvas>
       </div>
@@ -139,13 +139,16 @@ export class Chart extends DynamicComponent<Types.CustomNode> {
     if (chartDataPathPrefix === null) {
       return undefined;
     }
-    if (chartType === 'pie' || chartType === 'doughnut') {
+    if (chartType === 'pie' || chartType === 'doughnut' || chartType === 'line') {
+      // Line charts use the same label and value items, without drill downs.
       return this.resolvePieChartData(chartDataPathPrefix);
     }
     console.error('Unsupported chart type specified:', chartType);
     return undefined;
   });
 
+  readonly drillDownAction = input<Types.Action | null>();
+
   protected readonly selectedCategory = signal('root');
   protected readonly isDrillDown = computed(() => this.selectedCategory() !== 'root');
   protected readonly currentData: Signal<ChartData<'pie', number[], string> | undefined> = computed(
@@ -190,6 +193,18 @@ export class Chart extends DynamicComponent<Types.CustomNode> {
     },
   };
 
+  protected lineChartOptions: ChartOptions = {
+    responsive: true,
+    plugins: {
+      legend: {
+        display: false,
+      },
+      datalabels: {
+        display: false,
+      },
+    },
+  };
+
   private resolvePieChartData(
     pathPrefix: Primitives.StringValue,
   ): Map<string, ChartData<'pie', number[], string>> | undefined {
@@ -258,6 +273,8 @@ export class Chart extends DynamicComponent<Types.CustomNode> {
   }
 
   protected onClick(e: { event?: ChartEvent; active?: any[] | undefined }) {
+    if (this.chartType() === 'line') return;
+
     const active = e.active;
     if (!active || active.length === 0) return;
 
@@ -277,6 +294,32 @@ export class Chart extends DynamicComponent<Types.CustomNode> {
       console.error('Cannot drilldown further');
       return;
     }
+    if (!this.resolvedPieChartData()?.get(label)?.labels?.length) {
+      this.requestDrillDown(label);
+    }
     this.selectedCategory.set(label);
   }
+
+  private requestDrillDown(label: string) {
+    const drillDownAction = this.drillDownAction();
+    const pathPrefix = this.chartData()?.path;
+    if (!drillDownAction || !pathPrefix) return;
+
+    const index = this.resolvedPieChartData()?.get('root')?.labels?.indexOf(label) ?? -1;
+    if (index < 0) return;
+    const itemPath = `${pathPrefix}[${index}]`;
+    const drillDownIdPath: Primitives.StringValue = { path: `${itemPath}.drillDownId` };
+    const drillDownId = super.resolvePrimitive(drillDownIdPath);
+    if (!drillDownId) return;
+
+    // The agent answers with a dataModelUpdate of the item's drillDown, which updates the chart.
+    super.sendAction({
+      ...drillDownAction,
+      context: [
+        ...(drillDownAction.context ?? []),
+        { key: 'drillDownId', value: { literalString: drillDownId } },
+        { key: 'itemPath', value: { literalString: itemPath } },
+      ],
+    });
+  }
 }
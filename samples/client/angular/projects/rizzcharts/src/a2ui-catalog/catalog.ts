@@ -29,6 +29,10 @@ export const RIZZ_CHARTS_CATALOG = {
         'chartData',
         () => ('chartData' in properties && properties['chartData']) || undefined,
       ),
+      inputBinding(
+        'drillDownAction',
+        () => ('drillDownAction' in properties && properties['drillDownAction']) || undefined,
+      ),
     ],
   },
   GoogleMap: {
@@ -38,6 +42,10 @@ export const RIZZ_CHARTS_CATALOG = {
       inputBinding('center', () => ('center' in properties && properties['center']) || undefined),
       inputBinding('pins', () => ('pins' in properties && properties['pins']) || undefined),
       inputBinding('title', () => ('title' in properties && properties['title']) || undefined),
+      inputBinding(
+        'pinAction',
+        () => ('pinAction' in properties && properties['pinAction']) || undefined,
+      ),
     ],
   },
 } as Catalog;
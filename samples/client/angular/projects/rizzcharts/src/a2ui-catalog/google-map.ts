@@ -27,6 +27,7 @@ interface Pin {
   lng: number;
   name: string;
   description: string | null;
+  clusterId: string | null;
   pinElement: google.maps.marker.PinElement;
 }
 
@@ -122,6 +123,7 @@ export interface CustomProperties {
                 [position]="pin"
                 [content]="pin.pinElement.element"
                 [title]="pin.name"
+                (mapClick)="selectPin(pin)"
               >
               </map-advanced-marker>
             }
@@ -152,6 +154,8 @@ export class GoogleMap extends DynamicComponent<Types.CustomNode> {
   readonly pins = input<CustomProperties>();
   protected readonly resolvedPins = computed(() => this.resolveLocations(this.pins()));
 
+  readonly pinAction = input<Types.Action | null>();
+
   constructor() {
     super();
   }
@@ -184,6 +188,7 @@ export class GoogleMap extends DynamicComponent<Types.CustomNode> {
     const backgroundValue: Primitives.StringValue = { path: `${value}.background` };
     const borderColorValue: Primitives.StringValue = { path: `${value}.borderColor` };
     const glyphColorValue: Primitives.StringValue = { path: `${value}.glyphColor` };
+    const clusterIdValue: Primitives.StringValue = { path: `${value}.clusterId` };
 
     const lat = this.resolvePrimitive(latValue);
     const lng = this.resolvePrimitive(lngValue);
@@ -192,6 +197,7 @@ export class GoogleMap extends DynamicComponent<Types.CustomNode> {
     const background = this.resolvePrimitive(backgroundValue);
     const borderColor = this.resolvePrimitive(borderColorValue);
     const glyphColor = this.resolvePrimitive(glyphColorValue);
+    const clusterId = this.resolvePrimitive(clusterIdValue);
 
     // TODO: This logic should be implemented in the `guard.ts` by making the data model typed upstream.
     if (lat === null || lng === null || name === null) {
@@ -205,6 +211,7 @@ export class GoogleMap extends DynamicComponent<Types.CustomNode> {
       name,
       // TODO: Description is currently not used in the Maps.
       description,
+      clusterId,
       pinElement: new google.maps.marker.PinElement({
         background,
         borderColor,
@@ -213,6 +220,21 @@ export class GoogleMap extends DynamicComponent<Types.CustomNode> {
     };
   }
 
+  protected selectPin(pin: Pin) {
+    const pinAction = this.pinAction();
+
+    // Only cluster pins have an action, which lets the agent send the locations in the cluster.
+    if (pin.clusterId && pinAction) {
+      super.sendAction({
+        ...pinAction,
+        context: [
+          ...(pinAction.context ?? []),
+          { key: 'clusterId', value: { literalString: pin.clusterId } },
+        ],
+      });
+    }
+  }
+
   private resolveLatLng(value: CustomProperties | null): google.maps.LatLngLiteral {
     if (value?.path) {
       const latValue: Primitives.NumberValue = { path: `${value.path}.lat` };